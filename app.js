@@ -1,54 +1,3 @@
-﻿const OTHER_CATEGORY = "Unstructured / Ad-hoc Requests";
-
-const WORK_CATEGORIES = [
-  "Tracking / ETA",
-  "Exception / Delay",
-  "Documentation",
-  "Rate / Pricing",
-  "Internal Coordination",
-  OTHER_CATEGORY,
-];
-
-const HANDLING_MINUTES = {
-  "Tracking / ETA": 4,
-  "Exception / Delay": 12,
-  Documentation: 7,
-  "Rate / Pricing": 8,
-  "Internal Coordination": 6,
-  [OTHER_CATEGORY]: 5,
-};
-
-const CATEGORY_KEYWORDS = {
-  "Exception / Delay": [
-    "delay", "late", "missed", "issue", "problem", "stuck", "hold", "damaged",
-    "shortage", "escalat", "failed delivery", "cancelled", "detention", "demurrage",
-  ],
-  "Tracking / ETA": [
-    "eta", "track", "tracking", "status update", "where is", "arrival time",
-    "delivery time", "in transit",
-  ],
-  Documentation: [
-    "invoice", "pod", "bill of lading", "bol", "awb", "packing list", "customs",
-    "document", "paperwork", "declaration", "certificate", "forms",
-  ],
-  "Rate / Pricing": [
-    "rate", "pricing", "quote", "quotation", "cost", "charge", "tariff", "spot rate",
-  ],
-  "Internal Coordination": [
-    "please coordinate", "warehouse", "dispatch", "driver", "pickup schedule", "handover",
-    "internal", "team", "ops", "arrange pickup",
-  ],
-};
-
-const EXCEPTION_KEYWORDS = [
-  "urgent", "escalat", "problem", "failed", "delay", "late", "stuck", "damage", "asap", "critical",
-];
-
-const SLA_KEYWORDS = [
-  "urgent", "asap", "today", "immediately", "deadline", "cutoff", "cut-off", "demurrage",
-  "detention", "customer waiting", "sla", "missed",
-];
-
 const state = {
   report: null,
 };
@@ -97,367 +46,6 @@ function updateFileMeta() {
   el.fileMeta.textContent = `Selected: ${file.name} (${humanFileSize(file.size)})`;
 }
 
-function parseTimestamp(value) {
-  if (!value || !String(value).trim()) {
-    return null;
-  }
-  const raw = String(value).trim();
-  const candidates = [raw, raw.replace(" ", "T"), raw.endsWith("Z") ? raw : `${raw}Z`];
-
-  for (const candidate of candidates) {
-    const dt = new Date(candidate);
-    if (!Number.isNaN(dt.getTime())) {
-      return dt;
-    }
-  }
-  return null;
-}
-
-function parseCsvRows(text) {
-  const rows = [];
-  let row = [];
-  let field = "";
-  let inQuotes = false;
-
-  for (let i = 0; i < text.length; i += 1) {
-    const ch = text[i];
-    const next = text[i + 1];
-
-    if (ch === '"') {
-      if (inQuotes && next === '"') {
-        field += '"';
-        i += 1;
-      } else {
-        inQuotes = !inQuotes;
-      }
-      continue;
-    }
-
-    if (ch === "," && !inQuotes) {
-      row.push(field);
-      field = "";
-      continue;
-    }
-
-    if ((ch === "\n" || ch === "\r") && !inQuotes) {
-      if (ch === "\r" && next === "\n") {
-        i += 1;
-      }
-      row.push(field);
-      rows.push(row);
-      row = [];
-      field = "";
-      continue;
-    }
-
-    field += ch;
-  }
-
-  if (field.length > 0 || row.length > 0) {
-    row.push(field);
-    rows.push(row);
-  }
-
-  return rows.filter((r) => r.some((cell) => String(cell).trim() !== ""));
-}
-
-function normalizeCsvItems(text) {
-  const rows = parseCsvRows(text);
-  if (rows.length < 2) {
-    return [];
-  }
-  const headers = rows[0].map((h) => String(h || "").trim().toLowerCase());
-  const idx = {
-    timestamp: headers.indexOf("timestamp"),
-    sender: headers.indexOf("sender"),
-    subject: headers.indexOf("subject"),
-    body: headers.indexOf("body"),
-  };
-
-  return rows
-    .slice(1)
-    .map((row, i) => {
-      const subject = idx.subject >= 0 ? String(row[idx.subject] || "").trim() : "";
-      const body = idx.body >= 0 ? String(row[idx.body] || "").trim() : "";
-      return {
-        id: `csv-${i + 1}`,
-        timestamp: idx.timestamp >= 0 ? parseTimestamp(row[idx.timestamp]) : null,
-        sender: idx.sender >= 0 ? String(row[idx.sender] || "").trim() : "",
-        subject,
-        body,
-        source: "csv",
-      };
-    })
-    .filter((item) => item.subject || item.body);
-}
-
-function normalizeTextBatchItems(text) {
-  const blocks = text.split(/^\s*---\s*$/m).map((x) => x.trim()).filter(Boolean);
-  return blocks
-    .map((block, i) => {
-      const lines = block.split(/\r?\n/);
-      const readHeader = (name) => {
-        const line = lines.find((entry) => entry.toLowerCase().startsWith(`${name}:`));
-        return line ? line.split(":").slice(1).join(":").trim() : "";
-      };
-
-      const timestamp = parseTimestamp(readHeader("timestamp"));
-      const sender = readHeader("sender");
-      let subject = readHeader("subject");
-
-      const bodyMarker = block.match(/^body\s*:\s*$/im);
-      let body = "";
-      if (bodyMarker) {
-        const split = block.split(/^body\s*:\s*$/im);
-        body = split.slice(1).join("\n").trim();
-      } else {
-        body = block;
-      }
-
-      if (!subject) {
-        const firstLine = (body.split(/\r?\n/).find(Boolean) || "").trim();
-        subject = firstLine.length > 80 ? `${firstLine.slice(0, 80)}...` : firstLine;
-      }
-
-      return {
-        id: `text-${i + 1}`,
-        timestamp,
-        sender,
-        subject,
-        body,
-        source: "text",
-      };
-    })
-    .filter((item) => item.subject || item.body);
-}
-
-function containsAny(text, phrases) {
-  return phrases.some((p) => text.includes(p));
-}
-
-function classifyItem(item) {
-  const text = `${item.subject}\n${item.body}`.toLowerCase();
-  const scores = {};
-
-  Object.keys(CATEGORY_KEYWORDS).forEach((category) => {
-    let score = 0;
-    CATEGORY_KEYWORDS[category].forEach((kw) => {
-      if (text.includes(kw)) {
-        score += 1;
-      }
-    });
-    scores[category] = score;
-  });
-
-  let category = OTHER_CATEGORY;
-  let topScore = 0;
-  WORK_CATEGORIES.forEach((cat) => {
-    const score = scores[cat] || 0;
-    if (score > topScore) {
-      topScore = score;
-      category = cat;
-    }
-  });
-
-  const isException = category === "Exception / Delay" || containsAny(text, EXCEPTION_KEYWORDS);
-  const nature = isException ? "Exception-driven" : "Repetitive";
-
-  const isSla = containsAny(text, SLA_KEYWORDS) || (category === "Exception / Delay" && text.includes("urgent"));
-  const risk = isSla ? "SLA-sensitive" : "Not SLA-sensitive";
-
-  let confidence = 0.5;
-  if (category !== OTHER_CATEGORY) {
-    confidence = Math.min(0.95, 0.55 + topScore * 0.1);
-  }
-
-  return {
-    category,
-    nature,
-    risk,
-    confidence: Math.round(confidence * 100) / 100,
-  };
-}
-
-function percent(count, total) {
-  if (!total) {
-    return 0;
-  }
-  return Math.round((count / total) * 1000) / 10;
-}
-
-function limitItems(items, lookbackDays, maxItems) {
-  const now = new Date();
-  const timestamps = items
-    .map((item) => item.timestamp)
-    .filter((value) => value instanceof Date && !Number.isNaN(value.getTime()));
-
-  const anchorDate = timestamps.length
-    ? new Date(Math.max(...timestamps.map((value) => value.getTime())))
-    : now;
-
-  const threshold = new Date(anchorDate);
-  threshold.setDate(threshold.getDate() - lookbackDays);
-
-  const sorted = [...items].sort((a, b) => {
-    const aTime = a.timestamp instanceof Date ? a.timestamp.getTime() : anchorDate.getTime();
-    const bTime = b.timestamp instanceof Date ? b.timestamp.getTime() : anchorDate.getTime();
-    return bTime - aTime;
-  });
-
-  const withinWindow = sorted.filter((item) => {
-    if (!(item.timestamp instanceof Date)) {
-      return true;
-    }
-    return item.timestamp >= threshold;
-  });
-
-  if (withinWindow.length > 0) {
-    return {
-      items: withinWindow.slice(0, maxItems),
-      appliedLookback: true,
-      anchorDate,
-      fallbackUsed: false,
-    };
-  }
-
-  return {
-    items: sorted.slice(0, maxItems),
-    appliedLookback: false,
-    anchorDate,
-    fallbackUsed: true,
-  };
-}
-
-function aggregate(classifiedItems, lookbackDays) {
-  const total = classifiedItems.length;
-  if (!total) {
-    return {
-      totalVolume: 0,
-      periodDays: lookbackDays,
-      categoryCounts: {},
-      categoryPercentages: {},
-      natureCounts: {},
-      naturePercentages: {},
-      riskCounts: {},
-      riskPercentages: {},
-      estimatedMinutesByCategory: {},
-      estimatedTotalMinutes: 0,
-      estimatedHoursPerWeek: 0,
-      slaClusters: [],
-    };
-  }
-
-  const timestamps = classifiedItems.map((x) => x.item.timestamp).filter((x) => x instanceof Date);
-
-  let periodDays = lookbackDays;
-  if (timestamps.length) {
-    const minTime = Math.min(...timestamps.map((d) => d.getTime()));
-    const maxTime = Math.max(...timestamps.map((d) => d.getTime()));
-    periodDays = Math.max(1, Math.floor((maxTime - minTime) / (1000 * 60 * 60 * 24)) + 1);
-  }
-
-  const countBy = (selector) => {
-    const counts = {};
-    classifiedItems.forEach((x) => {
-      const key = selector(x);
-      counts[key] = (counts[key] || 0) + 1;
-    });
-    return counts;
-  };
-
-  const categoryCounts = countBy((x) => x.classification.category);
-  const natureCounts = countBy((x) => x.classification.nature);
-  const riskCounts = countBy((x) => x.classification.risk);
-
-  const categoryPercentages = {};
-  Object.entries(categoryCounts).forEach(([k, v]) => {
-    categoryPercentages[k] = percent(v, total);
-  });
-
-  const naturePercentages = {};
-  Object.entries(natureCounts).forEach(([k, v]) => {
-    naturePercentages[k] = percent(v, total);
-  });
-
-  const riskPercentages = {};
-  Object.entries(riskCounts).forEach(([k, v]) => {
-    riskPercentages[k] = percent(v, total);
-  });
-
-  const estimatedMinutesByCategory = {};
-  Object.entries(categoryCounts).forEach(([k, v]) => {
-    estimatedMinutesByCategory[k] = v * (HANDLING_MINUTES[k] || HANDLING_MINUTES[OTHER_CATEGORY]);
-  });
-
-  const estimatedTotalMinutes = Object.values(estimatedMinutesByCategory).reduce((sum, n) => sum + n, 0);
-  const estimatedHoursPerWeek = Math.round((estimatedTotalMinutes / 60) * (7 / periodDays) * 10) / 10;
-
-  const slaCountsByCategory = {};
-  classifiedItems.forEach((x) => {
-    if (x.classification.risk === "SLA-sensitive") {
-      const key = x.classification.category;
-      slaCountsByCategory[key] = (slaCountsByCategory[key] || 0) + 1;
-    }
-  });
-
-  const totalSla = Object.values(slaCountsByCategory).reduce((sum, n) => sum + n, 0);
-  const slaClusters = Object.entries(slaCountsByCategory)
-    .map(([category, count]) => ({ category, count, shareOfSla: percent(count, totalSla) }))
-    .sort((a, b) => b.count - a.count);
-
-  return {
-    totalVolume: total,
-    periodDays,
-    categoryCounts,
-    categoryPercentages,
-    natureCounts,
-    naturePercentages,
-    riskCounts,
-    riskPercentages,
-    estimatedMinutesByCategory,
-    estimatedTotalMinutes,
-    estimatedHoursPerWeek,
-    slaClusters,
-  };
-}
-
-function leverageSummary(metrics) {
-  if (!metrics.totalVolume) {
-    return ["No inbound items in selected window; no leverage estimate available."];
-  }
-
-  const repetitivePct = metrics.naturePercentages.Repetitive || 0;
-  const slaPct = metrics.riskPercentages["SLA-sensitive"] || 0;
-  const topCats = Object.entries(metrics.categoryCounts).sort((a, b) => b[1] - a[1]).slice(0, 2);
-
-  const lines = [];
-  if (repetitivePct >= 50) {
-    lines.push(`${repetitivePct}% of inbound work appears repetitive and is a candidate for templated AI handling.`);
-  } else {
-    lines.push(`Repetitive work is ${repetitivePct}%; prioritize exception triage before broad automation.`);
-  }
-
-  if (topCats.length) {
-    lines.push(`Highest-load categories: ${topCats.map(([name, count]) => `${name} (${count})`).join(", ")}.`);
-  }
-
-  if (slaPct > 0) {
-    lines.push(`SLA-sensitive traffic is ${slaPct}%; retain human-in-the-loop control on these flows.`);
-  } else {
-    lines.push("No SLA-sensitive cluster detected in this sample window.");
-  }
-
-  if (metrics.estimatedHoursPerWeek >= 10) {
-    lines.push(`Estimated workload is ${metrics.estimatedHoursPerWeek} hours/week, indicating stronger automation ROI potential.`);
-  } else {
-    lines.push(`Estimated workload is ${metrics.estimatedHoursPerWeek} hours/week; use this as a baseline before deeper implementation.`);
-  }
-
-  lines.push("If automated, the first leverage point would be repetitive Tracking/ETA and Documentation requests, while keeping Exception and SLA-sensitive flows human-in-the-loop.");
-
-  return lines;
-}
-
 function safeHtml(text) {
   return String(text)
     .replace(/&/g, "&amp;")
@@ -527,7 +115,12 @@ function renderReport(report) {
 
   const slaVizRows = metrics.slaClusters.map((x) => ({ label: x.category, value: x.shareOfSla }));
 
+  const progressNote = report.progress
+    ? `<p class="report-progress">Partial results: ${safeHtml(progressLabel(report.progress))}. Figures update as processing continues.</p>`
+    : "";
+
   const html = `
+    ${progressNote}
     <div class="report-grid">
       <article class="metric">
         <p class="metric-title">Inbound Volume</p>
@@ -585,9 +178,13 @@ function renderReport(report) {
     <small>Generated at ${safeHtml(report.generatedAt)}</small>
   `;
 
+  // Partial reports re-render every few hundred ms; only scroll when the panel first appears.
+  const firstRender = el.reportPanel.classList.contains("hidden");
   el.reportRoot.innerHTML = html;
   el.reportPanel.classList.remove("hidden");
-  el.reportPanel.scrollIntoView({ behavior: "smooth", block: "start" });
+  if (firstRender) {
+    el.reportPanel.scrollIntoView({ behavior: "smooth", block: "start" });
+  }
 }
 
 function exportPdf(report) {
@@ -679,65 +276,100 @@ function exportPdf(report) {
   doc.save(`operations_load_diagnostic_${stamp}.pdf`);
 }
 
-async function loadInputItems() {
-  const mode = el.inputMode.value;
-  const file = el.fileInput.files[0];
-  const text = el.textInput.value.trim();
+function progressLabel(progress) {
+  const share = progress.totalBytes ? Math.floor((progress.bytesRead / progress.totalBytes) * 100) : 100;
+  return `${share}% of input read, ${progress.itemsRead.toLocaleString()} items so far`;
+}
 
+function inputSource() {
+  const file = el.fileInput.files[0];
   if (file) {
-    const raw = await file.text();
-    if (mode === "csv") {
-      return normalizeCsvItems(raw);
-    }
-    return normalizeTextBatchItems(raw);
+    return file;
   }
+  const text = el.textInput.value.trim();
+  return text ? new Blob([text], { type: "text/plain" }) : null;
+}
 
-  if (text) {
-    if (mode === "csv") {
-      return normalizeCsvItems(text);
-    }
-    return normalizeTextBatchItems(text);
+function processOnMainThread(source, options, onProgress) {
+  // Still chunked; yield after each progress update so the page can repaint.
+  return runDiagnosticStream(source, options, (report) => {
+    onProgress(report);
+    return new Promise((resolve) => setTimeout(resolve, 0));
+  });
+}
+
+// Parsing, classification and aggregation run in worker.js. Where workers are
+// unavailable (e.g. the page is opened from file://), the same code runs here.
+function processInput(source, options, onProgress) {
+  if (typeof Worker === "undefined") {
+    return processOnMainThread(source, options, onProgress);
   }
+  return new Promise((resolve, reject) => {
+    let worker;
+    try {
+      worker = new Worker("./worker.js");
+    } catch (err) {
+      resolve(processOnMainThread(source, options, onProgress));
+      return;
+    }
 
-  return [];
+    let started = false;
+    worker.onmessage = (event) => {
+      const message = event.data;
+      started = true;
+      if (message.type === "progress") {
+        onProgress(message.report);
+        return;
+      }
+      worker.terminate();
+      if (message.type === "done") {
+        resolve(message);
+      } else {
+        reject(new Error(message.message));
+      }
+    };
+    worker.onerror = (event) => {
+      event.preventDefault();
+      worker.terminate();
+      if (started) {
+        reject(new Error(event.message || "Diagnostic worker failed."));
+      } else {
+        resolve(processOnMainThread(source, options, onProgress));
+      }
+    };
+    worker.postMessage({ source, ...options });
+  });
 }
 
 async function runDiagnostic() {
   setStatus("Processing inbound sample...");
   el.generateBtn.disabled = true;
+  el.pdfBtn.disabled = true;
   try {
     const lookbackDays = Math.max(1, Number(el.lookbackDays.value) || 14);
     const maxItems = Math.max(10, Number(el.maxItems.value) || 200);
 
-    const rawItems = await loadInputItems();
-    if (!rawItems.length) {
+    const source = inputSource();
+    if (!source) {
       throw new Error("No valid inbound items found. Upload a valid file or paste valid input text.");
     }
 
-    const limited = limitItems(rawItems, lookbackDays, maxItems);
-    const inbound = limited.items;
-    const classified = inbound.map((item) => ({ item, classification: classifyItem(item) }));
-
-    const metrics = aggregate(classified, lookbackDays);
-    const leverage = leverageSummary(metrics);
-    const anchorLabel = limited.anchorDate.toISOString().slice(0, 10);
-
-    const report = {
-      generatedAt: new Date().toLocaleString(),
-      metrics,
-      leverage,
-      assumptions: {
-        window: limited.appliedLookback
-          ? `${lookbackDays} day lookback anchored to latest record (${anchorLabel}), max ${maxItems} items`
-          : `${lookbackDays} day lookback requested; fallback used with latest ${inbound.length} records (anchor ${anchorLabel}).`,
+    const result = await processInput(
+      source,
+      { mode: el.inputMode.value, lookbackDays, maxItems },
+      (partial) => {
+        setStatus(`Processing inbound sample... ${progressLabel(partial.progress)}.`);
+        renderReport(partial);
       },
-    };
+    );
+    const { report, anchorLabel } = result;
+    const metrics = report.metrics;
 
     state.report = report;
     renderReport(report);
     el.pdfBtn.disabled = false;
 
-    const statusMessage = limited.fallbackUsed
+    const statusMessage = result.fallbackUsed
       ? `Diagnostic complete. ${metrics.totalVolume} items processed. Fallback applied because records did not match lookback window.`
       : `Diagnostic complete. ${metrics.totalVolume} items processed (lookback anchored to latest record: ${anchorLabel}).`;
     setStatus(statusMessage);
@@ -786,7 +418,7 @@ el.pdfBtn.addEventListener("click", () => {
 });
 
 updateFileMeta();
-setStatus("Upload a file or load the sample to begin. Build: 2026-02-08-2.");
+setStatus("Upload a file or load the sample to begin. Build: 2026-10-19-1.");
 
 
 
@@ -0,0 +1,158 @@
+"""
+Startup benchmark for the `ops-diagnostic` CLI.
+
+Runs small, scheduler-style invocations in fresh interpreters with
+`python -X importtime`, and reports the median total import time and wall time
+for each. Import time is compared with `python -X importtime -c pass` on the
+same machine, so budgets are multiples of the bare interpreter's startup
+imports rather than absolute milliseconds.
+
+Exits non-zero when a module outside the run's mode is imported; timings are
+noisy, so an import time over budget only fails the run with --strict.
+
+    python benchmarks/startup.py            # check the forbidden modules
+    python benchmarks/startup.py --runs 15 --strict
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE_CSV = ROOT / "examples" / "sample_inbound.csv"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# Modules that only other modes or formats need.
+HEAVY_MODULES = {
+    "imaplib",
+    "ssl",
+    "socket",
+    "email",
+    "concurrent.futures",
+    "gzip",
+    "numpy",
+    "openai",
+    "operations_load_diagnostic.snapshot",
+    "operations_load_diagnostic.whatif",
+    "operations_load_diagnostic.watch",
+    "operations_load_diagnostic.sampling",
+    "operations_load_diagnostic.profiling",
+    "operations_load_diagnostic.rules",
+}
+
+
+@dataclass(slots=True)
+class Case:
+    name: str
+    args: list[str]
+    # Median total import time budget, as a multiple of the `-c pass` baseline.
+    import_budget: float
+    forbidden: set[str] = field(default_factory=lambda: set(HEAVY_MODULES))
+
+
+CASES = [
+    Case(
+        name="csv -> markdown",
+        args=["--mode", "csv", "--input", str(SAMPLE_CSV), "--format", "markdown", "--no-snapshot"],
+        import_budget=12.0,
+        forbidden=HEAVY_MODULES | {"html"},
+    ),
+    Case(
+        name="csv -> html + snapshot",
+        args=["--mode", "csv", "--input", str(SAMPLE_CSV), "--format", "html"],
+        import_budget=12.0,
+        forbidden=HEAVY_MODULES - {"operations_load_diagnostic.snapshot"},
+    ),
+    Case(
+        name="--help",
+        args=["--help"],
+        import_budget=7.0,
+        forbidden=HEAVY_MODULES | {"operations_load_diagnostic.ingestion", "csv"},
+    ),
+]
+
+
+def _run_once(name: str, args: list[str]) -> tuple[float, float, set[str]]:
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src"))
+    command = [sys.executable, "-X", "importtime", *args]
+    start = time.perf_counter()
+    proc = subprocess.run(command, env=env, capture_output=True, text=True, cwd=ROOT)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{proc.stderr[-2000:]}")
+
+    total_us = 0
+    modules: set[str] = set()
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules.add(name)
+        if len(indent) == 1:
+            total_us += int(cumulative)  # Top-level imports only; children are included.
+    return total_us / 1000, wall_ms, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1].strip())
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Also fail when a median import time is over its budget.",
+    )
+    args = parser.parse_args()
+
+    baseline_ms = statistics.median(
+        _run_once("baseline", ["-c", "pass"])[0] for _ in range(args.runs)
+    )
+    print(f"{'python -c pass':<24} imports {baseline_ms:6.1f} ms")
+    failures: list[str] = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for case in CASES:
+            imports, walls = [], []
+            loaded: set[str] = set()
+            for _ in range(args.runs):
+                import_ms, wall_ms, modules = _run_once(
+                    case.name,
+                    ["-m", "operations_load_diagnostic.cli", *case.args, "--output-dir", output_dir],
+                )
+                imports.append(import_ms)
+                walls.append(wall_ms)
+                loaded |= modules
+            import_ms = statistics.median(imports)
+            ratio = import_ms / baseline_ms
+            leaked = sorted(m for m in loaded if m in case.forbidden)
+            status = "ok"
+            if ratio > case.import_budget:
+                status = "over budget"
+                if args.strict:
+                    failures.append(
+                        f"{case.name}: imports {ratio:.1f}x baseline > {case.import_budget:.0f}x"
+                    )
+            if leaked:
+                status = "FORBIDDEN IMPORTS"
+                failures.append(f"{case.name}: imported {', '.join(leaked)}")
+            print(
+                f"{case.name:<24} imports {import_ms:6.1f} ms "
+                f"({ratio:4.1f}x baseline, budget {case.import_budget:.0f}x)  "
+                f"wall {statistics.median(walls):6.1f} ms  modules {len(loaded):4d}  {status}"
+            )
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,665 @@
+﻿const OTHER_CATEGORY = "Unstructured / Ad-hoc Requests";
+
+const WORK_CATEGORIES = [
+  "Tracking / ETA",
+  "Exception / Delay",
+  "Documentation",
+  "Rate / Pricing",
+  "Internal Coordination",
+  OTHER_CATEGORY,
+];
+
+const HANDLING_MINUTES = {
+  "Tracking / ETA": 4,
+  "Exception / Delay": 12,
+  Documentation: 7,
+  "Rate / Pricing": 8,
+  "Internal Coordination": 6,
+  [OTHER_CATEGORY]: 5,
+};
+
+const CATEGORY_KEYWORDS = {
+  "Exception / Delay": [
+    "delay", "late", "missed", "issue", "problem", "stuck", "hold", "damaged",
+    "shortage", "escalat", "failed delivery", "cancelled", "detention", "demurrage",
+  ],
+  "Tracking / ETA": [
+    "eta", "track", "tracking", "status update", "where is", "arrival time",
+    "delivery time", "in transit",
+  ],
+  Documentation: [
+    "invoice", "pod", "bill of lading", "bol", "awb", "packing list", "customs",
+    "document", "paperwork", "declaration", "certificate", "forms",
+  ],
+  "Rate / Pricing": [
+    "rate", "pricing", "quote", "quotation", "cost", "charge", "tariff", "spot rate",
+  ],
+  "Internal Coordination": [
+    "please coordinate", "warehouse", "dispatch", "driver", "pickup schedule", "handover",
+    "internal", "team", "ops", "arrange pickup",
+  ],
+};
+
+const EXCEPTION_KEYWORDS = [
+  "urgent", "escalat", "problem", "failed", "delay", "late", "stuck", "damage", "asap", "critical",
+];
+
+const SLA_KEYWORDS = [
+  "urgent", "asap", "today", "immediately", "deadline", "cutoff", "cut-off", "demurrage",
+  "detention", "customer waiting", "sla", "missed",
+];
+
+const PROGRESS_INTERVAL_MS = 200;
+// Stream chunks are decoded and parsed at most this many bytes at a time.
+const READ_CHUNK_BYTES = 1024 * 1024;
+
+function parseTimestamp(value) {
+  if (!value || !String(value).trim()) {
+    return null;
+  }
+  const raw = String(value).trim();
+  const candidates = [raw, raw.replace(" ", "T"), raw.endsWith("Z") ? raw : `${raw}Z`];
+
+  for (const candidate of candidates) {
+    const dt = new Date(candidate);
+    if (!Number.isNaN(dt.getTime())) {
+      return dt;
+    }
+  }
+  return null;
+}
+
+// Incremental CSV parser: `push` accepts arbitrary chunks and calls `onRow` for
+// every complete row, so a file never has to be held in memory as one string.
+function createCsvParser(onRow) {
+  const special = /[",\r\n]/g;
+  let row = [];
+  let field = "";
+  let inQuotes = false;
+  let carry = "";
+
+  const emitRow = () => {
+    row.push(field);
+    onRow(row);
+    row = [];
+    field = "";
+  };
+
+  const consume = (text, final) => {
+    let i = 0;
+    while (i < text.length) {
+      special.lastIndex = i;
+      const match = special.exec(text);
+      const stop = match ? match.index : text.length;
+      if (stop > i) {
+        field += text.slice(i, stop);
+        i = stop;
+        if (!match) {
+          break;
+        }
+      }
+
+      const ch = text[i];
+      const next = text[i + 1];
+      // A quote or CR at the end of a chunk needs the next character to be read correctly.
+      if (!final && next === undefined && ((ch === '"' && inQuotes) || (ch === "\r" && !inQuotes))) {
+        carry = ch;
+        return;
+      }
+
+      if (ch === '"') {
+        if (inQuotes && next === '"') {
+          field += '"';
+          i += 1;
+        } else {
+          inQuotes = !inQuotes;
+        }
+      } else if (inQuotes) {
+        field += ch;
+      } else if (ch === ",") {
+        row.push(field);
+        field = "";
+      } else {
+        if (ch === "\r" && next === "\n") {
+          i += 1;
+        }
+        emitRow();
+      }
+      i += 1;
+    }
+  };
+
+  return {
+    push(text) {
+      const chunk = carry + text;
+      carry = "";
+      consume(chunk, false);
+    },
+    end() {
+      consume(carry, true);
+      carry = "";
+      if (field.length > 0 || row.length > 0) {
+        emitRow();
+      }
+    },
+  };
+}
+
+function createCsvItemReader(onItem) {
+  let idx = null;
+  let rowNumber = 0;
+
+  return createCsvParser((row) => {
+    if (!row.some((cell) => String(cell).trim() !== "")) {
+      return;
+    }
+    if (!idx) {
+      const headers = row.map((h) => String(h || "").trim().toLowerCase());
+      idx = {
+        timestamp: headers.indexOf("timestamp"),
+        sender: headers.indexOf("sender"),
+        subject: headers.indexOf("subject"),
+        body: headers.indexOf("body"),
+      };
+      return;
+    }
+
+    rowNumber += 1;
+    const subject = idx.subject >= 0 ? String(row[idx.subject] || "").trim() : "";
+    const body = idx.body >= 0 ? String(row[idx.body] || "").trim() : "";
+    if (!subject && !body) {
+      return;
+    }
+    onItem({
+      id: `csv-${rowNumber}`,
+      timestamp: idx.timestamp >= 0 ? parseTimestamp(row[idx.timestamp]) : null,
+      sender: idx.sender >= 0 ? String(row[idx.sender] || "").trim() : "",
+      subject,
+      body,
+      source: "csv",
+    });
+  });
+}
+
+function parseTextBlock(block, i) {
+  const lines = block.split(/\r?\n/);
+  const readHeader = (name) => {
+    const line = lines.find((entry) => entry.toLowerCase().startsWith(`${name}:`));
+    return line ? line.split(":").slice(1).join(":").trim() : "";
+  };
+
+  const timestamp = parseTimestamp(readHeader("timestamp"));
+  const sender = readHeader("sender");
+  let subject = readHeader("subject");
+
+  const bodyMarker = block.match(/^body\s*:\s*$/im);
+  let body = "";
+  if (bodyMarker) {
+    const split = block.split(/^body\s*:\s*$/im);
+    body = split.slice(1).join("\n").trim();
+  } else {
+    body = block;
+  }
+
+  if (!subject) {
+    const firstLine = (body.split(/\r?\n/).find(Boolean) || "").trim();
+    subject = firstLine.length > 80 ? `${firstLine.slice(0, 80)}...` : firstLine;
+  }
+
+  return {
+    id: `text-${i + 1}`,
+    timestamp,
+    sender,
+    subject,
+    body,
+    source: "text",
+  };
+}
+
+// Text batches are split on `---` lines as they stream in; only the current
+// block and a partial last line are buffered.
+function createTextBatchReader(onItem) {
+  const separator = /^\s*---\s*$/;
+  let carry = "";
+  let lines = [];
+  let blockCount = 0;
+
+  const flush = () => {
+    const block = lines.join("").trim();
+    lines = [];
+    if (!block) {
+      return;
+    }
+    const item = parseTextBlock(block, blockCount);
+    blockCount += 1;
+    if (item.subject || item.body) {
+      onItem(item);
+    }
+  };
+
+  const addLine = (line) => {
+    if (separator.test(line)) {
+      flush();
+    } else {
+      lines.push(line);
+    }
+  };
+
+  // Every line terminator a multiline RegExp's ^ and $ recognise, as the
+  // one-shot split on /^\s*---\s*$/m did.
+  const terminator = /\r\n?|[\n\u2028\u2029]/g;
+
+  return {
+    push(text) {
+      carry += text;
+      let start = 0;
+      terminator.lastIndex = 0;
+      let match = terminator.exec(carry);
+      while (match) {
+        const end = match.index + match[0].length;
+        if (match[0] === "\r" && end === carry.length) {
+          break; // May be the first half of a "\r\n" split across chunks.
+        }
+        addLine(carry.slice(start, end));
+        start = end;
+        match = terminator.exec(carry);
+      }
+      carry = carry.slice(start);
+    },
+    end() {
+      if (carry) {
+        addLine(carry);
+      }
+      carry = "";
+      flush();
+    },
+  };
+}
+
+function containsAny(text, phrases) {
+  return phrases.some((p) => text.includes(p));
+}
+
+function classifyItem(item) {
+  const text = `${item.subject}\n${item.body}`.toLowerCase();
+  const scores = {};
+
+  Object.keys(CATEGORY_KEYWORDS).forEach((category) => {
+    let score = 0;
+    CATEGORY_KEYWORDS[category].forEach((kw) => {
+      if (text.includes(kw)) {
+        score += 1;
+      }
+    });
+    scores[category] = score;
+  });
+
+  let category = OTHER_CATEGORY;
+  let topScore = 0;
+  WORK_CATEGORIES.forEach((cat) => {
+    const score = scores[cat] || 0;
+    if (score > topScore) {
+      topScore = score;
+      category = cat;
+    }
+  });
+
+  const isException = category === "Exception / Delay" || containsAny(text, EXCEPTION_KEYWORDS);
+  const nature = isException ? "Exception-driven" : "Repetitive";
+
+  const isSla = containsAny(text, SLA_KEYWORDS) || (category === "Exception / Delay" && text.includes("urgent"));
+  const risk = isSla ? "SLA-sensitive" : "Not SLA-sensitive";
+
+  let confidence = 0.5;
+  if (category !== OTHER_CATEGORY) {
+    confidence = Math.min(0.95, 0.55 + topScore * 0.1);
+  }
+
+  return {
+    category,
+    nature,
+    risk,
+    confidence: Math.round(confidence * 100) / 100,
+  };
+}
+
+function percent(count, total) {
+  if (!total) {
+    return 0;
+  }
+  return Math.round((count / total) * 1000) / 10;
+}
+
+function limitItems(items, lookbackDays, maxItems) {
+  const now = new Date();
+  const timestamps = items
+    .map((item) => item.timestamp)
+    .filter((value) => value instanceof Date && !Number.isNaN(value.getTime()));
+
+  const anchorDate = timestamps.length
+    ? new Date(Math.max(...timestamps.map((value) => value.getTime())))
+    : now;
+
+  const threshold = new Date(anchorDate);
+  threshold.setDate(threshold.getDate() - lookbackDays);
+
+  const sorted = [...items].sort((a, b) => {
+    const aTime = a.timestamp instanceof Date ? a.timestamp.getTime() : anchorDate.getTime();
+    const bTime = b.timestamp instanceof Date ? b.timestamp.getTime() : anchorDate.getTime();
+    return bTime - aTime;
+  });
+
+  const withinWindow = sorted.filter((item) => {
+    if (!(item.timestamp instanceof Date)) {
+      return true;
+    }
+    return item.timestamp >= threshold;
+  });
+
+  if (withinWindow.length > 0) {
+    return {
+      items: withinWindow.slice(0, maxItems),
+      appliedLookback: true,
+      anchorDate,
+      fallbackUsed: false,
+    };
+  }
+
+  return {
+    items: sorted.slice(0, maxItems),
+    appliedLookback: false,
+    anchorDate,
+    fallbackUsed: true,
+  };
+}
+
+function aggregate(classifiedItems, lookbackDays) {
+  const total = classifiedItems.length;
+  if (!total) {
+    return {
+      totalVolume: 0,
+      periodDays: lookbackDays,
+      categoryCounts: {},
+      categoryPercentages: {},
+      natureCounts: {},
+      naturePercentages: {},
+      riskCounts: {},
+      riskPercentages: {},
+      estimatedMinutesByCategory: {},
+      estimatedTotalMinutes: 0,
+      estimatedHoursPerWeek: 0,
+      slaClusters: [],
+    };
+  }
+
+  const timestamps = classifiedItems.map((x) => x.item.timestamp).filter((x) => x instanceof Date);
+
+  let periodDays = lookbackDays;
+  if (timestamps.length) {
+    const minTime = Math.min(...timestamps.map((d) => d.getTime()));
+    const maxTime = Math.max(...timestamps.map((d) => d.getTime()));
+    periodDays = Math.max(1, Math.floor((maxTime - minTime) / (1000 * 60 * 60 * 24)) + 1);
+  }
+
+  const countBy = (selector) => {
+    const counts = {};
+    classifiedItems.forEach((x) => {
+      const key = selector(x);
+      counts[key] = (counts[key] || 0) + 1;
+    });
+    return counts;
+  };
+
+  const categoryCounts = countBy((x) => x.classification.category);
+  const natureCounts = countBy((x) => x.classification.nature);
+  const riskCounts = countBy((x) => x.classification.risk);
+
+  const categoryPercentages = {};
+  Object.entries(categoryCounts).forEach(([k, v]) => {
+    categoryPercentages[k] = percent(v, total);
+  });
+
+  const naturePercentages = {};
+  Object.entries(natureCounts).forEach(([k, v]) => {
+    naturePercentages[k] = percent(v, total);
+  });
+
+  const riskPercentages = {};
+  Object.entries(riskCounts).forEach(([k, v]) => {
+    riskPercentages[k] = percent(v, total);
+  });
+
+  const estimatedMinutesByCategory = {};
+  Object.entries(categoryCounts).forEach(([k, v]) => {
+    estimatedMinutesByCategory[k] = v * (HANDLING_MINUTES[k] || HANDLING_MINUTES[OTHER_CATEGORY]);
+  });
+
+  const estimatedTotalMinutes = Object.values(estimatedMinutesByCategory).reduce((sum, n) => sum + n, 0);
+  const estimatedHoursPerWeek = Math.round((estimatedTotalMinutes / 60) * (7 / periodDays) * 10) / 10;
+
+  const slaCountsByCategory = {};
+  classifiedItems.forEach((x) => {
+    if (x.classification.risk === "SLA-sensitive") {
+      const key = x.classification.category;
+      slaCountsByCategory[key] = (slaCountsByCategory[key] || 0) + 1;
+    }
+  });
+
+  const totalSla = Object.values(slaCountsByCategory).reduce((sum, n) => sum + n, 0);
+  const slaClusters = Object.entries(slaCountsByCategory)
+    .map(([category, count]) => ({ category, count, shareOfSla: percent(count, totalSla) }))
+    .sort((a, b) => b.count - a.count);
+
+  return {
+    totalVolume: total,
+    periodDays,
+    categoryCounts,
+    categoryPercentages,
+    natureCounts,
+    naturePercentages,
+    riskCounts,
+    riskPercentages,
+    estimatedMinutesByCategory,
+    estimatedTotalMinutes,
+    estimatedHoursPerWeek,
+    slaClusters,
+  };
+}
+
+function leverageSummary(metrics) {
+  if (!metrics.totalVolume) {
+    return ["No inbound items in selected window; no leverage estimate available."];
+  }
+
+  const repetitivePct = metrics.naturePercentages.Repetitive || 0;
+  const slaPct = metrics.riskPercentages["SLA-sensitive"] || 0;
+  const topCats = Object.entries(metrics.categoryCounts).sort((a, b) => b[1] - a[1]).slice(0, 2);
+
+  const lines = [];
+  if (repetitivePct >= 50) {
+    lines.push(`${repetitivePct}% of inbound work appears repetitive and is a candidate for templated AI handling.`);
+  } else {
+    lines.push(`Repetitive work is ${repetitivePct}%; prioritize exception triage before broad automation.`);
+  }
+
+  if (topCats.length) {
+    lines.push(`Highest-load categories: ${topCats.map(([name, count]) => `${name} (${count})`).join(", ")}.`);
+  }
+
+  if (slaPct > 0) {
+    lines.push(`SLA-sensitive traffic is ${slaPct}%; retain human-in-the-loop control on these flows.`);
+  } else {
+    lines.push("No SLA-sensitive cluster detected in this sample window.");
+  }
+
+  if (metrics.estimatedHoursPerWeek >= 10) {
+    lines.push(`Estimated workload is ${metrics.estimatedHoursPerWeek} hours/week, indicating stronger automation ROI potential.`);
+  } else {
+    lines.push(`Estimated workload is ${metrics.estimatedHoursPerWeek} hours/week; use this as a baseline before deeper implementation.`);
+  }
+
+  lines.push("If automated, the first leverage point would be repetitive Tracking/ETA and Documentation requests, while keeping Exception and SLA-sensitive flows human-in-the-loop.");
+
+  return lines;
+}
+
+function heapWorse(a, b) {
+  return a.time < b.time || (a.time === b.time && a.seq > b.seq);
+}
+
+function heapSiftUp(heap, i) {
+  while (i > 0) {
+    const parent = (i - 1) >> 1;
+    if (!heapWorse(heap[i], heap[parent])) {
+      return;
+    }
+    [heap[i], heap[parent]] = [heap[parent], heap[i]];
+    i = parent;
+  }
+}
+
+function heapSiftDown(heap, i) {
+  for (;;) {
+    const left = i * 2 + 1;
+    const right = left + 1;
+    let worst = i;
+    if (left < heap.length && heapWorse(heap[left], heap[worst])) {
+      worst = left;
+    }
+    if (right < heap.length && heapWorse(heap[right], heap[worst])) {
+      worst = right;
+    }
+    if (worst === i) {
+      return;
+    }
+    [heap[i], heap[worst]] = [heap[worst], heap[i]];
+    i = worst;
+  }
+}
+
+// Keeps only the items `limitItems` could still select: the first `maxItems`
+// undated items and the newest `maxItems` dated ones. Passing these to
+// `limitItems` in input order gives the same window as passing every item, so
+// memory stays bounded by `maxItems` however large the input is.
+function createWindowAccumulator(lookbackDays, maxItems) {
+  const undated = [];
+  const dated = [];
+  const classifications = new WeakMap();
+  let seen = 0;
+
+  const classified = (item) => {
+    let classification = classifications.get(item);
+    if (!classification) {
+      classification = classifyItem(item);
+      classifications.set(item, classification);
+    }
+    return { item, classification };
+  };
+
+  return {
+    get seen() {
+      return seen;
+    },
+
+    add(item) {
+      const seq = seen;
+      seen += 1;
+      if (!(item.timestamp instanceof Date)) {
+        if (undated.length < maxItems) {
+          undated.push({ item, seq });
+        }
+        return;
+      }
+      const entry = { item, seq, time: item.timestamp.getTime() };
+      if (dated.length < maxItems) {
+        dated.push(entry);
+        heapSiftUp(dated, dated.length - 1);
+      } else if (heapWorse(dated[0], entry)) {
+        dated[0] = entry;
+        heapSiftDown(dated, 0);
+      }
+    },
+
+    result() {
+      const candidates = [...undated, ...dated].sort((a, b) => a.seq - b.seq).map((x) => x.item);
+      const limited = limitItems(candidates, lookbackDays, maxItems);
+      return { limited, classified: limited.items.map(classified) };
+    },
+  };
+}
+
+async function readTextChunks(source, onChunk) {
+  if (typeof source.stream !== "function") {
+    await onChunk(await source.text(), source.size);
+    return;
+  }
+  const reader = source.stream().getReader();
+  const decoder = new TextDecoder();
+  let bytesRead = 0;
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) {
+      break;
+    }
+    for (let offset = 0; offset < value.byteLength; offset += READ_CHUNK_BYTES) {
+      const part = value.subarray(offset, offset + READ_CHUNK_BYTES);
+      bytesRead += part.byteLength;
+      await onChunk(decoder.decode(part, { stream: true }), bytesRead);
+    }
+  }
+  const tail = decoder.decode();
+  if (tail) {
+    await onChunk(tail, bytesRead);
+  }
+}
+
+function buildReport(limited, classified, lookbackDays, maxItems) {
+  const metrics = aggregate(classified, lookbackDays);
+  const anchorLabel = limited.anchorDate.toISOString().slice(0, 10);
+  return {
+    generatedAt: new Date().toLocaleString(),
+    metrics,
+    leverage: leverageSummary(metrics),
+    assumptions: {
+      window: limited.appliedLookback
+        ? `${lookbackDays} day lookback anchored to latest record (${anchorLabel}), max ${maxItems} items`
+        : `${lookbackDays} day lookback requested; fallback used with latest ${limited.items.length} records (anchor ${anchorLabel}).`,
+    },
+  };
+}
+
+// Reads a File or Blob in chunks, parsing, windowing and classifying as it goes.
+// `onProgress` receives a partial report at most every PROGRESS_INTERVAL_MS; if
+// it returns a promise, reading waits for it (used to yield on the main thread).
+async function runDiagnosticStream(source, options, onProgress) {
+  const { mode, lookbackDays, maxItems } = options;
+  const windowed = createWindowAccumulator(lookbackDays, maxItems);
+  const reader = mode === "csv"
+    ? createCsvItemReader((item) => windowed.add(item))
+    : createTextBatchReader((item) => windowed.add(item));
+
+  let lastProgress = Date.now();
+  await readTextChunks(source, async (text, bytesRead) => {
+    reader.push(text);
+    const now = Date.now();
+    if (onProgress && windowed.seen && now - lastProgress >= PROGRESS_INTERVAL_MS) {
+      lastProgress = now;
+      const { limited, classified } = windowed.result();
+      const report = buildReport(limited, classified, lookbackDays, maxItems);
+      report.progress = { bytesRead, totalBytes: source.size, itemsRead: windowed.seen };
+      await onProgress(report);
+    }
+  });
+  reader.end();
+
+  if (!windowed.seen) {
+    throw new Error("No valid inbound items found. Upload a valid file or paste valid input text.");
+  }
+  const { limited, classified } = windowed.result();
+  return {
+    report: buildReport(limited, classified, lookbackDays, maxItems),
+    fallbackUsed: limited.fallbackUsed,
+    anchorLabel: limited.anchorDate.toISOString().slice(0, 10),
+    itemsRead: windowed.seen,
+  };
+}
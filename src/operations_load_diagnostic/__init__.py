@@ -2,8 +2,19 @@
 
 __all__ = [
     "aggregation",
+    "batch",
+    "caching",
     "classification",
+    "fileio",
     "ingestion",
     "models",
+    "profiling",
     "reporting",
+    "rules",
+    "sampling",
+    "sketches",
+    "watch",
+    "snapshot",
+    "whatif",
+    "windowing",
 ]
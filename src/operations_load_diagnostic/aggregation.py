@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Mapping
 
 from .models import ClassifiedItem, RiskFlag, WorkCategory, WorkNature
+from .sketches import SenderConcentration
 
 
 CONSERVATIVE_MINUTES_BY_CATEGORY: dict[WorkCategory, int] = {
@@ -31,78 +33,102 @@ class DiagnosticMetrics:
     estimated_total_minutes: int
     estimated_hours_per_week: float
     sla_clusters: list[dict[str, object]]
+    # Set only for sampled runs: number of classified items behind the estimates
+    # and 95% intervals keyed like the percentage dicts ("category", "nature", "risk").
+    sample_size: int | None = None
+    percentage_intervals: dict[str, dict[str, tuple[float, float]]] = field(default_factory=dict)
+    estimated_hours_per_week_interval: tuple[float, float] | None = None
+    # Top senders/domains per work category and SLA flag (see sketches.SenderConcentration).
+    sender_concentration: list[dict[str, object]] = field(default_factory=list)
 
 
 def _safe_pct(count: int, total: int) -> float:
     return round((count / total) * 100, 1) if total else 0.0
 
 
-def aggregate_metrics(
-    items: list[ClassifiedItem],
-    fallback_period_days: int = 14,
-) -> DiagnosticMetrics:
-    total = len(items)
-    if total == 0:
-        return DiagnosticMetrics(
-            total_volume=0,
-            period_days=fallback_period_days,
-            category_counts={},
-            category_percentages={},
-            nature_counts={},
-            nature_percentages={},
-            risk_counts={},
-            risk_percentages={},
-            estimated_minutes_by_category={},
-            estimated_total_minutes=0,
-            estimated_hours_per_week=0.0,
-            sla_clusters=[],
-        )
-
-    timestamps = [x.item.timestamp for x in items if x.item.timestamp is not None]
-    if timestamps:
-        min_ts = min(timestamps)
-        max_ts = max(timestamps)
-        period_days = max(1, (max_ts - min_ts).days + 1)
-    else:
-        period_days = fallback_period_days
+def empty_metrics(period_days: int) -> DiagnosticMetrics:
+    return DiagnosticMetrics(
+        total_volume=0,
+        period_days=period_days,
+        category_counts={},
+        category_percentages={},
+        nature_counts={},
+        nature_percentages={},
+        risk_counts={},
+        risk_percentages={},
+        estimated_minutes_by_category={},
+        estimated_total_minutes=0,
+        estimated_hours_per_week=0.0,
+        sla_clusters=[],
+    )
 
-    cat_counter = Counter([x.classification.category.value for x in items])
-    nature_counter = Counter([x.classification.nature.value for x in items])
-    risk_counter = Counter([x.classification.risk.value for x in items])
 
-    estimated_by_category: dict[str, int] = {}
-    for cat_name, count in cat_counter.items():
-        cat_enum = WorkCategory(cat_name)
-        estimated_by_category[cat_name] = count * CONSERVATIVE_MINUTES_BY_CATEGORY[cat_enum]
-    total_minutes = sum(estimated_by_category.values())
-    weekly_hours = round((total_minutes / 60.0) * (7.0 / period_days), 1)
+def period_days_between(
+    min_ts: datetime | None,
+    max_ts: datetime | None,
+    fallback_period_days: int,
+) -> int:
+    if min_ts is None or max_ts is None:
+        return fallback_period_days
+    return max(1, (max_ts - min_ts).days + 1)
 
-    sla_by_category: defaultdict[str, int] = defaultdict(int)
-    for x in items:
-        if x.classification.risk == RiskFlag.SLA_SENSITIVE:
-            sla_by_category[x.classification.category.value] += 1
 
-    sla_clusters = sorted(
+def sla_clusters_from_counts(sla_by_category: Mapping[str, int]) -> list[dict[str, object]]:
+    sla_total = sum(sla_by_category.values())
+    return sorted(
         [
             {
                 "category": category,
                 "count": count,
-                "share_of_sla": _safe_pct(count, sum(sla_by_category.values())),
+                "share_of_sla": _safe_pct(count, sla_total),
             }
             for category, count in sla_by_category.items()
+            if count
         ],
         key=lambda x: x["count"],
         reverse=True,
     )
 
+
+def metrics_from_counts(
+    category_counts: Mapping[str, int],
+    nature_counts: Mapping[str, int],
+    risk_counts: Mapping[str, int],
+    sla_by_category: Mapping[str, int],
+    period_days: int,
+    minutes_by_category: Mapping[WorkCategory, int] | None = None,
+) -> DiagnosticMetrics:
+    """
+    Build metrics from pre-aggregated label counts.
+
+    Shared by `aggregate_metrics` and any caller that maintains counts
+    incrementally instead of holding every classified item.
+    """
+    minutes = minutes_by_category or CONSERVATIVE_MINUTES_BY_CATEGORY
+    cat_counter = {k: v for k, v in category_counts.items() if v}
+    nature_counter = {k: v for k, v in nature_counts.items() if v}
+    risk_counter = {k: v for k, v in risk_counts.items() if v}
+    total = sum(cat_counter.values())
+    if total == 0:
+        return empty_metrics(period_days)
+
+    estimated_by_category: dict[str, int] = {}
+    for cat_name, count in cat_counter.items():
+        cat_enum = WorkCategory(cat_name)
+        estimated_by_category[cat_name] = count * minutes[cat_enum]
+    total_minutes = sum(estimated_by_category.values())
+    weekly_hours = round((total_minutes / 60.0) * (7.0 / period_days), 1)
+
+    sla_clusters = sla_clusters_from_counts(sla_by_category)
+
     return DiagnosticMetrics(
         total_volume=total,
         period_days=period_days,
-        category_counts=dict(cat_counter),
+        category_counts=cat_counter,
         category_percentages={k: _safe_pct(v, total) for k, v in cat_counter.items()},
-        nature_counts=dict(nature_counter),
+        nature_counts=nature_counter,
         nature_percentages={k: _safe_pct(v, total) for k, v in nature_counter.items()},
-        risk_counts=dict(risk_counter),
+        risk_counts=risk_counter,
         risk_percentages={k: _safe_pct(v, total) for k, v in risk_counter.items()},
         estimated_minutes_by_category=estimated_by_category,
         estimated_total_minutes=total_minutes,
@@ -111,6 +137,44 @@ def aggregate_metrics(
     )
 
 
+def aggregate_metrics(
+    items: list[ClassifiedItem],
+    fallback_period_days: int = 14,
+    top_senders: int = 5,
+) -> DiagnosticMetrics:
+    if not items:
+        return empty_metrics(fallback_period_days)
+
+    timestamps = [x.item.timestamp for x in items if x.item.timestamp is not None]
+    period_days = period_days_between(
+        min(timestamps) if timestamps else None,
+        max(timestamps) if timestamps else None,
+        fallback_period_days,
+    )
+
+    cat_counter = Counter([x.classification.category.value for x in items])
+    nature_counter = Counter([x.classification.nature.value for x in items])
+    risk_counter = Counter([x.classification.risk.value for x in items])
+
+    sla_by_category: defaultdict[str, int] = defaultdict(int)
+    for x in items:
+        if x.classification.risk == RiskFlag.SLA_SENSITIVE:
+            sla_by_category[x.classification.category.value] += 1
+
+    concentration = SenderConcentration()
+    concentration.extend(items)
+
+    metrics = metrics_from_counts(
+        cat_counter,
+        nature_counter,
+        risk_counter,
+        sla_by_category,
+        period_days,
+    )
+    metrics.sender_concentration = concentration.rows(top_k=top_senders)
+    return metrics
+
+
 def automation_leverage_summary(metrics: DiagnosticMetrics) -> list[str]:
     summary: list[str] = []
     if metrics.total_volume == 0:
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+from .caching import CachingClassifier
+from .cli import FILE_MODES, build_parser, run_job
+
+if TYPE_CHECKING:
+    from .aggregation import DiagnosticMetrics
+    from .classification import BaseClassifier
+
+_TENANT_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+_PATH_KEYS = {"input", "what_if"}
+# Per-job settings; the classifier, its rules and the worker pool are shared by the batch.
+JOB_KEYS = {
+    "mode",
+    "input",
+    "lookback_days",
+    "max_items",
+    "format",
+    "workers",
+    "no_snapshot",
+    "snapshot_text",
+    "what_if",
+    "sample_per_stratum",
+    "sample_seed",
+    "drilldown",
+    "drilldown_page_size",
+    "imap_host",
+    "imap_user",
+    "imap_password_env",
+    "imap_folder",
+}
+
+
+@dataclass(slots=True)
+class TenantJob:
+    tenant: str
+    args: argparse.Namespace
+    imap_password_env: str | None = None
+
+
+@dataclass(slots=True)
+class BatchManifest:
+    jobs: list[TenantJob]
+    output_dir: Path
+    workers: int = 4
+    classifier: str = "heuristic"
+    openai_model: str = "gpt-4.1-mini"
+    rules: str | None = None
+    cache_entries: int = 100_000
+
+
+@dataclass(slots=True)
+class TenantResult:
+    tenant: str
+    mode: str
+    seconds: float
+    metrics: DiagnosticMetrics | None = None
+    summary: dict[str, object] | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def items_per_second(self) -> float:
+        if self.metrics is None or self.seconds <= 0:
+            return 0.0
+        return round(self.metrics.total_volume / self.seconds, 1)
+
+
+def _resolve(value: str, base: Path) -> str:
+    return value if os.path.isabs(value) else str(base / value)
+
+
+def _job_value(action: argparse.Action, tenant: str, key: str, value: object) -> object:
+    """Convert a manifest value the way argparse would convert the CLI option."""
+    if action.nargs == 0:
+        if not isinstance(value, bool):
+            raise ValueError(f"Job '{tenant}': '{key}' must be true or false, got {value!r}.")
+        return value
+    if isinstance(value, (bool, dict, list)) or value is None:
+        raise ValueError(f"Job '{tenant}': '{key}' must be a single value, got {value!r}.")
+    try:
+        converted = action.type(str(value)) if callable(action.type) else str(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Job '{tenant}': '{key}' has an invalid value {value!r}.") from None
+    if action.choices is not None and converted not in action.choices:
+        choices = ", ".join(map(str, action.choices))
+        raise ValueError(f"Job '{tenant}': '{key}' must be one of {choices}, got {value!r}.")
+    return converted
+
+
+def load_manifest(path: str | Path) -> BatchManifest:
+    """
+    Manifest format (JSON); relative paths are resolved against the manifest's
+    directory, and `defaults` apply to every job unless the job overrides them:
+      {
+        "output_dir": "output/tenants",
+        "workers": 4,
+        "classifier": "heuristic",
+        "rules": "rules.toml",
+        "cache_entries": 100000,
+        "defaults": {"lookback_days": 14, "max_items": 200, "format": "both"},
+        "jobs": [
+          {"tenant": "acme", "mode": "csv", "input": "exports/acme/*.csv"},
+          {"tenant": "globex", "mode": "imap", "imap_host": "imap.globex.example",
+           "imap_user": "ops", "imap_password_env": "GLOBEX_IMAP_PASSWORD"}
+        ]
+      }
+    Job keys are the CLI options of a one-off run (see `JOB_KEYS`), except that
+    IMAP passwords are read from the environment variable `imap_password_env`.
+    Values are converted and checked like the CLI options when the manifest is
+    loaded, so `"lookback_days": "7"` is read as 7 and a bad value fails here.
+    """
+    path = Path(path)
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(raw, dict) or not isinstance(raw.get("jobs"), list) or not raw["jobs"]:
+        raise ValueError("Manifest needs a non-empty 'jobs' list.")
+    base = path.resolve().parent
+    defaults = raw.get("defaults") or {}
+    manifest = BatchManifest(
+        jobs=[],
+        output_dir=Path(_resolve(str(raw.get("output_dir", "output")), base)),
+        workers=int(raw.get("workers", 4)),
+        classifier=str(raw.get("classifier", "heuristic")),
+        openai_model=str(raw.get("openai_model", "gpt-4.1-mini")),
+        rules=_resolve(str(raw["rules"]), base) if raw.get("rules") else None,
+        cache_entries=int(raw.get("cache_entries", 100_000)),
+    )
+    if manifest.workers <= 0:
+        raise ValueError("Manifest 'workers' must be positive.")
+    if manifest.classifier not in {"heuristic", "openai"}:
+        raise ValueError("Manifest 'classifier' must be 'heuristic' or 'openai'.")
+
+    parser = build_parser()
+    actions = {action.dest: action for action in parser._actions}
+    seen: set[str] = set()
+    for entry in raw["jobs"]:
+        job = {**defaults, **entry}
+        tenant = str(job.pop("tenant", ""))
+        if not _TENANT_NAME.match(tenant):
+            raise ValueError(f"Job tenant '{tenant}' must be a simple name (letters, digits, _ . -).")
+        if tenant in seen:
+            raise ValueError(f"Tenant '{tenant}' appears more than once in the manifest.")
+        seen.add(tenant)
+        unknown = sorted(set(job) - JOB_KEYS)
+        if unknown:
+            raise ValueError(f"Job '{tenant}' has unknown keys: {', '.join(unknown)}.")
+        if job.get("mode") not in FILE_MODES | {"imap"}:
+            raise ValueError(f"Job '{tenant}' needs a mode: csv, text, imap, mbox, maildir or snapshot.")
+
+        args = parser.parse_args(["--mode", job["mode"]])
+        # The batch already runs jobs in parallel, so each job reads its files in order.
+        args.workers = 1
+        password_env = job.pop("imap_password_env", None)
+        for key, value in job.items():
+            value = _job_value(actions[key], tenant, key, value)
+            setattr(args, key, _resolve(value, base) if key in _PATH_KEYS else value)
+        args.output_dir = str(manifest.output_dir / tenant)
+        args.report_name = tenant
+        args.classifier = manifest.classifier
+        args.openai_model = manifest.openai_model
+        args.rules = manifest.rules
+        manifest.jobs.append(TenantJob(tenant=tenant, args=args, imap_password_env=password_env))
+    return manifest
+
+
+def build_shared_classifier(manifest: BatchManifest) -> BaseClassifier:
+    from .classification import HeuristicClassifier, OpenAIClassifier
+
+    if manifest.classifier == "openai":
+        classifier: BaseClassifier = OpenAIClassifier(model=manifest.openai_model)
+    elif manifest.rules:
+        from .rules import load_compiled_rules
+
+        classifier = HeuristicClassifier(load_compiled_rules(manifest.rules).compiled)
+    else:
+        classifier = HeuristicClassifier()
+    if manifest.cache_entries:
+        classifier = CachingClassifier(classifier, max_entries=manifest.cache_entries)
+    return classifier
+
+
+def run_tenant(job: TenantJob, classifier: BaseClassifier) -> TenantResult:
+    """Run one job; any failure is recorded on the result instead of raised."""
+    start = time.perf_counter()
+    try:
+        if job.imap_password_env:
+            job.args.imap_password = os.environ.get(job.imap_password_env)
+            if not job.args.imap_password:
+                raise ValueError(f"Environment variable {job.imap_password_env} is not set.")
+        metrics, summary = run_job(job.args, classifier=classifier)
+    except Exception as exc:
+        return TenantResult(
+            tenant=job.tenant,
+            mode=job.args.mode,
+            seconds=round(time.perf_counter() - start, 3),
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return TenantResult(
+        tenant=job.tenant,
+        mode=job.args.mode,
+        seconds=round(time.perf_counter() - start, 3),
+        metrics=metrics,
+        summary=summary,
+    )
+
+
+def batch_summary(
+    results: Sequence[TenantResult],
+    seconds: float,
+    cache_stats: dict[str, int] | None = None,
+) -> dict[str, object]:
+    summary: dict[str, object] = {
+        "jobs": len(results),
+        "failed": sum(1 for r in results if not r.ok),
+        "seconds": round(seconds, 3),
+        "tenants": [
+            {
+                "tenant": r.tenant,
+                "mode": r.mode,
+                "status": "ok" if r.ok else "failed",
+                "seconds": r.seconds,
+                "items_per_second": r.items_per_second,
+                "error": r.error,
+                "items": r.metrics.total_volume if r.metrics else None,
+                "period_days": r.metrics.period_days if r.metrics else None,
+                "estimated_hours_per_week": (
+                    r.metrics.estimated_hours_per_week if r.metrics else None
+                ),
+                "category_percentages": r.metrics.category_percentages if r.metrics else None,
+                "output_files": (r.summary or {}).get("output_files"),
+            }
+            for r in results
+        ],
+    }
+    if cache_stats is not None:
+        summary["classifier_cache"] = cache_stats
+    return summary
+
+
+def run_batch(manifest: BatchManifest) -> dict[str, object]:
+    """
+    Run every job of the manifest on one thread pool with one shared classifier.
+
+    Each tenant gets the usual report set under `output_dir/<tenant>/`; a
+    failing job is recorded and does not stop the others. A cross-tenant
+    comparison is written to `output_dir/batch_<timestamp>.md` and `.json`.
+    Per-job seconds are wall time while sharing the pool, so throughput is
+    comparable between tenants of one batch rather than an isolated benchmark.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .reporting import generate_batch_report, write_report
+
+    classifier = build_shared_classifier(manifest)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=manifest.workers, thread_name_prefix="tenant") as pool:
+        results = list(pool.map(lambda job: run_tenant(job, classifier), manifest.jobs))
+    seconds = time.perf_counter() - start
+
+    cache_stats = classifier.stats() if isinstance(classifier, CachingClassifier) else None
+    summary = batch_summary(results, seconds, cache_stats)
+    base_name = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    report_path = write_report(
+        generate_batch_report(results, manifest.output_dir, seconds, cache_stats),
+        manifest.output_dir / f"{base_name}.md",
+    )
+    summary_path = write_report(
+        json.dumps(summary, indent=2), manifest.output_dir / f"{base_name}.json"
+    )
+    summary["output_files"] = {"comparison": str(report_path), "summary": str(summary_path)}
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run Operations Load Diagnostics for several tenants from one manifest."
+    )
+    parser.add_argument("manifest", help="JSON manifest of tenant jobs.")
+    parser.add_argument("--output-dir", help="Override the manifest's output_dir.")
+    parser.add_argument("--workers", type=int, help="Override the manifest's worker count.")
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.manifest)
+    if args.output_dir:
+        manifest.output_dir = Path(args.output_dir)
+        for job in manifest.jobs:
+            job.args.output_dir = str(manifest.output_dir / job.tenant)
+    if args.workers:
+        manifest.workers = args.workers
+    summary = run_batch(manifest)
+    print(json.dumps(summary, indent=2))
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
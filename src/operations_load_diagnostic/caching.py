@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Sequence
+
+from .classification import BaseClassifier
+from .models import Classification, InboundItem
+
+
+class CachingClassifier(BaseClassifier):
+    """
+    Memoize another classifier by message subject and body.
+
+    Identical messages (re-sent exports, forwarded threads, the same customer
+    mail landing in several inboxes) are classified once, which matters most
+    for `OpenAIClassifier`. The cache holds up to `max_entries` results and
+    drops the oldest first. Instances are safe to share between threads: a
+    message another thread is already classifying is waited for rather than
+    classified again.
+    """
+
+    def __init__(self, inner: BaseClassifier, max_entries: int = 100_000):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive.")
+        self.inner = inner
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache: dict[bytes, Classification] = {}
+        # Keys being classified by some thread right now; other callers wait on the future.
+        self._in_flight: dict[bytes, Future[Classification]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, item: InboundItem) -> bytes:
+        text = f"{item.subject}\0{item.body}".encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(text, digest_size=16).digest()
+
+    @staticmethod
+    def _copy(c: Classification) -> Classification:
+        return Classification(c.category, c.nature, c.risk, c.confidence, list(c.reasons))
+
+    def classify(self, item: InboundItem) -> Classification:
+        return self.classify_batch([item])[0]
+
+    def classify_batch(self, items: Sequence[InboundItem]) -> list[Classification]:
+        keys = [self._key(item) for item in items]
+        results: list[Classification | None] = [None] * len(items)
+        owned: dict[bytes, Future[Classification]] = {}
+        missing: list[int] = []
+        waiting: list[tuple[int, Future[Classification]]] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    results[i] = self._copy(cached)
+                elif key in self._in_flight:
+                    waiting.append((i, self._in_flight[key]))
+                else:
+                    owned[key] = self._in_flight[key] = Future()
+                    missing.append(i)
+            self.hits += len(items) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            # Classify outside the lock so other threads are not held up by slow classifiers.
+            try:
+                fresh = self.inner.classify_batch([items[i] for i in missing])
+            except BaseException as exc:
+                with self._lock:
+                    for key in owned:
+                        del self._in_flight[key]
+                for future in owned.values():
+                    future.set_exception(exc)
+                raise
+            with self._lock:
+                for i, classification in zip(missing, fresh):
+                    results[i] = classification
+                    if len(self._cache) >= self.max_entries:
+                        del self._cache[next(iter(self._cache))]
+                    self._cache[keys[i]] = self._copy(classification)
+                    del self._in_flight[keys[i]]
+            for i, classification in zip(missing, fresh):
+                owned[keys[i]].set_result(classification)
+        # Own work is finished before waiting, so two batches waiting on each other cannot deadlock.
+        for i, future in waiting:
+            try:
+                results[i] = self._copy(future.result())
+            except Exception:
+                # The owner's call failed; retry this item here so the error is our own.
+                results[i] = self.inner.classify(items[i])
+        return results  # type: ignore[return-value]
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import itertools
 import json
 import os
 from abc import ABC, abstractmethod
-from collections import defaultdict
 from dataclasses import dataclass
-from typing import Iterable
-
-from .models import Classification, InboundItem, RiskFlag, WorkCategory, WorkNature
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
 
+from .models import (
+    Classification,
+    ClassifiedItem,
+    InboundItem,
+    RiskFlag,
+    WorkCategory,
+    WorkNature,
+)
 
-def _contains_any(text: str, phrases: Iterable[str]) -> bool:
-    text_lower = text.lower()
-    return any(p in text_lower for p in phrases)
+if TYPE_CHECKING:
+    from .profiling import RuleProfile
 
 
 @dataclass(slots=True)
@@ -116,46 +121,141 @@ DEFAULT_RULESET = RuleSet(
 )
 
 
+@dataclass(slots=True)
+class CompiledRuleSet:
+    """
+    A RuleSet flattened for matching.
+
+    Each distinct keyword is scanned once per text, however many rule lists it
+    appears in; what a hit contributes comes from per-keyword tables.
+    `category_hits[i]` lists (category index, weight) pairs for keyword `i`,
+    where weight counts repeats of the keyword within that category's list.
+    """
+
+    ruleset: RuleSet
+    keywords: tuple[str, ...]
+    categories: tuple[WorkCategory, ...]
+    category_hits: tuple[tuple[tuple[int, int], ...], ...]
+    exception: tuple[bool, ...]
+    sla: tuple[bool, ...]
+
+    def matches(self, text: str) -> list[int]:
+        """Indices of the keywords that occur in an already lower-cased text."""
+        return [i for i, kw in enumerate(self.keywords) if kw in text]
+
+    def outcome(self, hits: Iterable[int], text: str) -> tuple[WorkCategory, bool, bool, int]:
+        """
+        (category, exception-driven, SLA-sensitive, best category score) for
+        the matched keyword indices `hits` of `text`. `RuleProfile` calls it
+        with single keywords left out to see which hits decide the outcome.
+        """
+        scores = [0] * len(self.categories)
+        exception_hit = False
+        sla_hit = False
+        for i in hits:
+            for j, weight in self.category_hits[i]:
+                scores[j] += weight
+            exception_hit = exception_hit or self.exception[i]
+            sla_hit = sla_hit or self.sla[i]
+        best_score = max(scores, default=0)
+        category = self.categories[scores.index(best_score)] if best_score else WorkCategory.OTHER
+        is_exception = category == WorkCategory.EXCEPTION_DELAY or exception_hit
+        sla_sensitive = sla_hit or (category == WorkCategory.EXCEPTION_DELAY and "urgent" in text)
+        return category, is_exception, sla_sensitive, best_score
+
+
+def compile_ruleset(ruleset: RuleSet) -> CompiledRuleSet:
+    keywords = list(
+        dict.fromkeys(
+            [
+                *(kw for kws in ruleset.category_keywords.values() for kw in kws),
+                *ruleset.exception_keywords,
+                *ruleset.sla_keywords,
+            ]
+        )
+    )
+    categories = tuple(ruleset.category_keywords)
+    category_hits: list[dict[int, int]] = [{} for _ in keywords]
+    index = {kw: i for i, kw in enumerate(keywords)}
+    for j, category in enumerate(categories):
+        for kw in ruleset.category_keywords[category]:
+            hits = category_hits[index[kw]]
+            hits[j] = hits.get(j, 0) + 1
+    exception = set(ruleset.exception_keywords)
+    sla = set(ruleset.sla_keywords)
+    return CompiledRuleSet(
+        ruleset=ruleset,
+        keywords=tuple(keywords),
+        categories=categories,
+        category_hits=tuple(tuple(h.items()) for h in category_hits),
+        exception=tuple(kw in exception for kw in keywords),
+        sla=tuple(kw in sla for kw in keywords),
+    )
+
+
 class BaseClassifier(ABC):
     @abstractmethod
     def classify(self, item: InboundItem) -> Classification:
         raise NotImplementedError
 
+    def classify_batch(self, items: Sequence[InboundItem]) -> list[Classification]:
+        """Classify several items at once; subclasses may amortize work across the batch."""
+        return [self.classify(item) for item in items]
+
+
+def classify_items(
+    classifier: BaseClassifier,
+    items: Iterable[InboundItem],
+    batch_size: int = 1000,
+) -> Iterator[ClassifiedItem]:
+    """Stream `ClassifiedItem`s, feeding the classifier `batch_size` items at a time."""
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        for item, classification in zip(batch, classifier.classify_batch(batch)):
+            yield ClassifiedItem(item=item, classification=classification)
+
 
 class HeuristicClassifier(BaseClassifier):
-    def __init__(self, ruleset: RuleSet | None = None):
-        self.ruleset = ruleset or DEFAULT_RULESET
+    def __init__(
+        self,
+        ruleset: RuleSet | CompiledRuleSet | None = None,
+        profile: RuleProfile | None = None,
+    ):
+        if not isinstance(ruleset, CompiledRuleSet):
+            ruleset = compile_ruleset(ruleset or DEFAULT_RULESET)
+        # Replaced as a whole on reload; each classify call reads it once, so a
+        # swap never mixes old and new rules within one item or batch.
+        self.compiled = ruleset
+        # When set, every classified text is also fed to the rule-hit profiler.
+        self.profile = profile
+
+    @property
+    def ruleset(self) -> RuleSet:
+        return self.compiled.ruleset
 
     def classify(self, item: InboundItem) -> Classification:
+        compiled = self.compiled
         text = f"{item.subject}\n{item.body}".lower()
-        scores: dict[WorkCategory, int] = defaultdict(int)
+        if self.profile is not None:
+            self.profile.observe(text)
+        category, is_exception, sla_sensitive, best_score = compiled.outcome(
+            compiled.matches(text), text
+        )
         reasons: list[str] = []
-
-        for category, keywords in self.ruleset.category_keywords.items():
-            for kw in keywords:
-                if kw in text:
-                    scores[category] += 1
-
-        if scores:
-            category = max(scores.items(), key=lambda x: x[1])[0]
+        if best_score:
             reasons.append(f"Matched keywords for {category.value}")
         else:
-            category = WorkCategory.OTHER
             reasons.append("No category-specific keyword match; fallback to Other")
 
-        is_exception = category == WorkCategory.EXCEPTION_DELAY or _contains_any(
-            text, self.ruleset.exception_keywords
-        )
         nature = WorkNature.EXCEPTION_DRIVEN if is_exception else WorkNature.REPETITIVE
-
-        sla_sensitive = _contains_any(text, self.ruleset.sla_keywords) or (
-            category == WorkCategory.EXCEPTION_DELAY and "urgent" in text
-        )
         risk = RiskFlag.SLA_SENSITIVE if sla_sensitive else RiskFlag.NOT_SLA_SENSITIVE
 
         confidence = 0.5
         if category != WorkCategory.OTHER:
-            confidence = min(0.95, 0.55 + (scores.get(category, 0) * 0.1))
+            confidence = min(0.95, 0.55 + (best_score * 0.1))
         if nature == WorkNature.EXCEPTION_DRIVEN:
             reasons.append("Exception indicators present")
         else:
@@ -4,28 +4,41 @@ import argparse
 import json
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
 
-from .aggregation import (
-    CONSERVATIVE_MINUTES_BY_CATEGORY,
-    aggregate_metrics,
-    automation_leverage_summary,
-)
-from .classification import HeuristicClassifier, OpenAIClassifier
-from .ingestion import ingest_csv, ingest_imap, ingest_text_batch, limit_items
-from .models import ClassifiedItem
-from .reporting import (
-    generate_html_report_from_metrics,
-    generate_markdown_report,
-    write_report,
-)
+if TYPE_CHECKING:
+    from .aggregation import DiagnosticMetrics
+    from .classification import BaseClassifier
+    from .models import ClassifiedItem, InboundItem
+    from .reporting import DrilldownPage
+
+# Everything else is imported where it is used: a scheduled `--mode csv
+# --format markdown` run should not pay for IMAP/SSL, the email package,
+# thread pools, snapshots or what-if code. benchmarks/startup.py checks this.
+
+FILE_MODES = {"csv", "text", "mbox", "maildir", "snapshot"}
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Run a one-time Operations Load Diagnostic and generate a static report."
     )
-    parser.add_argument("--mode", choices=["csv", "text", "imap"], required=True)
-    parser.add_argument("--input", help="Path for csv/text mode.")
+    parser.add_argument(
+        "--mode",
+        choices=["csv", "text", "imap", "mbox", "maildir", "snapshot"],
+        required=True,
+    )
+    parser.add_argument(
+        "--input",
+        help="Path for csv/text/mbox/maildir/snapshot mode. csv/text/mbox also accept a "
+        "directory or glob, and .gz/.bz2/.xz files.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Files read in parallel when --input matches several files.",
+    )
     parser.add_argument("--lookback-days", type=int, default=14)
     parser.add_argument("--max-items", type=int, default=200)
     parser.add_argument("--output-dir", default="output")
@@ -33,6 +46,58 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--format", choices=["markdown", "html", "both"], default="both")
     parser.add_argument("--classifier", choices=["heuristic", "openai"], default="heuristic")
     parser.add_argument("--openai-model", default="gpt-4.1-mini")
+    parser.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Skip writing the binary snapshot of classified items.",
+    )
+    parser.add_argument(
+        "--snapshot-text",
+        action="store_true",
+        help="Also store item ids, senders, subjects and bodies next to the snapshot.",
+    )
+    parser.add_argument(
+        "--what-if",
+        help="Snapshot mode only: JSON grid of minutes/lookback/max-items scenarios to compare.",
+    )
+    parser.add_argument(
+        "--sample-per-stratum",
+        type=int,
+        default=0,
+        help="Classify a stratified reservoir sample of up to N items per day and source "
+        "instead of the newest --max-items, and report confidence intervals.",
+    )
+    parser.add_argument("--sample-seed", type=int, help="Seed for reproducible sampling.")
+    parser.add_argument(
+        "--rules",
+        help="Heuristic classifier only: JSON or TOML rule file replacing the built-in keywords. "
+        "Reloaded on change in --watch mode.",
+    )
+    parser.add_argument(
+        "--profile-rules",
+        action="store_true",
+        help="Heuristic classifier only: record rule hits and scan time, and write a "
+        "<report>.rules.md cost/benefit report.",
+    )
+    parser.add_argument(
+        "--drilldown",
+        action="store_true",
+        help="Also write a per-item table, split into linked pages of --drilldown-page-size rows.",
+    )
+    parser.add_argument("--drilldown-page-size", type=int, default=500)
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="csv/text only: poll the --input directory and refresh the reports incrementally.",
+    )
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="Seconds between polls.")
+    parser.add_argument("--max-polls", type=int, help="Stop watching after N polls.")
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=30.0,
+        help="A file unchanged this long is treated as complete, including its last record.",
+    )
 
     parser.add_argument("--imap-host")
     parser.add_argument("--imap-user")
@@ -42,81 +107,241 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def run(args: argparse.Namespace) -> dict[str, object]:
-    if args.mode in {"csv", "text"} and not args.input:
-        raise ValueError("--input is required for csv/text mode.")
+def _ingest(args: argparse.Namespace) -> Iterable[InboundItem]:
+    if args.mode == "imap":
+        return _ingest_imap(args)
+    from .ingestion import expand_inputs, iter_inputs
 
     if args.mode == "csv":
-        inbound = ingest_csv(args.input)
-    elif args.mode == "text":
-        inbound = ingest_text_batch(args.input)
-    else:
-        if not all([args.imap_host, args.imap_user, args.imap_password]):
-            raise ValueError(
-                "IMAP mode requires --imap-host, --imap-user, and --imap-password."
-            )
-        inbound = ingest_imap(
-            host=args.imap_host,
-            username=args.imap_user,
-            password=args.imap_password,
-            folder=args.imap_folder,
-            lookback_days=args.lookback_days,
-            max_items=args.max_items,
+        from .ingestion import iter_csv
+
+        return iter_inputs(expand_inputs(args.input), iter_csv, workers=args.workers)
+    if args.mode == "text":
+        from .ingestion import iter_text_batch
+
+        return iter_inputs(expand_inputs(args.input), iter_text_batch, workers=args.workers)
+    if args.mode == "mbox":
+        from .ingestion import iter_mbox
+
+        return iter_inputs(
+            expand_inputs(args.input),
+            lambda path: iter_mbox(path, lookback_days=args.lookback_days),
+            workers=args.workers,
         )
+    from .ingestion import iter_maildir
 
-    inbound = limit_items(
-        inbound,
+    return iter_maildir(args.input, lookback_days=args.lookback_days)
+
+
+def _ingest_imap(args: argparse.Namespace) -> list[InboundItem]:
+    from .ingestion import ingest_imap
+
+    if not all([args.imap_host, args.imap_user, args.imap_password]):
+        raise ValueError(
+            "IMAP mode requires --imap-host, --imap-user, and --imap-password."
+        )
+    return ingest_imap(
+        host=args.imap_host,
+        username=args.imap_user,
+        password=args.imap_password,
+        folder=args.imap_folder,
         lookback_days=args.lookback_days,
         max_items=args.max_items,
     )
 
+
+def _build_classifier(args: argparse.Namespace) -> BaseClassifier:
+    from .classification import HeuristicClassifier, OpenAIClassifier
+
     if args.classifier == "openai":
-        classifier = OpenAIClassifier(model=args.openai_model)
-    else:
-        classifier = HeuristicClassifier()
+        return OpenAIClassifier(model=args.openai_model)
+    if args.rules and not args.watch:
+        from .rules import load_compiled_rules
+
+        return HeuristicClassifier(load_compiled_rules(args.rules).compiled)
+    # In watch mode the watcher loads --rules itself so it can reload them.
+    return HeuristicClassifier()
 
-    classified: list[ClassifiedItem] = [
-        ClassifiedItem(item=item, classification=classifier.classify(item)) for item in inbound
-    ]
 
-    metrics = aggregate_metrics(classified, fallback_period_days=args.lookback_days)
-    leverage = automation_leverage_summary(metrics)
+def _watch(args: argparse.Namespace) -> dict[str, object]:
+    from .watch import DropDirectoryWatcher
+
+    watcher = DropDirectoryWatcher(
+        args.input,
+        args.mode,
+        _build_classifier(args),
+        args.output_dir,
+        report_name=args.report_name,
+        lookback_days=args.lookback_days,
+        report_format=args.format,
+        classifier_name=f"{args.classifier} ({args.rules})" if args.rules else args.classifier,
+        settle_seconds=args.settle_seconds,
+        rules_path=args.rules,
+    )
+    return watcher.run(interval=args.poll_interval, max_polls=args.max_polls)
 
-    assumptions = {
-        "Diagnostic mode": "Read-only, one-time static snapshot; no workflow changes.",
-        "Window cap": f"{args.lookback_days} day lookback and max {args.max_items} items.",
-        "Handling time defaults (minutes/category)": ", ".join(
-            [f"{k.value}: {v}" for k, v in CONSERVATIVE_MINUTES_BY_CATEGORY.items()]
-        ),
-        "Classifier": args.classifier,
-        "Accuracy expectation": "Directionally correct prioritization, not perfect labeling.",
-    }
+
+def _validate(args: argparse.Namespace) -> None:
+    if args.mode in FILE_MODES and not args.input:
+        raise ValueError("--input is required for csv/text/mbox/maildir/snapshot mode.")
+    if args.what_if and args.mode != "snapshot":
+        raise ValueError("--what-if requires --mode snapshot.")
+    if args.rules and args.classifier != "heuristic":
+        raise ValueError("--rules applies to the heuristic classifier only.")
+    if args.profile_rules and (args.mode == "snapshot" or args.watch or args.classifier != "heuristic"):
+        raise ValueError("--profile-rules needs the heuristic classifier and a one-off run.")
+    if args.drilldown and args.watch:
+        raise ValueError("--drilldown is not available in --watch mode, which keeps only counts.")
+
+
+def run(args: argparse.Namespace) -> dict[str, object]:
+    if args.watch:
+        _validate(args)
+        return _watch(args)
+    return run_job(args)[1]
+
+
+def run_job(
+    args: argparse.Namespace, classifier: BaseClassifier | None = None
+) -> tuple[DiagnosticMetrics, dict[str, object]]:
+    """
+    One-off diagnostic for parsed CLI arguments; returns the metrics and the
+    report summary. Pass `classifier` to share one between several runs.
+    """
+    _validate(args)
+    if args.watch:
+        raise ValueError("run_job() does not support --watch; use run().")
+    from .reporting import build_assumptions, write_report, write_report_set
 
     output_dir = Path(args.output_dir)
     timestamp_tag = datetime.now().strftime("%Y%m%d_%H%M%S")
     base_name = f"{args.report_name}_{timestamp_tag}"
-
     output_files: dict[str, str] = {}
-    if args.format in {"markdown", "both"}:
-        md_content = generate_markdown_report(metrics, leverage, assumptions)
-        md_path = write_report(md_content, output_dir / f"{base_name}.md")
-        output_files["markdown"] = str(md_path)
-    if args.format in {"html", "both"}:
-        html_content = generate_html_report_from_metrics(metrics, leverage, assumptions)
-        html_path = write_report(html_content, output_dir / f"{base_name}.html")
-        output_files["html"] = str(html_path)
-
-    summary = {
-        "items_processed": metrics.total_volume,
-        "period_days": metrics.period_days,
-        "estimated_hours_per_week": metrics.estimated_hours_per_week,
-        "output_files": output_files,
-    }
-    write_report(
-        json.dumps(summary, indent=2),
-        output_dir / f"{base_name}.summary.json",
-    )
-    return summary
+    drilldown_pages: list[DrilldownPage] = []
+
+    def drilldown(items: Iterable[ClassifiedItem]) -> None:
+        if args.drilldown:
+            from .reporting import write_drilldown_pages
+
+            drilldown_pages.extend(
+                write_drilldown_pages(
+                    items, output_dir, base_name, args.format, args.drilldown_page_size
+                )
+            )
+
+    if args.mode == "snapshot":
+        from .snapshot import load_snapshot
+
+        with load_snapshot(args.input) as snapshot:
+            metrics = snapshot.aggregate(fallback_period_days=args.lookback_days)
+            drilldown(snapshot.iter_classified())
+            if args.what_if:
+                from .reporting import generate_what_if_report
+                from .whatif import Scenario, load_scenario_grid, run_what_if, what_if_summary
+
+                # A grid without axes expands to its own "defaults" scenario.
+                grid = [s for s in load_scenario_grid(args.what_if) if s.name != "defaults"]
+                scenarios = [Scenario(name="defaults"), *grid]
+                results = run_what_if(
+                    snapshot, scenarios, fallback_period_days=args.lookback_days
+                )
+                what_if_path = write_report(
+                    generate_what_if_report(results),
+                    output_dir / f"{base_name}.whatif.md",
+                )
+                write_report(
+                    json.dumps(what_if_summary(results), indent=2),
+                    output_dir / f"{base_name}.whatif.json",
+                )
+                output_files["what_if"] = str(what_if_path)
+        window_cap = f"Window applied when the snapshot was written ({len(snapshot)} items)."
+        classifier_name = f"cached classifications from {args.input}"
+    else:
+        if classifier is None:
+            classifier = _build_classifier(args)
+        classifier_name = args.classifier
+        profile = None
+        if args.profile_rules:
+            from .classification import HeuristicClassifier
+            from .profiling import RuleProfile
+
+            # Profile on a private classifier so a shared one is left untouched,
+            # and look through a batch's CachingClassifier (its `inner`) so the
+            # cache does not hide repeated messages.
+            rules_source = getattr(classifier, "inner", classifier)
+            if not isinstance(rules_source, HeuristicClassifier):
+                raise ValueError("--profile-rules needs the heuristic classifier.")
+            compiled = rules_source.compiled
+            profile = RuleProfile(compiled)
+            classifier = HeuristicClassifier(compiled, profile=profile)
+        if args.rules:
+            classifier_name = f"{args.classifier} ({args.rules})"
+
+        if args.sample_per_stratum:
+            from .ingestion import iter_within_lookback
+            from .sampling import StratifiedReservoirSampler, estimate_metrics
+
+            sampler = StratifiedReservoirSampler(args.sample_per_stratum, seed=args.sample_seed)
+            sampler.extend(iter_within_lookback(_ingest(args), args.lookback_days))
+            strata = sampler.classify(classifier)
+            drilldown(x for stratum in strata for x in stratum.sample)
+            metrics = estimate_metrics(
+                strata,
+                sampler.min_ts,
+                sampler.max_ts,
+                fallback_period_days=args.lookback_days,
+            )
+            window_cap = (
+                f"{args.lookback_days} day lookback; stratified sample of up to "
+                f"{args.sample_per_stratum} items per day and source instead of a max-items cap."
+            )
+        else:
+            from .aggregation import aggregate_metrics
+            from .classification import classify_items
+            from .ingestion import limit_items
+
+            inbound = limit_items(
+                _ingest(args),
+                lookback_days=args.lookback_days,
+                max_items=args.max_items,
+            )
+
+            classified: list[ClassifiedItem] = list(classify_items(classifier, inbound))
+
+            metrics = aggregate_metrics(classified, fallback_period_days=args.lookback_days)
+            drilldown(classified)
+            window_cap = f"{args.lookback_days} day lookback and max {args.max_items} items."
+            if not args.no_snapshot:
+                from .snapshot import SNAPSHOT_SUFFIX, write_snapshot
+
+                snapshot_path = write_snapshot(
+                    classified,
+                    output_dir / f"{base_name}{SNAPSHOT_SUFFIX}",
+                    include_text=args.snapshot_text,
+                )
+                output_files["snapshot"] = str(snapshot_path)
+
+        if profile is not None:
+            from .reporting import generate_rule_profile_report
+
+            rules_path = write_report(
+                generate_rule_profile_report(profile), output_dir / f"{base_name}.rules.md"
+            )
+            write_report(
+                json.dumps(profile.to_dict(), indent=2), output_dir / f"{base_name}.rules.json"
+            )
+            output_files["rule_profile"] = str(rules_path)
+
+    assumptions = build_assumptions(window_cap, classifier_name)
+    return metrics, write_report_set(
+        metrics,
+        assumptions,
+        output_dir,
+        base_name,
+        report_format=args.format,
+        output_files=output_files,
+        drilldown_pages=drilldown_pages,
+    )
 
 
 def main() -> None:
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+from pathlib import Path
+from typing import Iterator, TextIO
+
+
+@contextlib.contextmanager
+def open_report(path: str | Path) -> Iterator[TextIO]:
+    """
+    Open a report for streamed writing via a temporary file that is renamed
+    into place on success, so readers never see a partial report.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as fh:
+            yield fh
+        os.replace(tmp, target)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            tmp.unlink()
+        raise
+
+
+def write_report(content: str, path: str | Path) -> Path:
+    with open_report(path) as fh:
+        fh.write(content)
+    return Path(path)
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
-import csv
-import email
-import imaplib
+import importlib
+import itertools
+import os
 import re
 from datetime import datetime, timedelta
-from email.header import decode_header, make_header
-from email.message import Message
 from pathlib import Path
-from typing import Iterable
+from typing import IO, TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator
 
 from .models import InboundItem
 
+if TYPE_CHECKING:
+    import queue
+    import threading
+    from email.message import Message
+
+# csv, glob, the compression modules, thread pools, the email package and
+# imaplib are imported inside the readers that need them, so a run only
+# loads what its input mode uses.
+
 
 def parse_timestamp(value: str | None) -> datetime | None:
     if not value:
@@ -41,42 +48,193 @@ def parse_timestamp(value: str | None) -> datetime | None:
     return None
 
 
-def limit_items(
+# Suffix -> module providing a streaming `open()`; imported on first use.
+COMPRESSED_MODULES: dict[str, str] = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "lzma",
+}
+
+
+def open_input(
+    path: str | Path,
+    mode: str = "r",
+    encoding: str | None = None,
+    newline: str | None = None,
+) -> IO:
+    """Open a plain, .gz, .bz2 or .xz file; compressed files are decompressed as a stream."""
+    path = Path(path)
+    module = COMPRESSED_MODULES.get(path.suffix.lower())
+    opener: Callable[..., IO] | None = importlib.import_module(module).open if module else None
+    if mode == "r":
+        mode = "rt" if opener else "r"
+    if "b" in mode:
+        return opener(path, mode) if opener else path.open(mode)
+    if opener:
+        return opener(path, mode, encoding=encoding, newline=newline)
+    return path.open(mode, encoding=encoding, newline=newline)
+
+
+def expand_inputs(spec: str | Path) -> list[Path]:
+    """
+    Resolve `--input` to files: a single file, every file in a directory,
+    or a glob pattern (`**` allowed). Results are sorted for a stable order.
+    """
+    path = Path(spec)
+    if path.is_dir():
+        paths = sorted(p for p in path.iterdir() if p.is_file() and not p.name.startswith("."))
+    elif any(ch in str(spec) for ch in "*?["):
+        import glob
+
+        paths = sorted(Path(p) for p in glob.glob(str(spec), recursive=True) if Path(p).is_file())
+    else:
+        paths = [path]
+    if not paths:
+        raise FileNotFoundError(f"No input files match {spec}")
+    return paths
+
+
+_END_OF_FILE = object()
+
+
+def _put_unless_stopped(q: queue.Queue, value: object, stop: threading.Event) -> bool:
+    import queue
+
+    while not stop.is_set():
+        try:
+            q.put(value, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_in_parallel(
+    paths: list[Path],
+    reader: Callable[[Path], Iterable[InboundItem]],
+    workers: int,
+    chunk_size: int,
+    prefetch_chunks: int,
+) -> Iterator[InboundItem]:
+    """
+    Read files on a thread pool and yield their items in file order.
+
+    Each file feeds a bounded queue of item chunks, so workers read ahead by at
+    most `prefetch_chunks` chunks per file. Decompression and file I/O release
+    the GIL, which is where the overlap comes from.
+    """
+    import queue
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    stop = threading.Event()
+    queues: list[queue.Queue] = [queue.Queue(maxsize=prefetch_chunks) for _ in paths]
+
+    def produce(path: Path, q: queue.Queue) -> None:
+        try:
+            chunk: list[InboundItem] = []
+            for item in reader(path):
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    if not _put_unless_stopped(q, chunk, stop):
+                        return
+                    chunk = []
+            if chunk and not _put_unless_stopped(q, chunk, stop):
+                return
+            _put_unless_stopped(q, _END_OF_FILE, stop)
+        except Exception as exc:
+            _put_unless_stopped(q, exc, stop)
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+    try:
+        # Tasks start in submission order, so the file being consumed always
+        # has a worker even when later files are blocked on full queues.
+        for path, q in zip(paths, queues):
+            pool.submit(produce, path, q)
+        for q in queues:
+            while True:
+                value = q.get()
+                if value is _END_OF_FILE:
+                    break
+                if isinstance(value, Exception):
+                    raise value
+                yield from value
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_inputs(
+    paths: Iterable[str | Path],
+    reader: Callable[[Path], Iterable[InboundItem]],
+    workers: int = 4,
+    chunk_size: int = 500,
+    prefetch_chunks: int = 8,
+) -> Iterator[InboundItem]:
+    """
+    Merge several input files into one item stream with globally unique ids.
+
+    Items keep file order (and row order within a file) and are renumbered
+    `<source>-<n>` across all files, so a single file keeps its usual ids.
+    """
+    paths = [Path(p) for p in paths]
+    if len(paths) > 1 and workers > 1:
+        stream: Iterable[InboundItem] = _read_in_parallel(
+            paths, reader, min(workers, len(paths)), chunk_size, prefetch_chunks
+        )
+    else:
+        stream = itertools.chain.from_iterable(reader(p) for p in paths)
+    for n, item in enumerate(stream, start=1):
+        item.item_id = f"{item.source}-{n}"
+        yield item
+
+
+def iter_within_lookback(
     items: Iterable[InboundItem],
     lookback_days: int = 14,
-    max_items: int = 200,
-) -> list[InboundItem]:
-    now = datetime.now()
-    threshold = now - timedelta(days=lookback_days)
-    filtered: list[InboundItem] = []
-
+    now: datetime | None = None,
+) -> Iterator[InboundItem]:
+    threshold = (now or datetime.now()) - timedelta(days=lookback_days)
     for item in items:
         if item.timestamp and item.timestamp < threshold:
             continue
-        filtered.append(item)
+        yield item
+
 
+def limit_items(
+    items: Iterable[InboundItem],
+    lookback_days: int = 14,
+    max_items: int = 200,
+) -> list[InboundItem]:
+    now = datetime.now()
+    filtered = list(iter_within_lookback(items, lookback_days, now))
     filtered.sort(key=lambda x: x.timestamp or now, reverse=True)
     return filtered[:max_items]
 
 
-def ingest_csv(path: str | Path) -> list[InboundItem]:
-    path = Path(path)
-    items: list[InboundItem] = []
+def csv_row_to_item(row: dict[str, str | None], item_id: str) -> InboundItem:
+    return InboundItem(
+        item_id=item_id,
+        timestamp=parse_timestamp(row.get("timestamp")),
+        sender=(row.get("sender") or "").strip() or None,
+        subject=(row.get("subject") or "").strip(),
+        body=(row.get("body") or "").strip(),
+        source="csv",
+    )
+
+
+def iter_csv(path: str | Path) -> Iterator[InboundItem]:
+    import csv
 
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
+    path = Path(path)
+    with open_input(path, "r", encoding="utf-8-sig", newline="") as f:
         reader = csv.DictReader(f)
         for idx, row in enumerate(reader, start=1):
-            items.append(
-                InboundItem(
-                    item_id=f"csv-{idx}",
-                    timestamp=parse_timestamp(row.get("timestamp")),
-                    sender=(row.get("sender") or "").strip() or None,
-                    subject=(row.get("subject") or "").strip(),
-                    body=(row.get("body") or "").strip(),
-                    source="csv",
-                )
-            )
-    return items
+            yield csv_row_to_item(row, f"csv-{idx}")
+
+
+def ingest_csv(path: str | Path) -> list[InboundItem]:
+    return list(iter_csv(path))
 
 
 def _extract_prefixed_line(block: str, prefix: str) -> str | None:
@@ -86,6 +244,54 @@ def _extract_prefixed_line(block: str, prefix: str) -> str | None:
     return None
 
 
+def parse_text_block(block: str, idx: int) -> InboundItem:
+    timestamp = parse_timestamp(_extract_prefixed_line(block, "timestamp"))
+    sender = _extract_prefixed_line(block, "sender")
+    subject = _extract_prefixed_line(block, "subject") or ""
+
+    body = ""
+    body_marker = re.search(r"(?im)^body\s*:\s*$", block)
+    if body_marker:
+        body = block[body_marker.end() :].strip()
+    else:
+        body = block.strip()
+
+    if not subject:
+        first_line = body.splitlines()[0] if body else ""
+        subject = (first_line[:80] + "...") if len(first_line) > 80 else first_line
+
+    return InboundItem(
+        item_id=f"text-{idx}",
+        timestamp=timestamp,
+        sender=sender,
+        subject=subject,
+        body=body,
+        source="text",
+    )
+
+
+def iter_text_batch(path: str | Path) -> Iterator[InboundItem]:
+    """
+    Streaming variant of `ingest_text_batch`; holds one message block at a time.
+    """
+    path = Path(path)
+    idx = 0
+    lines: list[str] = []
+    with open_input(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip() != "---":
+                lines.append(line)
+                continue
+            block = "".join(lines).strip()
+            lines = []
+            if block:
+                idx += 1
+                yield parse_text_block(block, idx)
+    block = "".join(lines).strip()
+    if block:
+        yield parse_text_block(block, idx + 1)
+
+
 def ingest_text_batch(path: str | Path) -> list[InboundItem]:
     """
     Batch format:
@@ -97,43 +303,14 @@ def ingest_text_batch(path: str | Path) -> list[InboundItem]:
       body:
       Please share ETA...
     """
-    path = Path(path)
-    text = path.read_text(encoding="utf-8")
-    raw_blocks = [b.strip() for b in re.split(r"(?m)^\s*---\s*$", text) if b.strip()]
-    items: list[InboundItem] = []
-
-    for idx, block in enumerate(raw_blocks, start=1):
-        timestamp = parse_timestamp(_extract_prefixed_line(block, "timestamp"))
-        sender = _extract_prefixed_line(block, "sender")
-        subject = _extract_prefixed_line(block, "subject") or ""
-
-        body = ""
-        body_marker = re.search(r"(?im)^body\s*:\s*$", block)
-        if body_marker:
-            body = block[body_marker.end() :].strip()
-        else:
-            body = block.strip()
-
-        if not subject:
-            first_line = body.splitlines()[0] if body else ""
-            subject = (first_line[:80] + "...") if len(first_line) > 80 else first_line
-
-        items.append(
-            InboundItem(
-                item_id=f"text-{idx}",
-                timestamp=timestamp,
-                sender=sender,
-                subject=subject,
-                body=body,
-                source="text",
-            )
-        )
-    return items
+    return list(iter_text_batch(path))
 
 
 def _decode_mime_header(raw_value: str | None) -> str:
     if not raw_value:
         return ""
+    from email.header import decode_header, make_header
+
     return str(make_header(decode_header(raw_value)))
 
 
@@ -157,6 +334,132 @@ def _extract_text_body(msg: Message) -> str:
         return payload.decode("utf-8", errors="replace")
 
 
+def _header_timestamp(date_raw: str | None) -> datetime | None:
+    """Parse a Date header into naive local time so it compares with CSV/text timestamps."""
+    if not date_raw:
+        return None
+    from email.utils import parsedate_to_datetime
+
+    try:
+        timestamp = parsedate_to_datetime(date_raw)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+
+def _message_to_item(headers: Message, msg: Message, item_id: str, source: str) -> InboundItem:
+    return InboundItem(
+        item_id=item_id,
+        timestamp=_header_timestamp(headers.get("Date")),
+        sender=_decode_mime_header(headers.get("From")) or None,
+        subject=_decode_mime_header(headers.get("Subject")),
+        body=_extract_text_body(msg).strip(),
+        source=source,
+    )
+
+
+def _read_header_block(fh: BinaryIO) -> bytes:
+    """Read raw header lines up to the first blank line, leaving `fh` at the body."""
+    lines: list[bytes] = []
+    for line in iter(fh.readline, b""):
+        if line in (b"\n", b"\r\n"):
+            break
+        lines.append(line)
+    return b"".join(lines)
+
+
+_DATE_LINE = re.compile(rb"^Date:[ \t]*(.*(?:\r?\n[ \t].*)*)", re.IGNORECASE | re.MULTILINE)
+
+
+def _before_window(raw_headers: bytes, threshold: datetime) -> bool:
+    """Cheap Date check on raw header bytes, so old messages skip header parsing entirely."""
+    match = _DATE_LINE.search(raw_headers)
+    if not match:
+        return False
+    timestamp = _header_timestamp(match.group(1).decode("latin-1").strip())
+    return timestamp is not None and timestamp < threshold
+
+
+_QUOTED_FROM = re.compile(rb">+From ")
+
+
+def iter_mbox(path: str | Path, lookback_days: int = 14) -> Iterator[InboundItem]:
+    """
+    Single-pass mbox reader.
+
+    Messages dated before the lookback window are skipped line by line after a
+    raw Date check, without any header or MIME parse. Only in-window messages
+    are buffered; their headers go through `BytesHeaderParser` and the body
+    through a full parse for the first text/plain part.
+    """
+    from email.parser import BytesHeaderParser, BytesParser
+    from email.policy import compat32
+
+    threshold = datetime.now() - timedelta(days=lookback_days)
+    header_parser = BytesHeaderParser(policy=compat32)
+    body_parser = BytesParser(policy=compat32)
+    idx = 0
+
+    with open_input(path, "rb") as fh:
+        line = fh.readline()
+        while line and not line.startswith(b"From "):
+            line = fh.readline()
+        while line:
+            # `line` is the "From " separator of the current message.
+            raw_headers = _read_header_block(fh)
+            keep = not _before_window(raw_headers, threshold)
+            body_lines: list[bytes] = []
+            previous_blank = True
+            line = fh.readline()
+            while line and not (previous_blank and line.startswith(b"From ")):
+                if keep:
+                    # Undo mboxrd ">From " quoting of body lines.
+                    body_lines.append(line[1:] if _QUOTED_FROM.match(line) else line)
+                previous_blank = line in (b"\n", b"\r\n")
+                line = fh.readline()
+            if not keep:
+                continue
+            idx += 1
+            headers = header_parser.parsebytes(raw_headers)
+            msg = body_parser.parsebytes(raw_headers + b"\n" + b"".join(body_lines))
+            yield _message_to_item(headers, msg, f"mbox-{idx}", "mbox")
+
+
+def iter_maildir(path: str | Path, lookback_days: int = 14) -> Iterator[InboundItem]:
+    """
+    Maildir reader over `cur/` and `new/`.
+
+    Each file's header block is read and date-filtered before its body is read.
+    """
+    from email.parser import BytesHeaderParser, BytesParser
+    from email.policy import compat32
+
+    threshold = datetime.now() - timedelta(days=lookback_days)
+    header_parser = BytesHeaderParser(policy=compat32)
+    body_parser = BytesParser(policy=compat32)
+    root = Path(path)
+    idx = 0
+
+    for sub in ("cur", "new"):
+        folder = root / sub
+        if not folder.is_dir():
+            continue
+        with os.scandir(folder) as entries:
+            names = sorted(e.name for e in entries if e.is_file() and not e.name.startswith("."))
+        for name in names:
+            with (folder / name).open("rb") as fh:
+                raw_headers = _read_header_block(fh)
+                if _before_window(raw_headers, threshold):
+                    continue
+                body = fh.read()
+            idx += 1
+            headers = header_parser.parsebytes(raw_headers)
+            msg = body_parser.parsebytes(raw_headers + b"\n" + body)
+            yield _message_to_item(headers, msg, f"maildir-{idx}", "maildir")
+
+
 def ingest_imap(
     host: str,
     username: str,
@@ -168,6 +471,9 @@ def ingest_imap(
     """
     Read-only IMAP fetch for recent inbound messages.
     """
+    import email
+    import imaplib
+
     client = imaplib.IMAP4_SSL(host)
     client.login(username, password)
     client.select(folder, readonly=True)
@@ -189,26 +495,7 @@ def ingest_imap(
         if not raw_email:
             continue
         msg = email.message_from_bytes(raw_email)
-        subject = _decode_mime_header(msg.get("Subject"))
-        sender = _decode_mime_header(msg.get("From")) or None
-        date_raw = msg.get("Date")
-        timestamp = None
-        if date_raw:
-            try:
-                timestamp = email.utils.parsedate_to_datetime(date_raw)
-            except (TypeError, ValueError):
-                timestamp = None
-        body = _extract_text_body(msg).strip()
-        items.append(
-            InboundItem(
-                item_id=f"imap-{idx}",
-                timestamp=timestamp,
-                sender=sender,
-                subject=subject,
-                body=body,
-                source="imap",
-            )
-        )
+        items.append(_message_to_item(msg, msg, f"imap-{idx}", "imap"))
 
     client.logout()
     items.sort(key=lambda x: x.timestamp or datetime.now(), reverse=True)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import random
+import re
+import time
+from dataclasses import dataclass
+
+from .classification import CompiledRuleSet, RuleSet, compile_ruleset
+
+EXCEPTION_GROUP = "Exception keywords"
+SLA_GROUP = "SLA keywords"
+# Texts kept for timing keywords after the run, and how often each is re-timed.
+SCAN_SAMPLE_SIZE = 256
+SCAN_REPEAT = 5
+
+
+@dataclass(slots=True)
+class KeywordStats:
+    group: str
+    keyword: str
+    hits: int = 0
+    in_word_hits: int = 0
+    decisive: int = 0
+    # Estimated from a sample of texts by `RuleProfile.measure_keywords()`.
+    scan_ns: int = 0
+
+    @property
+    def redundant(self) -> int:
+        return self.hits - self.decisive
+
+
+@dataclass(slots=True)
+class GroupStats:
+    group: str
+    keywords: int
+    items_matched: int = 0
+    items_won: int = 0
+    scan_ns: int = 0
+
+
+@dataclass(slots=True)
+class _Rule:
+    stats: KeywordStats
+    whole_word: re.Pattern[str]
+    # Index of the keyword in the compiled rule set.
+    index: int
+
+
+class RuleProfile:
+    """
+    Rule-hit counters for a `RuleSet` across a run.
+
+    For every observed item text it records which keywords match, whether a
+    match only occurs inside a longer word (e.g. "pod" in "tripod"), how long
+    each rule group takes to scan, and whether each hit was decisive: removing
+    that keyword alone would change the item's category, nature or SLA flag.
+    Hits that are not decisive are redundant.
+
+    Per-keyword scan times are not clocked during the run, where the timer
+    calls would cost more than the scans; `measure_keywords()` times each
+    keyword over a reservoir sample of the observed texts instead.
+    """
+
+    def __init__(self, ruleset: RuleSet | CompiledRuleSet):
+        if not isinstance(ruleset, CompiledRuleSet):
+            ruleset = compile_ruleset(ruleset)
+        self.compiled = ruleset
+        self.ruleset = ruleset.ruleset
+        self.items = 0
+        self._sample: list[str] = []
+        self._rng = random.Random(0)
+        self._measured_items = 0
+        self.groups: dict[str, GroupStats] = {}
+        self.keywords: dict[tuple[str, str], KeywordStats] = {}
+        self._plan: list[tuple[GroupStats, list[_Rule]]] = []
+        named_groups = [
+            *((c.value, keywords) for c, keywords in self.ruleset.category_keywords.items()),
+            (EXCEPTION_GROUP, self.ruleset.exception_keywords),
+            (SLA_GROUP, self.ruleset.sla_keywords),
+        ]
+        index = {kw: i for i, kw in enumerate(ruleset.keywords)}
+        for name, keywords in named_groups:
+            unique = list(dict.fromkeys(keywords))
+            group = self.groups[name] = GroupStats(group=name, keywords=len(unique))
+            rules = []
+            for kw in unique:
+                stats = self.keywords[(name, kw)] = KeywordStats(group=name, keyword=kw)
+                pattern = re.compile(rf"(?<![a-z0-9]){re.escape(kw)}(?![a-z0-9])")
+                rules.append(_Rule(stats=stats, whole_word=pattern, index=index[kw]))
+            self._plan.append((group, rules))
+
+    def observe(self, text: str) -> None:
+        """Profile one lower-cased `subject\\nbody` text, as `classify` builds it."""
+        self.items += 1
+        if len(self._sample) < SCAN_SAMPLE_SIZE:
+            self._sample.append(text)
+        else:
+            slot = self._rng.randrange(self.items)
+            if slot < SCAN_SAMPLE_SIZE:
+                self._sample[slot] = text
+        clock = time.perf_counter_ns
+        hits: set[int] = set()
+        matched: list[tuple[GroupStats, list[_Rule]]] = []
+        for group, rules in self._plan:
+            start = clock()
+            group_hits = [rule for rule in rules if rule.stats.keyword in text]
+            group.scan_ns += clock() - start
+            if group_hits:
+                group.items_matched += 1
+                matched.append((group, group_hits))
+                hits.update(rule.index for rule in group_hits)
+        if not hits:
+            return
+
+        # The classifier's own decision, without the score that only sets confidence.
+        outcome = self.compiled.outcome(hits, text)[:3]
+        winner = self.groups.get(outcome[0].value)
+        if winner is not None and any(g is winner for g, _ in matched):
+            winner.items_won += 1
+        decisive: dict[int, bool] = {}
+        for _, rules in matched:
+            for rule in rules:
+                i = rule.index
+                rule.stats.hits += 1
+                if not rule.whole_word.search(text):
+                    rule.stats.in_word_hits += 1
+                if i not in decisive:
+                    decisive[i] = self.compiled.outcome(hits - {i}, text)[:3] != outcome
+                if decisive[i]:
+                    rule.stats.decisive += 1
+
+    def measure_keywords(self, repeat: int = SCAN_REPEAT) -> None:
+        """
+        Set each keyword's `scan_ns` to its best-of-`repeat` time over the
+        sampled texts, scaled to all observed items. A no-op until more
+        items have been observed since the last call.
+        """
+        if self._measured_items == self.items or not self._sample:
+            return
+        self._measured_items = self.items
+        clock = time.perf_counter_ns
+        sample = self._sample
+        for stats in self.keywords.values():
+            kw = stats.keyword
+            best = None
+            for _ in range(repeat):
+                start = clock()
+                for text in sample:
+                    kw in text
+                elapsed = clock() - start
+                best = elapsed if best is None else min(best, elapsed)
+            stats.scan_ns = round(best * self.items / len(sample))
+
+    @property
+    def scan_ns(self) -> int:
+        return sum(g.scan_ns for g in self.groups.values())
+
+    def pruning_candidates(self) -> list[tuple[KeywordStats, str]]:
+        """Keywords worth reviewing, each with the reason it was flagged."""
+        candidates = []
+        for stats in self.keywords.values():
+            if not stats.hits:
+                candidates.append((stats, "never matched"))
+            elif not stats.decisive:
+                candidates.append((stats, "matched but never changed an outcome"))
+            elif stats.in_word_hits * 2 > stats.hits:
+                candidates.append((stats, "mostly matches inside other words"))
+        return candidates
+
+    def to_dict(self) -> dict[str, object]:
+        self.measure_keywords()
+        return {
+            "items": self.items,
+            "scan_ms": round(self.scan_ns / 1e6, 3),
+            "groups": [
+                {
+                    "group": g.group,
+                    "keywords": g.keywords,
+                    "items_matched": g.items_matched,
+                    "items_won": g.items_won,
+                    "scan_ms": round(g.scan_ns / 1e6, 3),
+                }
+                for g in self.groups.values()
+            ],
+            "keywords": [
+                {
+                    "group": k.group,
+                    "keyword": k.keyword,
+                    "hits": k.hits,
+                    "in_word_hits": k.in_word_hits,
+                    "decisive": k.decisive,
+                    "redundant": k.redundant,
+                    "scan_ms": round(k.scan_ns / 1e6, 3),
+                }
+                for k in self.keywords.values()
+            ],
+            "pruning_candidates": [
+                {"group": k.group, "keyword": k.keyword, "reason": reason}
+                for k, reason in self.pruning_candidates()
+            ],
+        }
@@ -1,108 +1,161 @@
 from __future__ import annotations
 
+import io
+import itertools
+import json
+import os
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence, TextIO
 
-from .aggregation import DiagnosticMetrics
+from .aggregation import (
+    CONSERVATIVE_MINUTES_BY_CATEGORY,
+    DiagnosticMetrics,
+    automation_leverage_summary,
+)
+from .fileio import open_report, write_report
+from .models import RiskFlag, WorkCategory, WorkNature
 
+if TYPE_CHECKING:
+    from .batch import TenantResult
+    from .models import ClassifiedItem
+    from .profiling import RuleProfile
+    from .whatif import ScenarioResult
 
-def _markdown_table(headers: list[str], rows: list[list[object]]) -> str:
-    if not rows:
-        return "_No data_"
-    header_line = "| " + " | ".join(headers) + " |"
-    sep_line = "| " + " | ".join(["---"] * len(headers)) + " |"
-    row_lines = ["| " + " | ".join(str(x) for x in row) + " |" for row in rows]
-    return "\n".join([header_line, sep_line, *row_lines])
 
+def _interval_label(metrics: DiagnosticMetrics, group: str, label: str) -> str:
+    lo, hi = metrics.percentage_intervals.get(group, {}).get(label, (0.0, 0.0))
+    return f"{lo}% - {hi}%"
 
-def generate_markdown_report(
+
+def _with_intervals(
     metrics: DiagnosticMetrics,
-    leverage_summary: list[str],
-    assumptions: dict[str, object],
-) -> str:
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    category_rows = sorted(
-        [
-            [
-                category,
-                count,
-                f"{metrics.category_percentages.get(category, 0.0)}%",
-                metrics.estimated_minutes_by_category.get(category, 0),
-            ]
-            for category, count in metrics.category_counts.items()
-        ],
-        key=lambda x: x[1],
-        reverse=True,
+    group: str,
+    headers: list[str],
+    rows: list[list[object]],
+) -> tuple[list[str], list[list[object]]]:
+    if metrics.sample_size is None:
+        return headers, rows
+    return (
+        [*headers, "95% CI (% of Inbound)"],
+        [[*row, _interval_label(metrics, group, str(row[0]))] for row in rows],
     )
 
-    nature_rows = [
-        [name, count, f"{metrics.nature_percentages.get(name, 0.0)}%"]
-        for name, count in metrics.nature_counts.items()
-    ]
 
-    sla_rows = [
-        [row["category"], row["count"], f'{row["share_of_sla"]}%']
-        for row in metrics.sla_clusters
+def _sla_share(metrics: DiagnosticMetrics) -> tuple[float, str]:
+    sla = RiskFlag.SLA_SENSITIVE.value
+    return metrics.risk_percentages.get(sla, 0.0), _interval_label(metrics, "risk", sla)
+
+
+def _sampling_lines(metrics: DiagnosticMetrics) -> tuple[str, str]:
+    if metrics.sample_size is None:
+        return "", ""
+    lo, hi = metrics.estimated_hours_per_week_interval or (0.0, 0.0)
+    sla_pct, sla_interval = _sla_share(metrics)
+    return (
+        f"- Stratified sample classified: **{metrics.sample_size}** items (by day and source); volumes are population estimates\n",
+        f"- 95% confidence interval: **{lo} - {hi} hours/week**\n"
+        f"- SLA-sensitive share of inbound: **{sla_pct}%** (95% CI {sla_interval})\n",
+    )
+
+
+def _concentration_rows(
+    metrics: DiagnosticMetrics, dimension: str, markdown: bool
+) -> list[list[object]]:
+    groups = [k for k, _ in sorted(metrics.category_counts.items(), key=lambda x: x[1], reverse=True)]
+    groups.append(RiskFlag.SLA_SENSITIVE.value)
+    rows = [r for r in metrics.sender_concentration if r["dimension"] == dimension]
+    rows.sort(key=lambda r: groups.index(r["group"]) if r["group"] in groups else len(groups))
+    return [
+        [
+            r["group"],
+            # A sender without an address is keyed by its raw text, which may contain `|`.
+            r["key"].replace("|", "\\|") if markdown else r["key"],
+            f'{r["count"]} (±{r["error"]})' if r["error"] else r["count"],
+            f'{r["share_of_group"]}%',
+        ]
+        for r in rows
     ]
 
-    summary_lines = "\n".join([f"- {x}" for x in leverage_summary]) or "- _No summary generated_"
 
-    assumption_lines = "\n".join([f"- **{k}**: {v}" for k, v in assumptions.items()])
+@dataclass(slots=True)
+class ReportTable:
+    """Headers plus rows, rendered by both the markdown and HTML writers.
 
-    md = f"""# Operations Load Diagnostic Report
+    `rows` may be a generator; writers consume it once, row by row.
+    """
 
-Generated: {timestamp}
+    headers: list[str]
+    rows: Iterable[Sequence[object]]
 
-## 1. Inbound Volume Snapshot
-- Total inbound items analyzed: **{metrics.total_volume}**
-- Observation window: **{metrics.period_days} day(s)**
 
-## 2. Work Category Breakdown
-{_markdown_table(
-    ["Work Category", "Volume", "% of Inbound", "Estimated Minutes"],
-    category_rows,
-)}
+@dataclass(slots=True)
+class DrilldownPage:
+    number: int
+    first_item: int
+    last_item: int
+    paths: dict[str, Path]
 
-## 3. Repetitive vs Exception Work
-{_markdown_table(
-    ["Work Nature", "Volume", "% of Inbound"],
-    nature_rows,
-)}
 
-## 4. Estimated Operational Load (hours/week)
-- Estimated total handling time in sample window: **{metrics.estimated_total_minutes} minutes**
-- Estimated weekly operational load: **{metrics.estimated_hours_per_week} hours/week**
+DRILLDOWN_HEADERS = [
+    "#",
+    "Item",
+    "Received",
+    "Source",
+    "Sender",
+    "Subject",
+    "Category",
+    "Nature",
+    "SLA-sensitive",
+    "Confidence",
+]
+_DRILLDOWN_SUBJECT_CHARS = 120
+_REPORT_SUFFIXES = {"markdown": ".md", "html": ".html"}
 
-### SLA-sensitive Work Clusters
-{_markdown_table(
-    ["Category", "SLA-sensitive Volume", "Share of SLA-sensitive"],
-    sla_rows,
-)}
 
-## 5. Automation Leverage Summary
-{summary_lines}
+def _write_markdown_table(fh: TextIO, table: ReportTable) -> None:
+    rows = iter(table.rows)
+    first = next(rows, None)
+    if first is None:
+        fh.write("_No data_")
+        return
+    fh.write("| " + " | ".join(table.headers) + " |\n")
+    fh.write("| " + " | ".join(["---"] * len(table.headers)) + " |\n")
+    fh.write("| " + " | ".join(str(x) for x in first) + " |")
+    for row in rows:
+        fh.write("\n| " + " | ".join(str(x) for x in row) + " |")
 
-## Conservative Assumptions Used
-{assumption_lines}
-"""
-    return md
 
+def _markdown_table(headers: list[str], rows: list[list[object]]) -> str:
+    out = io.StringIO()
+    _write_markdown_table(out, ReportTable(headers, rows))
+    return out.getvalue()
+
+
+def _html_row(row: Sequence[object], escape: Callable[..., str]) -> str:
+    return "<tr>" + "".join(f"<td>{escape(str(cell), quote=False)}</td>" for cell in row) + "</tr>"
 
-def generate_html_report_from_metrics(
-    metrics: DiagnosticMetrics,
-    leverage_summary: list[str],
-    assumptions: dict[str, object],
-) -> str:
-    def rows_to_html(rows: list[list[object]]) -> str:
-        if not rows:
-            return "<tr><td colspan='4'>No data</td></tr>"
-        return "\n".join(
-            [
-                "<tr>" + "".join([f"<td>{str(cell)}</td>" for cell in row]) + "</tr>"
-                for row in rows
-            ]
-        )
 
+def _write_html_table(fh: TextIO, table: ReportTable) -> None:
+    from html import escape  # Only HTML output needs it.
+
+    fh.write("  <table>\n    <thead><tr>")
+    fh.write("".join(f"<th>{h}</th>" for h in table.headers))
+    fh.write("</tr></thead>\n    <tbody>")
+    rows = iter(table.rows)
+    first = next(rows, None)
+    if first is None:
+        fh.write(f"<tr><td colspan='{len(table.headers)}'>No data</td></tr>")
+    else:
+        fh.write(_html_row(first, escape))
+        for row in rows:
+            fh.write("\n" + _html_row(row, escape))
+    fh.write("</tbody>\n  </table>\n")
+
+
+def _report_tables(metrics: DiagnosticMetrics, markdown: bool) -> dict[str, ReportTable]:
+    """The tables shared by the markdown and HTML reports, keyed by section."""
     category_rows = sorted(
         [
             [
@@ -124,16 +177,117 @@ def generate_html_report_from_metrics(
         [row["category"], row["count"], f'{row["share_of_sla"]}%']
         for row in metrics.sla_clusters
     ]
+    return {
+        "category": ReportTable(
+            *_with_intervals(
+                metrics,
+                "category",
+                ["Work Category", "Volume", "% of Inbound", "Estimated Minutes"],
+                category_rows,
+            )
+        ),
+        "nature": ReportTable(
+            *_with_intervals(metrics, "nature", ["Work Nature", "Volume", "% of Inbound"], nature_rows)
+        ),
+        "sla": ReportTable(["Category", "SLA-sensitive Volume", "Share of SLA-sensitive"], sla_rows),
+        "domain": ReportTable(
+            ["Group", "Sender Domain", "Volume", "Share of Group"],
+            _concentration_rows(metrics, "domain", markdown),
+        ),
+        "sender": ReportTable(
+            ["Group", "Sender", "Volume", "Share of Group"],
+            _concentration_rows(metrics, "sender", markdown),
+        ),
+    }
+
+
+def _drilldown_label(page: DrilldownPage) -> str:
+    return f"Items {page.first_item}-{page.last_item}"
+
+
+def write_markdown_report(
+    fh: TextIO,
+    metrics: DiagnosticMetrics,
+    leverage_summary: list[str],
+    assumptions: dict[str, object],
+    drilldown_pages: Sequence[DrilldownPage] = (),
+) -> None:
+    """Stream the markdown report to `fh` section by section."""
+    tables = _report_tables(metrics, markdown=True)
+    sample_line, interval_line = _sampling_lines(metrics)
+    fh.write(
+        f"""# Operations Load Diagnostic Report
 
-    summary_list = "".join([f"<li>{x}</li>" for x in leverage_summary]) or "<li>No summary generated</li>"
-    assumption_list = "".join([f"<li><strong>{k}</strong>: {v}</li>" for k, v in assumptions.items()])
+Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}
 
-    html = f"""<!doctype html>
+## 1. Inbound Volume Snapshot
+- Total inbound items analyzed: **{metrics.total_volume}**
+- Observation window: **{metrics.period_days} day(s)**
+{sample_line}
+## 2. Work Category Breakdown
+"""
+    )
+    _write_markdown_table(fh, tables["category"])
+    fh.write("\n\n## 3. Repetitive vs Exception Work\n")
+    _write_markdown_table(fh, tables["nature"])
+    fh.write(
+        f"""
+
+## 4. Estimated Operational Load (hours/week)
+- Estimated total handling time in sample window: **{metrics.estimated_total_minutes} minutes**
+- Estimated weekly operational load: **{metrics.estimated_hours_per_week} hours/week**
+{interval_line}
+### SLA-sensitive Work Clusters
+"""
+    )
+    _write_markdown_table(fh, tables["sla"])
+    fh.write("\n\n## 5. Automation Leverage Summary\n")
+    fh.write("\n".join([f"- {x}" for x in leverage_summary]) or "- _No summary generated_")
+    fh.write("\n")
+
+    if metrics.sender_concentration:
+        fh.write(
+            "\n## 6. Sender and Customer Concentration\n"
+            "Top sender domains and senders within each work category and within SLA-sensitive work.\n"
+            "\n### Top Sender Domains\n"
+        )
+        _write_markdown_table(fh, tables["domain"])
+        fh.write("\n\n### Top Senders\n")
+        _write_markdown_table(fh, tables["sender"])
+        fh.write("\n")
+
+    if drilldown_pages:
+        fh.write(
+            f"\n## Item Drilldown\n"
+            f"Classified items, {drilldown_pages[-1].last_item} in total, "
+            f"on {len(drilldown_pages)} linked page(s):\n"
+        )
+        for page in drilldown_pages:
+            fh.write(f"- [{_drilldown_label(page)}]({page.paths['markdown'].name})\n")
+
+    fh.write("\n## Conservative Assumptions Used\n")
+    fh.write("\n".join([f"- **{k}**: {v}" for k, v in assumptions.items()]))
+    fh.write("\n")
+
+
+def generate_markdown_report(
+    metrics: DiagnosticMetrics,
+    leverage_summary: list[str],
+    assumptions: dict[str, object],
+) -> str:
+    out = io.StringIO()
+    write_markdown_report(out, metrics, leverage_summary, assumptions)
+    return out.getvalue()
+
+
+def _write_html_head(fh: TextIO, title: str) -> None:
+    fh.write(
+        f"""<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <title>Operations Load Diagnostic Report</title>
+  <title>{title}</title>
   <style>
     body {{
       font-family: "Segoe UI", Tahoma, sans-serif;
@@ -162,47 +316,448 @@ def generate_html_report_from_metrics(
   </style>
 </head>
 <body>
-  <h1>Operations Load Diagnostic Report</h1>
+"""
+    )
+
+
+def write_html_report(
+    fh: TextIO,
+    metrics: DiagnosticMetrics,
+    leverage_summary: list[str],
+    assumptions: dict[str, object],
+    drilldown_pages: Sequence[DrilldownPage] = (),
+) -> None:
+    """Stream the HTML report to `fh` section by section."""
+    tables = _report_tables(metrics, markdown=False)
+    sample_kpi = ""
+    interval_kpi = ""
+    if metrics.sample_size is not None:
+        lo, hi = metrics.estimated_hours_per_week_interval or (0.0, 0.0)
+        sample_kpi = (
+            f'\n  <div class="kpi">Stratified sample classified: <strong>{metrics.sample_size}</strong> '
+            "items (by day and source); volumes are population estimates</div>"
+        )
+        sla_pct, sla_interval = _sla_share(metrics)
+        interval_kpi = (
+            f'\n  <div class="kpi">95% confidence interval: <strong>{lo} - {hi} hours/week</strong></div>'
+            f'\n  <div class="kpi">SLA-sensitive share of inbound: <strong>{sla_pct}%</strong> '
+            f"(95% CI {sla_interval})</div>"
+        )
+
+    _write_html_head(fh, "Operations Load Diagnostic Report")
+    fh.write(
+        f"""  <h1>Operations Load Diagnostic Report</h1>
   <p>Generated: {datetime.now().strftime("%Y-%m-%d %H:%M")}</p>
 
   <h2>1. Inbound Volume Snapshot</h2>
   <div class="kpi">Total inbound items analyzed: <strong>{metrics.total_volume}</strong></div>
-  <div class="kpi">Observation window: <strong>{metrics.period_days} day(s)</strong></div>
+  <div class="kpi">Observation window: <strong>{metrics.period_days} day(s)</strong></div>{sample_kpi}
 
   <h2>2. Work Category Breakdown</h2>
-  <table>
-    <thead><tr><th>Work Category</th><th>Volume</th><th>% of Inbound</th><th>Estimated Minutes</th></tr></thead>
-    <tbody>{rows_to_html(category_rows)}</tbody>
-  </table>
-
-  <h2>3. Repetitive vs Exception Work</h2>
-  <table>
-    <thead><tr><th>Work Nature</th><th>Volume</th><th>% of Inbound</th></tr></thead>
-    <tbody>{rows_to_html(nature_rows)}</tbody>
-  </table>
-
+"""
+    )
+    _write_html_table(fh, tables["category"])
+    fh.write("\n  <h2>3. Repetitive vs Exception Work</h2>\n")
+    _write_html_table(fh, tables["nature"])
+    fh.write(
+        f"""
   <h2>4. Estimated Operational Load (hours/week)</h2>
   <div class="kpi">Sample handling time: <strong>{metrics.estimated_total_minutes} minutes</strong></div>
-  <div class="kpi">Estimated weekly load: <strong>{metrics.estimated_hours_per_week} hours/week</strong></div>
+  <div class="kpi">Estimated weekly load: <strong>{metrics.estimated_hours_per_week} hours/week</strong></div>{interval_kpi}
 
   <h3>SLA-sensitive Work Clusters</h3>
-  <table>
-    <thead><tr><th>Category</th><th>SLA-sensitive Volume</th><th>Share of SLA-sensitive</th></tr></thead>
-    <tbody>{rows_to_html(sla_rows)}</tbody>
-  </table>
+"""
+    )
+    _write_html_table(fh, tables["sla"])
+    summary_list = "".join([f"<li>{x}</li>" for x in leverage_summary]) or "<li>No summary generated</li>"
+    fh.write(f"\n  <h2>5. Automation Leverage Summary</h2>\n  <ul>{summary_list}</ul>\n")
 
-  <h2>5. Automation Leverage Summary</h2>
-  <ul>{summary_list}</ul>
+    if metrics.sender_concentration:
+        fh.write(
+            "\n  <h2>6. Sender and Customer Concentration</h2>\n"
+            "  <p>Top sender domains and senders within each work category and within SLA-sensitive work.</p>\n"
+            "\n  <h3>Top Sender Domains</h3>\n"
+        )
+        _write_html_table(fh, tables["domain"])
+        fh.write("\n  <h3>Top Senders</h3>\n")
+        _write_html_table(fh, tables["sender"])
+
+    if drilldown_pages:
+        fh.write(
+            "\n  <h2>Item Drilldown</h2>\n"
+            f"  <p>Classified items, {drilldown_pages[-1].last_item} in total, "
+            f"on {len(drilldown_pages)} linked page(s):</p>\n  <ul>"
+        )
+        for page in drilldown_pages:
+            fh.write(f'<li><a href="{page.paths["html"].name}">{_drilldown_label(page)}</a></li>')
+        fh.write("</ul>\n")
 
+    assumption_list = "".join([f"<li><strong>{k}</strong>: {v}</li>" for k, v in assumptions.items()])
+    fh.write(
+        f"""
   <h2>Conservative Assumptions Used</h2>
   <ul>{assumption_list}</ul>
 </body>
 </html>"""
-    return html
+    )
 
 
-def write_report(content: str, path: str | Path) -> Path:
-    target = Path(path)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(content, encoding="utf-8")
-    return target
+def generate_html_report_from_metrics(
+    metrics: DiagnosticMetrics,
+    leverage_summary: list[str],
+    assumptions: dict[str, object],
+) -> str:
+    out = io.StringIO()
+    write_html_report(out, metrics, leverage_summary, assumptions)
+    return out.getvalue()
+
+
+def generate_what_if_report(results: Sequence[ScenarioResult]) -> str:
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    baseline = results[0].metrics.estimated_hours_per_week if results else 0.0
+    rows = []
+    for r in results:
+        m = r.metrics
+        top = max(m.estimated_minutes_by_category.items(), key=lambda x: x[1], default=("-", 0))
+        delta = round(m.estimated_hours_per_week - baseline, 1)
+        rows.append(
+            [
+                r.scenario.name,
+                r.scenario.lookback_days if r.scenario.lookback_days is not None else "all",
+                r.scenario.max_items if r.scenario.max_items is not None else "all",
+                m.total_volume,
+                m.period_days,
+                m.estimated_total_minutes,
+                m.estimated_hours_per_week,
+                f"{delta:+}",
+                top[0],
+            ]
+        )
+
+    return f"""# Operations Load What-if Comparison
+
+Generated: {timestamp}
+
+Scenarios re-aggregate cached classifications; the first row is the baseline for deltas.
+
+{_markdown_table(
+    [
+        "Scenario",
+        "Lookback Days",
+        "Max Items",
+        "Items",
+        "Period Days",
+        "Estimated Minutes",
+        "Hours/Week",
+        "Delta vs Baseline",
+        "Top Category by Minutes",
+    ],
+    rows,
+)}
+"""
+
+
+def generate_batch_report(
+    results: Sequence[TenantResult],
+    output_dir: str | Path,
+    seconds: float,
+    cache_stats: dict[str, int] | None = None,
+) -> str:
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    ok = [r for r in results if r.metrics is not None]
+    categories = [
+        c.value
+        for c in WorkCategory
+        if any(c.value in r.metrics.category_percentages for r in ok)  # type: ignore[union-attr]
+    ]
+
+    comparison_rows = []
+    mix_rows = []
+    for r in ok:
+        m = r.metrics
+        top = max(m.estimated_minutes_by_category.items(), key=lambda x: x[1], default=("-", 0))
+        files = (r.summary or {}).get("output_files") or {}
+        report = files.get("markdown") or files.get("html")
+        link = f"[report]({Path(os.path.relpath(report, output_dir)).as_posix()})" if report else "-"
+        comparison_rows.append(
+            [
+                r.tenant,
+                r.mode,
+                m.total_volume,
+                m.period_days,
+                m.estimated_hours_per_week,
+                f"{m.nature_percentages.get(WorkNature.EXCEPTION_DRIVEN.value, 0.0)}%",
+                f"{m.risk_percentages.get(RiskFlag.SLA_SENSITIVE.value, 0.0)}%",
+                top[0],
+                link,
+            ]
+        )
+        mix_rows.append([r.tenant, *(f"{m.category_percentages.get(c, 0.0)}%" for c in categories)])
+
+    run_rows = [
+        [
+            r.tenant,
+            "ok" if r.ok else "failed",
+            r.seconds,
+            r.items_per_second if r.ok else "-",
+            (r.error or "").replace("|", "\\|").replace("\n", " "),
+        ]
+        for r in results
+    ]
+    cache_line = ""
+    if cache_stats is not None:
+        lookups = cache_stats["hits"] + cache_stats["misses"]
+        hit_rate = round(cache_stats["hits"] / lookups * 100, 1) if lookups else 0.0
+        cache_line = (
+            f"\nShared classifier cache: {cache_stats['hits']} hits of {lookups} lookups "
+            f"({hit_rate}%), {cache_stats['entries']} entries.\n"
+        )
+
+    return f"""# Operations Load Cross-tenant Comparison
+
+Generated: {timestamp}
+
+{len(ok)} of {len(results)} tenant jobs succeeded in {round(seconds, 1)} seconds.
+{cache_line}
+## 1. Tenant Comparison
+
+{_markdown_table(
+    [
+        "Tenant",
+        "Mode",
+        "Items",
+        "Period Days",
+        "Hours/Week",
+        "Exception-driven",
+        "SLA-sensitive",
+        "Top Category by Minutes",
+        "Report",
+    ],
+    comparison_rows,
+)}
+
+## 2. Category Mix
+
+{_markdown_table(["Tenant", *categories], mix_rows)}
+
+## 3. Job Runs
+
+Seconds are wall time while sharing the batch's worker pool.
+
+{_markdown_table(["Tenant", "Status", "Seconds", "Items/s", "Error"], run_rows)}
+"""
+
+
+def generate_rule_profile_report(profile: RuleProfile) -> str:
+    profile.measure_keywords()
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    items = profile.items or 1
+
+    def ms(ns: int) -> str:
+        return f"{ns / 1e6:.2f}"
+
+    def us_per_item(ns: int) -> str:
+        return f"{ns / 1e3 / items:.2f}"
+
+    group_rows = [
+        [g.group, g.keywords, g.items_matched, g.items_won, ms(g.scan_ns), us_per_item(g.scan_ns)]
+        for g in sorted(profile.groups.values(), key=lambda g: -g.scan_ns)
+    ]
+    keyword_rows = [
+        [
+            k.group,
+            k.keyword,
+            k.hits,
+            k.decisive,
+            k.redundant,
+            k.in_word_hits,
+            us_per_item(k.scan_ns),
+        ]
+        for k in sorted(profile.keywords.values(), key=lambda k: (-k.hits, k.group, k.keyword))
+    ]
+    candidate_rows = [
+        [k.group, k.keyword, k.hits, us_per_item(k.scan_ns), reason]
+        for k, reason in profile.pruning_candidates()
+    ]
+
+    return f"""# RuleSet Cost / Benefit Profile
+
+Generated: {timestamp}
+
+- Items profiled: {profile.items}
+- Total keyword scan time: {ms(profile.scan_ns)} ms ({us_per_item(profile.scan_ns)} us per item)
+
+A hit is decisive when removing that keyword alone would change the item's category, nature or SLA flag; otherwise it is redundant. In-word hits match only inside a longer word (e.g. "pod" in "tripod"). Group scan times are measured during the run; keyword scan times are timed afterwards on a sample of the profiled texts.
+
+## 1. Rule Groups
+{_markdown_table(
+    ["Group", "Keywords", "Items Matched", "Items Won", "Scan ms", "Scan us/item"],
+    group_rows,
+)}
+
+## 2. Pruning Candidates
+{_markdown_table(["Group", "Keyword", "Hits", "Scan us/item", "Reason"], candidate_rows)}
+
+## 3. Keywords
+{_markdown_table(
+    ["Group", "Keyword", "Hits", "Decisive", "Redundant", "In-word Hits", "Scan us/item"],
+    keyword_rows,
+)}
+"""
+
+
+def _drilldown_cell(value: str, markdown: bool) -> str:
+    value = " ".join(value.split())
+    if len(value) > _DRILLDOWN_SUBJECT_CHARS:
+        value = value[: _DRILLDOWN_SUBJECT_CHARS - 1] + "…"
+    return value.replace("|", "\\|") if markdown else value
+
+
+def _drilldown_rows(
+    numbered: Sequence[tuple[int, ClassifiedItem]], markdown: bool
+) -> Iterator[list[object]]:
+    for number, x in numbered:
+        c = x.classification
+        yield [
+            number,
+            _drilldown_cell(x.item.item_id, markdown),
+            x.item.timestamp.strftime("%Y-%m-%d %H:%M") if x.item.timestamp else "-",
+            x.item.source,
+            _drilldown_cell(x.item.sender or "-", markdown),
+            _drilldown_cell(x.item.subject or "-", markdown),
+            c.category.value,
+            c.nature.value,
+            "yes" if c.risk == RiskFlag.SLA_SENSITIVE else "no",
+            f"{c.confidence:.2f}",
+        ]
+
+
+def _drilldown_nav(report_name: str, prev_name: str | None, next_name: str | None, fmt: str) -> str:
+    links = []
+    if prev_name:
+        links.append((prev_name, "Previous page"))
+    links.append((report_name, "Back to report"))
+    if next_name:
+        links.append((next_name, "Next page"))
+    if fmt == "markdown":
+        return " · ".join(f"[{label}]({target})" for target, label in links)
+    return " · ".join(f'<a href="{target}">{label}</a>' for target, label in links)
+
+
+def write_drilldown_pages(
+    items: Iterable[ClassifiedItem],
+    output_dir: str | Path,
+    base_name: str,
+    report_format: str = "both",
+    page_size: int = 500,
+) -> list[DrilldownPage]:
+    """
+    Write a per-item table split across linked pages of `page_size` rows.
+
+    Items are streamed straight to the page files (`<base>.items-001.md`,
+    `.html`, ...) and only page boundaries are kept, so memory stays flat
+    however many items there are. Each page links to its neighbours and back
+    to the main report.
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive.")
+    formats = [f for f in ("markdown", "html") if report_format in {f, "both"}]
+    output_dir = Path(output_dir)
+
+    def page_path(number: int, fmt: str) -> Path:
+        return output_dir / f"{base_name}.items-{number:03d}{_REPORT_SUFFIXES[fmt]}"
+
+    numbered = enumerate(items, start=1)
+    pages: list[DrilldownPage] = []
+    pending = next(numbered, None)
+    while pending is not None:
+        number = len(pages) + 1
+        first_item = pending[0]
+        chunk = list(itertools.islice(numbered, page_size - 1))
+        rows = [pending, *chunk]
+        pending = next(numbered, None)
+        page = DrilldownPage(
+            number=number,
+            first_item=first_item,
+            last_item=rows[-1][0],
+            paths={fmt: page_path(number, fmt) for fmt in formats},
+        )
+        for fmt in formats:
+            nav = _drilldown_nav(
+                f"{base_name}{_REPORT_SUFFIXES[fmt]}",
+                page_path(number - 1, fmt).name if number > 1 else None,
+                page_path(number + 1, fmt).name if pending is not None else None,
+                fmt,
+            )
+            title = f"Item Drilldown: {_drilldown_label(page)}"
+            table = ReportTable(DRILLDOWN_HEADERS, _drilldown_rows(rows, fmt == "markdown"))
+            with open_report(page.paths[fmt]) as fh:
+                if fmt == "markdown":
+                    fh.write(f"# {title}\n\n{nav}\n\n")
+                    _write_markdown_table(fh, table)
+                    fh.write(f"\n\n{nav}\n")
+                else:
+                    _write_html_head(fh, title)
+                    fh.write(f"  <h1>{title}</h1>\n  <p>{nav}</p>\n")
+                    _write_html_table(fh, table)
+                    fh.write(f"  <p>{nav}</p>\n</body>\n</html>")
+        pages.append(page)
+    return pages
+
+
+def build_assumptions(
+    window_cap: str,
+    classifier_name: str,
+    diagnostic_mode: str = "Read-only, one-time static snapshot; no workflow changes.",
+) -> dict[str, object]:
+    return {
+        "Diagnostic mode": diagnostic_mode,
+        "Window cap": window_cap,
+        "Handling time defaults (minutes/category)": ", ".join(
+            [f"{k.value}: {v}" for k, v in CONSERVATIVE_MINUTES_BY_CATEGORY.items()]
+        ),
+        "Classifier": classifier_name,
+        "Accuracy expectation": "Directionally correct prioritization, not perfect labeling.",
+    }
+
+
+def write_report_set(
+    metrics: DiagnosticMetrics,
+    assumptions: dict[str, object],
+    output_dir: str | Path,
+    base_name: str,
+    report_format: str = "both",
+    output_files: dict[str, str] | None = None,
+    drilldown_pages: Sequence[DrilldownPage] = (),
+) -> dict[str, object]:
+    """Write the markdown/HTML reports plus `summary.json`; returns the summary."""
+    output_dir = Path(output_dir)
+    output_files = dict(output_files or {})
+    leverage = automation_leverage_summary(metrics)
+
+    if report_format in {"markdown", "both"}:
+        md_path = output_dir / f"{base_name}.md"
+        with open_report(md_path) as fh:
+            write_markdown_report(fh, metrics, leverage, assumptions, drilldown_pages)
+        output_files["markdown"] = str(md_path)
+    if report_format in {"html", "both"}:
+        html_path = output_dir / f"{base_name}.html"
+        with open_report(html_path) as fh:
+            write_html_report(fh, metrics, leverage, assumptions, drilldown_pages)
+        output_files["html"] = str(html_path)
+
+    summary: dict[str, object] = {
+        "items_processed": metrics.total_volume,
+        "period_days": metrics.period_days,
+        "estimated_hours_per_week": metrics.estimated_hours_per_week,
+        "output_files": output_files,
+    }
+    if metrics.sample_size is not None:
+        summary["items_sampled"] = metrics.sample_size
+    if drilldown_pages:
+        summary["drilldown_pages"] = len(drilldown_pages)
+    write_report(
+        json.dumps(summary, indent=2),
+        output_dir / f"{base_name}.summary.json",
+    )
+    return summary
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from .classification import CompiledRuleSet, HeuristicClassifier, RuleSet, compile_ruleset
+from .models import WorkCategory
+
+
+def ruleset_from_dict(raw: dict[str, object]) -> RuleSet:
+    """
+    Rule file format (JSON or TOML); keywords are matched case-insensitively:
+      {
+        "category_keywords": {"Exception / Delay": ["delay", "late"], ...},
+        "exception_keywords": ["urgent", ...],
+        "sla_keywords": ["asap", ...]
+      }
+    """
+    categories = raw.get("category_keywords")
+    if not isinstance(categories, dict):
+        raise ValueError("Rule file needs a 'category_keywords' table.")
+
+    def keywords(value: object, name: str) -> list[str]:
+        if not isinstance(value, list) or not all(isinstance(kw, str) and kw for kw in value):
+            raise ValueError(f"'{name}' must be a list of non-empty strings.")
+        return [kw.lower() for kw in value]
+
+    category_keywords: dict[WorkCategory, list[str]] = {}
+    for name, values in categories.items():
+        try:
+            category = WorkCategory(name)
+        except ValueError:
+            known = ", ".join(c.value for c in WorkCategory)
+            raise ValueError(
+                f"Unknown category '{name}' in rule file (expected one of: {known})."
+            ) from None
+        category_keywords[category] = keywords(values, name)
+    return RuleSet(
+        category_keywords=category_keywords,
+        exception_keywords=keywords(raw.get("exception_keywords", []), "exception_keywords"),
+        sla_keywords=keywords(raw.get("sla_keywords", []), "sla_keywords"),
+    )
+
+
+def _parse_rule_file(data: bytes, suffix: str) -> RuleSet:
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError as exc:
+                raise RuntimeError("TOML rule files need Python 3.11+ or `pip install tomli`.") from exc
+        try:
+            raw = tomllib.loads(data.decode("utf-8"))
+        except tomllib.TOMLDecodeError as exc:
+            raise ValueError(f"Invalid TOML rule file: {exc}") from exc
+    elif suffix == ".json":
+        try:
+            raw = json.loads(data.decode("utf-8"))
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON rule file: {exc}") from exc
+    else:
+        raise ValueError(f"Rule files must be .json or .toml, got '{suffix}'.")
+    if not isinstance(raw, dict):
+        raise ValueError("Rule file must contain a table/object at the top level.")
+    return ruleset_from_dict(raw)
+
+
+def load_ruleset(path: str | Path) -> RuleSet:
+    path = Path(path)
+    return _parse_rule_file(path.read_bytes(), path.suffix.lower())
+
+
+@dataclass(slots=True)
+class LoadedRules:
+    path: Path
+    digest: str
+    compiled: CompiledRuleSet
+
+
+def load_compiled_rules(path: str | Path) -> LoadedRules:
+    """
+    Load a rule file and return its compiled form with the SHA-256 of its bytes.
+
+    Compiling is a few tuples built from the keyword lists, cheaper than
+    reading any cached form back, so nothing is cached on disk.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    return LoadedRules(
+        path=path,
+        digest=hashlib.sha256(data).hexdigest(),
+        compiled=compile_ruleset(_parse_rule_file(data, path.suffix.lower())),
+    )
+
+
+class RuleFileReloader:
+    """
+    Re-read a rule file when it changes and swap it into a running classifier.
+
+    `check()` compares the file's size and modification time with the last
+    load; when they differ and the content hash changed, the new rules are
+    compiled and assigned to `classifier.compiled` in one step. A file that
+    fails to parse leaves the previous rules in place and is reported through
+    `last_error` until it is fixed.
+    """
+
+    def __init__(self, path: str | Path, classifier: HeuristicClassifier):
+        self.path = Path(path)
+        self.classifier = classifier
+        self.last_error: str | None = None
+        self._signature = self._stat()
+        self.loaded = load_compiled_rules(self.path)
+        classifier.compiled = self.loaded.compiled
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def check(self) -> bool:
+        """Reload if the file changed; returns True when new rules were swapped in."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            loaded = load_compiled_rules(self.path)
+        except (OSError, ValueError, RuntimeError) as exc:
+            self.last_error = str(exc)
+            return False
+        self.last_error = None
+        if loaded.digest == self.loaded.digest:
+            return False
+        self.loaded = loaded
+        self.classifier.compiled = loaded.compiled
+        return True
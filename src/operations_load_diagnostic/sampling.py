@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import itertools
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Iterable, Mapping, Sequence
+
+from .aggregation import (
+    CONSERVATIVE_MINUTES_BY_CATEGORY,
+    DiagnosticMetrics,
+    empty_metrics,
+    period_days_between,
+    sla_clusters_from_counts,
+)
+from .classification import BaseClassifier, classify_items
+from .models import ClassifiedItem, InboundItem, RiskFlag, WorkCategory
+from .sketches import SenderConcentration
+
+Z_95 = 1.96
+
+
+@dataclass(slots=True)
+class Stratum:
+    population: int = 0
+    sample: list[InboundItem] = field(default_factory=list)
+
+
+class StratifiedReservoirSampler:
+    """
+    Streaming reservoir sample stratified by calendar day and item source.
+
+    Each stratum keeps at most `per_stratum` items (Algorithm R) plus a count of
+    everything seen, so memory is bounded by the number of day/source strata,
+    not by the size of the input.
+    """
+
+    def __init__(self, per_stratum: int = 100, seed: int | None = None):
+        if per_stratum <= 0:
+            raise ValueError("per_stratum must be positive.")
+        self.per_stratum = per_stratum
+        self.strata: dict[tuple[date | None, str], Stratum] = {}
+        self.min_ts: datetime | None = None
+        self.max_ts: datetime | None = None
+        self._rng = random.Random(seed)
+
+    @property
+    def population(self) -> int:
+        return sum(s.population for s in self.strata.values())
+
+    @property
+    def sample_size(self) -> int:
+        return sum(len(s.sample) for s in self.strata.values())
+
+    def offer(self, item: InboundItem) -> None:
+        ts = item.timestamp
+        key = (ts.date() if ts else None, item.source)
+        stratum = self.strata.get(key)
+        if stratum is None:
+            stratum = self.strata[key] = Stratum()
+        stratum.population += 1
+        if len(stratum.sample) < self.per_stratum:
+            stratum.sample.append(item)
+        else:
+            slot = self._rng.randrange(stratum.population)
+            if slot < self.per_stratum:
+                stratum.sample[slot] = item
+        if ts is not None:
+            if self.min_ts is None or ts < self.min_ts:
+                self.min_ts = ts
+            if self.max_ts is None or ts > self.max_ts:
+                self.max_ts = ts
+
+    def extend(self, items: Iterable[InboundItem]) -> None:
+        for item in items:
+            self.offer(item)
+
+    def classify(self, classifier: BaseClassifier) -> list[ClassifiedStratum]:
+        # One batch across all strata, then split back by stratum size.
+        strata = list(self.strata.values())
+        classified = iter(classify_items(classifier, (x for s in strata for x in s.sample)))
+        return [
+            ClassifiedStratum(
+                population=s.population,
+                sample=list(itertools.islice(classified, len(s.sample))),
+            )
+            for s in strata
+        ]
+
+
+@dataclass(slots=True)
+class ClassifiedStratum:
+    population: int
+    sample: list[ClassifiedItem]
+
+
+def _category_of(x: ClassifiedItem) -> str:
+    return x.classification.category.value
+
+
+def _nature_of(x: ClassifiedItem) -> str:
+    return x.classification.nature.value
+
+
+def _risk_of(x: ClassifiedItem) -> str:
+    return x.classification.risk.value
+
+
+def _sla_category_of(x: ClassifiedItem) -> str:
+    if x.classification.risk == RiskFlag.SLA_SENSITIVE:
+        return x.classification.category.value
+    return ""
+
+
+def _stratified_mean(
+    strata: Sequence[ClassifiedStratum],
+    total: int,
+    value: Callable[[ClassifiedItem], float],
+    max_variance: float,
+) -> tuple[float, float]:
+    """Stratified estimate of a per-item mean and its variance (with finite population correction)."""
+    mean = 0.0
+    variance = 0.0
+    for stratum in strata:
+        n = len(stratum.sample)
+        if not n:
+            continue
+        weight = stratum.population / total
+        values = [value(x) for x in stratum.sample]
+        stratum_mean = sum(values) / n
+        mean += weight * stratum_mean
+        if n >= stratum.population:
+            continue
+        if n > 1:
+            s2 = sum((v - stratum_mean) ** 2 for v in values) / (n - 1)
+        else:
+            # A single draw says nothing about spread; assume the worst case.
+            s2 = max_variance
+        variance += weight * weight * (1 - n / stratum.population) * s2 / n
+    return mean, variance
+
+
+def _share_estimates(
+    strata: Sequence[ClassifiedStratum],
+    total: int,
+    labels: Iterable[str],
+    label_of: Callable[[ClassifiedItem], str],
+    z: float,
+) -> tuple[dict[str, int], dict[str, float], dict[str, tuple[float, float]]]:
+    counts: dict[str, int] = {}
+    percentages: dict[str, float] = {}
+    intervals: dict[str, tuple[float, float]] = {}
+    for label in labels:
+        p, var = _stratified_mean(
+            strata, total, lambda x, label=label: float(label_of(x) == label), 0.25
+        )
+        margin = z * math.sqrt(var)
+        counts[label] = round(p * total)
+        percentages[label] = round(p * 100, 1)
+        intervals[label] = (
+            round(max(0.0, p - margin) * 100, 1),
+            round(min(1.0, p + margin) * 100, 1),
+        )
+    return counts, percentages, intervals
+
+
+def estimate_metrics(
+    strata: Sequence[ClassifiedStratum],
+    min_ts: datetime | None = None,
+    max_ts: datetime | None = None,
+    fallback_period_days: int = 14,
+    minutes_by_category: Mapping[WorkCategory, int] | None = None,
+    z: float = Z_95,
+    top_senders: int = 5,
+) -> DiagnosticMetrics:
+    """
+    Population-level `DiagnosticMetrics` from classified stratum samples.
+
+    Counts are scaled to the full population; percentages and weekly hours
+    carry normal-approximation confidence intervals. Sender concentration
+    weights each sampled item by the number of items it stands for.
+    """
+    minutes = minutes_by_category or CONSERVATIVE_MINUTES_BY_CATEGORY
+    total = sum(s.population for s in strata)
+    sample_size = sum(len(s.sample) for s in strata)
+    period_days = period_days_between(min_ts, max_ts, fallback_period_days)
+    if total == 0 or sample_size == 0:
+        return empty_metrics(period_days)
+
+    def seen(label_of: Callable[[ClassifiedItem], str]) -> list[str]:
+        return list(dict.fromkeys(label_of(x) for s in strata for x in s.sample))
+
+    cat_counts, cat_pct, cat_ci = _share_estimates(
+        strata, total, seen(_category_of), _category_of, z
+    )
+    nature_counts, nature_pct, nature_ci = _share_estimates(
+        strata, total, seen(_nature_of), _nature_of, z
+    )
+    risk_counts, risk_pct, risk_ci = _share_estimates(
+        strata, total, seen(_risk_of), _risk_of, z
+    )
+    sla_labels = [x for x in seen(_sla_category_of) if x]
+    sla_by_category, _, _ = _share_estimates(strata, total, sla_labels, _sla_category_of, z)
+
+    minute_values = list(minutes.values())
+    _, var_minutes = _stratified_mean(
+        strata,
+        total,
+        lambda x: float(minutes[x.classification.category]),
+        ((max(minute_values) - min(minute_values)) / 2) ** 2,
+    )
+    # The stratified mean of minutes equals the category shares weighted by
+    # minutes, so the total is the sum of the per-category column it heads.
+    minutes_by_label = {k: v * minutes[WorkCategory(k)] for k, v in cat_counts.items()}
+    total_minutes = float(sum(minutes_by_label.values()))
+    margin_minutes = z * math.sqrt(var_minutes) * total
+    weekly = (7.0 / period_days) / 60.0
+
+    concentration = SenderConcentration()
+    for stratum in strata:
+        if stratum.sample:
+            weight = stratum.population / len(stratum.sample)
+            for x in stratum.sample:
+                concentration.add(x, weight)
+
+    return DiagnosticMetrics(
+        total_volume=total,
+        period_days=period_days,
+        category_counts=cat_counts,
+        category_percentages=cat_pct,
+        nature_counts=nature_counts,
+        nature_percentages=nature_pct,
+        risk_counts=risk_counts,
+        risk_percentages=risk_pct,
+        estimated_minutes_by_category=minutes_by_label,
+        estimated_total_minutes=round(total_minutes),
+        estimated_hours_per_week=round(total_minutes * weekly, 1),
+        sla_clusters=sla_clusters_from_counts(sla_by_category),
+        sample_size=sample_size,
+        percentage_intervals={"category": cat_ci, "nature": nature_ci, "risk": risk_ci},
+        estimated_hours_per_week_interval=(
+            round(max(0.0, total_minutes - margin_minutes) * weekly, 1),
+            round((total_minutes + margin_minutes) * weekly, 1),
+        ),
+        sender_concentration=concentration.rows(top_k=top_senders),
+    )
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from .models import ClassifiedItem, RiskFlag, WorkCategory
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k counter (Metwally et al.).
+
+    Tracks at most `capacity` keys. When a new key arrives and the table is full,
+    it replaces the smallest counter and inherits its count as the error bound,
+    so every reported count overestimates the true count by at most `error`.
+    Counts may be fractional when items carry sampling weights.
+    """
+
+    def __init__(self, capacity: int = 50):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive.")
+        self.capacity = capacity
+        self.total: float = 0
+        self._counts: dict[str, float] = {}
+        self._errors: dict[str, float] = {}
+
+    def add(self, key: str, count: float = 1) -> None:
+        self.total += count
+        if key in self._counts:
+            self._counts[key] += count
+            return
+        if len(self._counts) < self.capacity:
+            self._counts[key] = count
+            self._errors[key] = 0
+            return
+        # Linear scan is fine for the small capacities used here.
+        victim = min(self._counts, key=self._counts.__getitem__)
+        floor = self._counts.pop(victim)
+        del self._errors[victim]
+        self._counts[key] = floor + count
+        self._errors[key] = floor
+
+    def top(self, k: int) -> list[tuple[str, float, float]]:
+        """Return up to `k` (key, count, error) tuples, largest count first."""
+        ranked = sorted(self._counts.items(), key=lambda x: (-x[1], x[0]))[:k]
+        return [(key, count, self._errors[key]) for key, count in ranked]
+
+    def merge(self, other: SpaceSaving) -> None:
+        """
+        Fold `other` into this sketch, keeping the error bound.
+
+        A key missing from a full sketch may still have been seen up to that
+        sketch's smallest count, which is added to its count and error.
+        """
+        own_floor = min(self._counts.values()) if len(self._counts) >= self.capacity else 0
+        other_floor = min(other._counts.values()) if len(other._counts) >= other.capacity else 0
+        counts: dict[str, float] = {}
+        errors: dict[str, float] = {}
+        for key in self._counts.keys() | other._counts.keys():
+            counts[key] = self._counts.get(key, own_floor) + other._counts.get(key, other_floor)
+            errors[key] = self._errors.get(key, own_floor) + other._errors.get(key, other_floor)
+        kept = sorted(counts, key=lambda key: (-counts[key], key))[: self.capacity]
+        self._counts = {key: counts[key] for key in kept}
+        self._errors = {key: errors[key] for key in kept}
+        self.total += other.total
+
+    def to_state(self) -> dict[str, object]:
+        return {
+            "total": self.total,
+            "entries": [[key, count, self._errors[key]] for key, count in self._counts.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, object], capacity: int = 50) -> SpaceSaving:
+        sketch = cls(capacity)
+        sketch.total = state["total"]
+        for key, count, error in state["entries"]:
+            sketch._counts[key] = count
+            sketch._errors[key] = error
+        return sketch
+
+
+def sender_address(raw: str | None) -> str | None:
+    if not raw:
+        return None
+    value = raw.strip()
+    if "<" in value and ">" in value:
+        value = value[value.rfind("<") + 1 : value.rfind(">")]
+    value = value.strip().strip('"').lower()
+    return value or None
+
+
+def sender_domain(address: str | None) -> str | None:
+    if not address or "@" not in address:
+        return None
+    return address.rsplit("@", 1)[1] or None
+
+
+class SenderConcentration:
+    """
+    Streaming top senders and sender domains per work category and for SLA-sensitive work.
+
+    Uses one Space-Saving sketch per (group, dimension), so memory is bounded by
+    the number of groups times `capacity` no matter how many distinct senders appear.
+    """
+
+    SLA_GROUP = RiskFlag.SLA_SENSITIVE.value
+
+    def __init__(self, capacity: int = 50):
+        self.capacity = capacity
+        self._sketches: dict[tuple[str, str], SpaceSaving] = {}
+
+    def _sketch(self, group: str, dimension: str) -> SpaceSaving:
+        key = (group, dimension)
+        sketch = self._sketches.get(key)
+        if sketch is None:
+            sketch = self._sketches[key] = SpaceSaving(self.capacity)
+        return sketch
+
+    def add(self, classified: ClassifiedItem, weight: float = 1) -> None:
+        """Count one item; a sampled item counts `weight` times, the items it stands for."""
+        c = classified.classification
+        self.add_sender(classified.item.sender, c.category, c.risk, weight)
+
+    def add_sender(
+        self,
+        sender: str | None,
+        category: WorkCategory,
+        risk: RiskFlag,
+        weight: float = 1,
+    ) -> None:
+        address = sender_address(sender) or "(unknown)"
+        domain = sender_domain(address) or "(unknown)"
+        groups = [category.value]
+        if risk == RiskFlag.SLA_SENSITIVE:
+            groups.append(self.SLA_GROUP)
+        for group in groups:
+            self._sketch(group, "sender").add(address, weight)
+            self._sketch(group, "domain").add(domain, weight)
+
+    def extend(self, items: Iterable[ClassifiedItem]) -> None:
+        for x in items:
+            self.add(x)
+
+    def merge(self, other: SenderConcentration) -> None:
+        for (group, dimension), sketch in other._sketches.items():
+            self._sketch(group, dimension).merge(sketch)
+
+    def to_state(self) -> list[list[object]]:
+        return [
+            [group, dimension, sketch.to_state()]
+            for (group, dimension), sketch in self._sketches.items()
+        ]
+
+    @classmethod
+    def from_state(cls, state: list[list[object]], capacity: int = 50) -> SenderConcentration:
+        concentration = cls(capacity)
+        for group, dimension, raw in state:
+            concentration._sketches[(group, dimension)] = SpaceSaving.from_state(raw, capacity)
+        return concentration
+
+    def rows(self, top_k: int = 5) -> list[dict[str, object]]:
+        rows: list[dict[str, object]] = []
+        for (group, dimension), sketch in self._sketches.items():
+            for key, count, error in sketch.top(top_k):
+                rows.append(
+                    {
+                        "group": group,
+                        "dimension": dimension,
+                        "key": key,
+                        "count": round(count),
+                        "error": round(error),
+                        "share_of_group": round((count / sketch.total) * 100, 1),
+                    }
+                )
+        return rows
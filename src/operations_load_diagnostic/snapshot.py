@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping
+
+from .aggregation import DiagnosticMetrics, metrics_from_counts, period_days_between
+from .models import (
+    Classification,
+    ClassifiedItem,
+    InboundItem,
+    RiskFlag,
+    WorkCategory,
+    WorkNature,
+)
+from .sketches import SenderConcentration
+
+SNAPSHOT_MAGIC = b"OLDSNAP1"
+TEXT_MAGIC = b"OLDTEXT1"
+SNAPSHOT_SUFFIX = ".snapshot"
+NO_TIMESTAMP = -(2**63)
+TEXT_FIELDS = ("item_id", "sender", "subject", "body")
+
+CATEGORIES = list(WorkCategory)
+NATURES = list(WorkNature)
+RISKS = list(RiskFlag)
+
+_ALIGN = 8
+_LEN = struct.Struct("<I")
+
+
+def encode_label(classification: Classification) -> int:
+    """Pack category, nature and risk into one byte so joint counts are a single scan."""
+    return (
+        CATEGORIES.index(classification.category) * len(NATURES)
+        + NATURES.index(classification.nature)
+    ) * len(RISKS) + RISKS.index(classification.risk)
+
+
+def decode_label(code: int) -> tuple[WorkCategory, WorkNature, RiskFlag]:
+    rest, risk_idx = divmod(code, len(RISKS))
+    cat_idx, nature_idx = divmod(rest, len(NATURES))
+    return CATEGORIES[cat_idx], NATURES[nature_idx], RISKS[risk_idx]
+
+
+def timestamp_to_us(ts: datetime | None) -> int:
+    if ts is None:
+        return NO_TIMESTAMP
+    return round(ts.timestamp() * 1_000_000)
+
+
+def us_to_timestamp(value: int) -> datetime | None:
+    if value == NO_TIMESTAMP:
+        return None
+    return datetime.fromtimestamp(value / 1_000_000)
+
+
+def _pad(fh, position: int) -> int:
+    padding = -position % _ALIGN
+    fh.write(b"\0" * padding)
+    return position + padding
+
+
+def write_snapshot(
+    items: Iterable[ClassifiedItem],
+    path: str | Path,
+    include_text: bool = False,
+    created_at: datetime | None = None,
+) -> Path:
+    """
+    Write classified items as a columnar binary snapshot.
+
+    Columns are a packed label byte, POSIX microsecond timestamps, float32
+    confidence and a source code. With `include_text`, item ids, senders,
+    subjects and bodies go to a separate `.snapshot.text` file so the core
+    snapshot stays small.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    text_path = target.with_name(target.name + ".text") if include_text else None
+
+    labels = array("B")
+    timestamps = array("q")
+    confidence = array("f")
+    source_codes = array("B")
+    sources: dict[str, int] = {}
+    label_order: dict[int, None] = {}
+    text_offsets = array("Q", [0])
+    min_us: int | None = None
+    max_us: int | None = None
+    descending = True
+    prev_key: int | None = None
+    created_at = created_at or datetime.now()
+    created_us = timestamp_to_us(created_at)
+
+    text_fh = text_path.open("wb") if text_path else None
+    try:
+        if text_fh:
+            text_fh.write(TEXT_MAGIC)
+        for x in items:
+            us = timestamp_to_us(x.item.timestamp)
+            code = encode_label(x.classification)
+            labels.append(code)
+            label_order.setdefault(code)
+            timestamps.append(us)
+            confidence.append(x.classification.confidence)
+            source_code = sources.setdefault(x.item.source, len(sources))
+            if source_code > 255:
+                raise ValueError("Snapshots support at most 256 distinct item sources.")
+            source_codes.append(source_code)
+            if us != NO_TIMESTAMP:
+                min_us = us if min_us is None else min(min_us, us)
+                max_us = us if max_us is None else max(max_us, us)
+            # Same ordering key as limit_items: untimestamped items count as "now".
+            key = created_us if us == NO_TIMESTAMP else us
+            if prev_key is not None and key > prev_key:
+                descending = False
+            prev_key = key
+            if text_fh:
+                for name in TEXT_FIELDS:
+                    value = x.item.sender if name == "sender" else getattr(x.item, name)
+                    text_fh.write((value or "").encode("utf-8"))
+                    text_offsets.append(text_fh.tell() - len(TEXT_MAGIC))
+        if text_fh:
+            position = _pad(text_fh, text_fh.tell())
+            footer = json.dumps(
+                {
+                    "count": len(labels),
+                    "fields": list(TEXT_FIELDS),
+                    "byteorder": sys.byteorder,
+                    "offsets_at": position,
+                }
+            ).encode("utf-8")
+            text_fh.write(text_offsets.tobytes())
+            text_fh.write(footer)
+            text_fh.write(_LEN.pack(len(footer)))
+            text_fh.write(TEXT_MAGIC)
+    finally:
+        if text_fh:
+            text_fh.close()
+
+    columns = [
+        ("labels", labels),
+        ("timestamps", timestamps),
+        ("confidence", confidence),
+        ("sources", source_codes),
+    ]
+    header: dict[str, object] = {
+        "version": 1,
+        "count": len(labels),
+        "byteorder": sys.byteorder,
+        "created_at_us": created_us,
+        "categories": [c.value for c in CATEGORIES],
+        "natures": [n.value for n in NATURES],
+        "risks": [r.value for r in RISKS],
+        "sources": list(sources),
+        # First-seen label order lets re-aggregation list labels the same way
+        # aggregate_metrics does over the original items.
+        "label_order": list(label_order),
+        "order": "timestamp_desc" if descending else None,
+        "min_timestamp_us": min_us,
+        "max_timestamp_us": max_us,
+        "text": text_path.name if text_path else None,
+        "columns": {},
+    }
+    # Column offsets depend on the header length, so lay out relative offsets
+    # first and let the reader add the aligned data start.
+    position = 0
+    for name, column in columns:
+        header["columns"][name] = {"offset": position, "typecode": column.typecode}
+        position += len(column) * column.itemsize
+        position += -position % _ALIGN
+    encoded = json.dumps(header).encode("utf-8")
+
+    with target.open("wb") as fh:
+        fh.write(SNAPSHOT_MAGIC)
+        fh.write(_LEN.pack(len(encoded)))
+        fh.write(encoded)
+        position = _pad(fh, len(SNAPSHOT_MAGIC) + _LEN.size + len(encoded))
+        for _, column in columns:
+            data = column.tobytes()
+            fh.write(data)
+            position = _pad(fh, position + len(data))
+    return target
+
+
+class _TextColumns:
+    def __init__(self, path: Path):
+        self._fh = path.open("rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        end = len(self._mm)
+        if self._mm[end - len(TEXT_MAGIC) :] != TEXT_MAGIC:
+            raise ValueError(f"{path} is not a snapshot text file.")
+        length_at = end - len(TEXT_MAGIC) - _LEN.size
+        (footer_len,) = _LEN.unpack(self._mm[length_at : length_at + _LEN.size])
+        footer = json.loads(self._mm[length_at - footer_len : length_at])
+        if footer["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {footer['byteorder']}-endian host.")
+        self.fields = footer["fields"]
+        start = footer["offsets_at"]
+        stop = start + (footer["count"] * len(self.fields) + 1) * 8
+        self._offsets = memoryview(self._mm)[start:stop].cast("Q")
+
+    def value(self, index: int, name: str) -> str:
+        slot = index * len(self.fields) + self.fields.index(name)
+        lo = self._offsets[slot] + len(TEXT_MAGIC)
+        hi = self._offsets[slot + 1] + len(TEXT_MAGIC)
+        return self._mm[lo:hi].decode("utf-8")
+
+    def row(self, index: int) -> dict[str, str]:
+        base = index * len(self.fields)
+        values: dict[str, str] = {}
+        for i, name in enumerate(self.fields):
+            lo = self._offsets[base + i] + len(TEXT_MAGIC)
+            hi = self._offsets[base + i + 1] + len(TEXT_MAGIC)
+            values[name] = self._mm[lo:hi].decode("utf-8")
+        return values
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._mm.close()
+        self._fh.close()
+
+
+class ClassifiedSnapshot:
+    """
+    Memory-mapped reader for snapshots produced by `write_snapshot`.
+
+    Label counts come from byte counts over the mapped label column, so
+    re-aggregating millions of items does not build any Python objects per item.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._text: _TextColumns | None = None
+        self._fh = self.path.open("rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a classified-item snapshot.")
+        (header_len,) = _LEN.unpack(self._mm[len(SNAPSHOT_MAGIC) : len(SNAPSHOT_MAGIC) + _LEN.size])
+        header_start = len(SNAPSHOT_MAGIC) + _LEN.size
+        self.header = json.loads(self._mm[header_start : header_start + header_len])
+        if self.header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{self.path} was written on a {self.header['byteorder']}-endian host.")
+        if self.header["categories"] != [c.value for c in CATEGORIES] or self.header[
+            "natures"
+        ] != [n.value for n in NATURES] or self.header["risks"] != [r.value for r in RISKS]:
+            self.close()
+            raise ValueError(f"{self.path} uses a different label set than this version.")
+
+        data_start = header_start + header_len
+        data_start += -data_start % _ALIGN
+        self.count: int = self.header["count"]
+        self.sources: list[str] = self.header["sources"]
+        self.created_at = us_to_timestamp(self.header["created_at_us"])
+        self.is_sorted_desc = self.header["order"] == "timestamp_desc"
+        self._data_start = data_start
+        self._view = memoryview(self._mm)
+        self.timestamps = self._column("timestamps")
+        self.confidence = self._column("confidence")
+        self.source_codes = self._column("sources")
+        self.labels = self._column("labels")
+        if self.header["text"]:
+            text_path = self.path.with_name(self.header["text"])
+            if text_path.exists():
+                self._text = _TextColumns(text_path)
+
+    def _column(self, name: str) -> memoryview:
+        spec = self.header["columns"][name]
+        itemsize = array(spec["typecode"]).itemsize
+        start = self._data_start + spec["offset"]
+        return self._view[start : start + self.count * itemsize].cast(spec["typecode"])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> ClassifiedSnapshot:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def has_text(self) -> bool:
+        return self._text is not None
+
+    def label_code_counts(self, start: int = 0, stop: int | None = None) -> dict[int, int]:
+        stop = self.count if stop is None else min(stop, self.count)
+        raw = self.labels[start:stop].tobytes()
+        counts: dict[int, int] = {}
+        for code in self.header["label_order"]:
+            n = raw.count(bytes((code,)))
+            if n:
+                counts[code] = n
+        return counts
+
+    def aggregate(
+        self,
+        fallback_period_days: int = 14,
+        minutes_by_category: Mapping[WorkCategory, int] | None = None,
+        top_senders: int = 5,
+    ) -> DiagnosticMetrics:
+        """
+        Equivalent to `aggregate_metrics` over every item in the snapshot.
+
+        Sender concentration needs the senders, so it is only rebuilt when the
+        snapshot was written with its text file.
+        """
+        min_us = self.header["min_timestamp_us"]
+        max_us = self.header["max_timestamp_us"]
+        period_days = period_days_between(
+            us_to_timestamp(min_us) if min_us is not None else None,
+            us_to_timestamp(max_us) if max_us is not None else None,
+            fallback_period_days,
+        )
+        metrics = metrics_from_label_counts(
+            self.label_code_counts(), period_days, minutes_by_category
+        )
+        if self._text is not None:
+            metrics.sender_concentration = self.sender_concentration().rows(top_k=top_senders)
+        return metrics
+
+    def sender_concentration(self) -> SenderConcentration:
+        """Top senders per label from the text file, without rebuilding whole items."""
+        if self._text is None:
+            raise ValueError(f"{self.path} was written without --snapshot-text.")
+        decoded = {code: decode_label(code) for code in self.header["label_order"]}
+        concentration = SenderConcentration()
+        for i in range(self.count):
+            category, _, risk = decoded[self.labels[i]]
+            concentration.add_sender(self._text.value(i, "sender") or None, category, risk)
+        return concentration
+
+    def timestamp(self, index: int) -> datetime | None:
+        return us_to_timestamp(self.timestamps[index])
+
+    def iter_classified(self) -> Iterator[ClassifiedItem]:
+        """Rebuild `ClassifiedItem`s; text fields are empty unless the text file exists."""
+        for i in range(self.count):
+            category, nature, risk = decode_label(self.labels[i])
+            text = self._text.row(i) if self._text else {}
+            yield ClassifiedItem(
+                item=InboundItem(
+                    item_id=text.get("item_id") or f"snapshot-{i + 1}",
+                    timestamp=self.timestamp(i),
+                    sender=text.get("sender") or None,
+                    subject=text.get("subject", ""),
+                    body=text.get("body", ""),
+                    source=self.sources[self.source_codes[i]],
+                ),
+                classification=Classification(
+                    category=category,
+                    nature=nature,
+                    risk=risk,
+                    confidence=round(self.confidence[i], 2),
+                ),
+            )
+
+    def close(self) -> None:
+        if self._text:
+            self._text.close()
+            self._text = None
+        for name in ("labels", "timestamps", "confidence", "source_codes", "_view"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        if not self._mm.closed:
+            self._mm.close()
+        self._fh.close()
+
+
+def metrics_from_label_counts(
+    code_counts: Mapping[int, int],
+    period_days: int,
+    minutes_by_category: Mapping[WorkCategory, int] | None = None,
+) -> DiagnosticMetrics:
+    cat_counter: Counter[str] = Counter()
+    nature_counter: Counter[str] = Counter()
+    risk_counter: Counter[str] = Counter()
+    sla_by_category: Counter[str] = Counter()
+    for code, n in code_counts.items():
+        category, nature, risk = decode_label(code)
+        cat_counter[category.value] += n
+        nature_counter[nature.value] += n
+        risk_counter[risk.value] += n
+        if risk == RiskFlag.SLA_SENSITIVE:
+            sla_by_category[category.value] += n
+    return metrics_from_counts(
+        cat_counter,
+        nature_counter,
+        risk_counter,
+        sla_by_category,
+        period_days,
+        minutes_by_category,
+    )
+
+
+def load_snapshot(path: str | Path) -> ClassifiedSnapshot:
+    return ClassifiedSnapshot(path)
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .classification import BaseClassifier, classify_items
+from .fileio import write_report
+from .ingestion import (
+    COMPRESSED_MODULES,
+    csv_row_to_item,
+    iter_csv,
+    iter_text_batch,
+    parse_text_block,
+)
+from .models import InboundItem
+from .reporting import build_assumptions, write_report_set
+from .rules import RuleFileReloader
+from .windowing import SlidingWindowAggregator
+
+_SEPARATOR_LINE = re.compile(rb"(?m)^[ \t]*---[ \t]*\r?$")
+_SEPARATOR_TEXT = re.compile(r"(?m)^[ \t]*---[ \t]*\r?$")
+_WATCH_SUFFIXES = {"csv": ".csv", "text": ".txt"}
+
+
+@dataclass(slots=True)
+class FileCursor:
+    offset: int = 0
+    rows: int = 0
+    last_size: int = -1
+    fieldnames: list[str] | None = None
+
+
+def _complete_csv_prefix(data: bytes) -> int:
+    """Length of the longest prefix ending in a newline that is outside a quoted field."""
+    quotes = data.count(b'"')
+    end = len(data)
+    while True:
+        nl = data.rfind(b"\n", 0, end)
+        if nl < 0:
+            return 0
+        quotes -= data.count(b'"', nl + 1, end)
+        if quotes % 2 == 0:
+            return nl + 1
+        end = nl
+
+
+def _complete_text_prefix(data: bytes) -> int:
+    last = None
+    for last in _SEPARATOR_LINE.finditer(data):
+        pass
+    if last is None:
+        return 0
+    nl = data.find(b"\n", last.end())
+    return len(data) if nl < 0 else nl + 1
+
+
+class DropDirectoryWatcher:
+    """
+    Incrementally ingest a directory of CSV or text dumps.
+
+    Each poll reads only bytes appended since the last poll (tracked per file as
+    a byte offset), classifies the new items, folds them into a
+    `SlidingWindowAggregator`, and atomically rewrites the reports. Growing
+    files are consumed up to their last complete record; the remainder is read
+    once the file has stopped changing for `settle_seconds`. Compressed files
+    cannot be resumed mid-stream, so they are read once they have settled.
+    Cursors and the window are saved to a state file so a restart resumes
+    where it stopped. With `rules_path`, the rule file is re-checked before
+    every poll and swapped into the classifier when it changes; items already
+    in the window keep the classification they were counted with.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        mode: str,
+        classifier: BaseClassifier,
+        output_dir: str | Path,
+        report_name: str = "operations_load_diagnostic",
+        lookback_days: int = 14,
+        report_format: str = "both",
+        classifier_name: str = "heuristic",
+        settle_seconds: float = 30.0,
+        rules_path: str | Path | None = None,
+    ):
+        if mode not in _WATCH_SUFFIXES:
+            raise ValueError("Watch mode supports csv and text inputs only.")
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise ValueError(f"--watch needs a directory for --input, got {directory}")
+        self.mode = mode
+        self.classifier = classifier
+        self.output_dir = Path(output_dir)
+        self.report_name = report_name
+        self.report_format = report_format
+        self.settle_seconds = settle_seconds
+        self.rules = RuleFileReloader(rules_path, classifier) if rules_path else None
+        self.assumptions = build_assumptions(
+            f"Rolling {lookback_days} day window in hourly buckets; no max-items cap.",
+            classifier_name,
+            diagnostic_mode="Read-only, refreshed incrementally from a drop directory; no workflow changes.",
+        )
+        self.state_path = self.output_dir / f".{report_name}.watch-state.json"
+        self.cursors: dict[str, FileCursor] = {}
+        self.window = SlidingWindowAggregator(lookback_days=lookback_days)
+        self._last_metrics = None
+        self.summary: dict[str, object] = {}
+        self._load_state()
+
+    def _load_state(self) -> None:
+        if not self.state_path.exists():
+            return
+        state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        if state.get("directory") != str(self.directory.resolve()) or state.get("mode") != self.mode:
+            return
+        self.cursors = {name: FileCursor(**raw) for name, raw in state["cursors"].items()}
+        window = SlidingWindowAggregator.from_state(state["window"])
+        if window.lookback_days == self.window.lookback_days:
+            self.window = window
+
+    def _save_state(self) -> None:
+        state = {
+            "directory": str(self.directory.resolve()),
+            "mode": self.mode,
+            "cursors": {name: asdict(c) for name, c in self.cursors.items()},
+            "window": self.window.to_state(),
+        }
+        write_report(json.dumps(state), self.state_path)
+
+    def _candidates(self) -> list[Path]:
+        suffix = _WATCH_SUFFIXES[self.mode]
+        paths = []
+        for path in sorted(self.directory.iterdir()):
+            name = path.name.lower()
+            if name.startswith(".") or not path.is_file():
+                continue
+            for ext in COMPRESSED_MODULES:
+                if name.endswith(ext):
+                    name = name[: -len(ext)]
+                    break
+            if name.endswith(suffix):
+                paths.append(path)
+        return paths
+
+    def _read_plain(self, path: Path, cursor: FileCursor, settled: bool) -> list[InboundItem]:
+        with path.open("rb") as fh:
+            fh.seek(cursor.offset)
+            data = fh.read()
+        complete = _complete_csv_prefix if self.mode == "csv" else _complete_text_prefix
+        consumed = len(data) if settled else complete(data)
+        if not consumed:
+            return []
+        chunk = data[:consumed]
+        if cursor.offset == 0 and chunk.startswith(b"\xef\xbb\xbf"):
+            chunk = chunk[3:]
+        cursor.offset += consumed
+        text = chunk.decode("utf-8", errors="replace")
+
+        items: list[InboundItem] = []
+        if self.mode == "csv":
+            reader = csv.DictReader(io.StringIO(text, newline=""), fieldnames=cursor.fieldnames)
+            for row in reader:
+                cursor.rows += 1
+                items.append(csv_row_to_item(row, f"csv-{path.name}-{cursor.rows}"))
+            cursor.fieldnames = list(reader.fieldnames or []) or None
+        else:
+            for block in _SEPARATOR_TEXT.split(text):
+                block = block.strip()
+                if not block:
+                    continue
+                cursor.rows += 1
+                item = parse_text_block(block, cursor.rows)
+                item.item_id = f"text-{path.name}-{cursor.rows}"
+                items.append(item)
+        return items
+
+    def _read_compressed(self, path: Path, cursor: FileCursor, size: int) -> list[InboundItem]:
+        reader: Callable[[Path], Iterator[InboundItem]] = (
+            iter_csv if self.mode == "csv" else iter_text_batch
+        )
+        items = list(itertools.islice(reader(path), cursor.rows, None))
+        for item in items:
+            cursor.rows += 1
+            item.item_id = f"{item.source}-{path.name}-{cursor.rows}"
+        cursor.offset = size
+        return items
+
+    def _new_items(self) -> list[InboundItem]:
+        now = time.time()
+        items: list[InboundItem] = []
+        for path in self._candidates():
+            stat = path.stat()
+            cursor = self.cursors.setdefault(path.name, FileCursor())
+            settled = stat.st_size == cursor.last_size and now - stat.st_mtime >= self.settle_seconds
+            cursor.last_size = stat.st_size
+            if stat.st_size < cursor.offset:
+                # Truncated or replaced: start over rather than read from a stale offset.
+                self.cursors[path.name] = cursor = FileCursor(last_size=stat.st_size)
+            if stat.st_size == cursor.offset:
+                continue
+            if path.suffix.lower() in COMPRESSED_MODULES:
+                if settled:
+                    items.extend(self._read_compressed(path, cursor, stat.st_size))
+            else:
+                items.extend(self._read_plain(path, cursor, settled))
+        return items
+
+    def _reload_rules(self) -> None:
+        if self.rules is None:
+            return
+        error = self.rules.last_error
+        if not self.rules.check() and self.rules.last_error and self.rules.last_error != error:
+            print(
+                f"Keeping previous rules; {self.rules.path} failed to load: {self.rules.last_error}",
+                file=sys.stderr,
+            )
+
+    def poll(self) -> int:
+        """Process new data once; returns the number of new items ingested."""
+        self._reload_rules()
+        new_items = self._new_items()
+        self.window.extend(classify_items(self.classifier, new_items))
+        self.window.advance_to(datetime.now())
+        metrics = self.window.metrics()
+        if new_items or metrics != self._last_metrics or not self.summary:
+            self.summary = write_report_set(
+                metrics,
+                self.assumptions,
+                self.output_dir,
+                self.report_name,
+                report_format=self.report_format,
+            )
+            self._last_metrics = metrics
+            self._save_state()
+        return len(new_items)
+
+    def run(self, interval: float = 60.0, max_polls: int | None = None) -> dict[str, object]:
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                self.poll()
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        return self.summary
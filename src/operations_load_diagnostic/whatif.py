@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import itertools
+import json
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Mapping, Sequence
+
+from .aggregation import CONSERVATIVE_MINUTES_BY_CATEGORY, DiagnosticMetrics, period_days_between
+from .models import WorkCategory
+from .snapshot import (
+    NO_TIMESTAMP,
+    ClassifiedSnapshot,
+    metrics_from_label_counts,
+    timestamp_to_us,
+    us_to_timestamp,
+)
+
+GRID_KEYS = {"minutes_by_category", "lookback_days", "max_items"}
+
+
+@dataclass(slots=True)
+class Scenario:
+    name: str
+    minutes_by_category: dict[WorkCategory, int] = field(
+        default_factory=lambda: dict(CONSERVATIVE_MINUTES_BY_CATEGORY)
+    )
+    lookback_days: int | None = None
+    max_items: int | None = None
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    scenario: Scenario
+    metrics: DiagnosticMetrics
+
+
+def expand_grid(
+    minutes_grid: Mapping[WorkCategory, Sequence[int]] | None = None,
+    lookback_days: Sequence[int | None] = (None,),
+    max_items: Sequence[int | None] = (None,),
+) -> list[Scenario]:
+    """Cartesian product of per-category minute overrides and window settings."""
+    minutes_grid = minutes_grid or {}
+    categories = list(minutes_grid)
+    scenarios: list[Scenario] = []
+    for values in itertools.product(*(minutes_grid[c] for c in categories)):
+        overrides = dict(zip(categories, values))
+        for days, cap in itertools.product(lookback_days or (None,), max_items or (None,)):
+            parts = [f"{c.value}={v}" for c, v in overrides.items()]
+            if days is not None:
+                parts.append(f"{days}d")
+            if cap is not None:
+                parts.append(f"max {cap}")
+            scenarios.append(
+                Scenario(
+                    name=", ".join(parts) or "defaults",
+                    minutes_by_category={**CONSERVATIVE_MINUTES_BY_CATEGORY, **overrides},
+                    lookback_days=days,
+                    max_items=cap,
+                )
+            )
+    return scenarios
+
+
+def _grid_values(raw: object, name: str) -> list[int]:
+    try:
+        return [int(v) for v in (raw if isinstance(raw, list) else [raw])]
+    except (TypeError, ValueError):
+        raise ValueError(f"Grid '{name}' must be an integer or a list of integers.") from None
+
+
+def load_scenario_grid(path: str | Path) -> list[Scenario]:
+    """
+    Grid file format (JSON), every key optional; a single value stands for a
+    one-element list:
+      {
+        "minutes_by_category": {"Exception / Delay": [10, 12, 15]},
+        "lookback_days": [7, 14],
+        "max_items": [200, 1000]
+      }
+    """
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(raw, dict):
+        raise ValueError("Scenario grid must be a JSON object.")
+    unknown = sorted(set(raw) - GRID_KEYS)
+    if unknown:
+        raise ValueError(f"Scenario grid has unknown keys: {', '.join(unknown)}.")
+    minutes_grid = {
+        WorkCategory(name): _grid_values(values, name)
+        for name, values in (raw.get("minutes_by_category") or {}).items()
+    }
+    windows = {
+        name: _grid_values(raw[name], name) if raw.get(name) else [None]
+        for name in ("lookback_days", "max_items")
+    }
+    return expand_grid(minutes_grid, **windows)
+
+
+class _OrderedView:
+    """Snapshot rows in `limit_items` order (newest first), computed once per snapshot."""
+
+    def __init__(self, snapshot: ClassifiedSnapshot):
+        self.reference_us = timestamp_to_us(snapshot.created_at)
+        if snapshot.is_sorted_desc:
+            self.timestamps: Sequence[int] = snapshot.timestamps
+            self.labels = snapshot.labels.tobytes()
+        else:
+            ts = snapshot.timestamps
+            order = sorted(range(len(snapshot)), key=lambda i: self._key(ts[i]), reverse=True)
+            self.timestamps = array("q", (ts[i] for i in order))
+            self.labels = bytes(snapshot.labels[i] for i in order)
+        self.label_order: list[int] = snapshot.header["label_order"]
+        self._counts: dict[int, dict[int, int]] = {}
+
+    def _key(self, us: int) -> int:
+        return self.reference_us if us == NO_TIMESTAMP else us
+
+    def window_length(self, lookback_days: int | None, max_items: int | None) -> int:
+        length = len(self.timestamps)
+        if lookback_days is not None:
+            reference = us_to_timestamp(self.reference_us)
+            threshold = timestamp_to_us(reference - timedelta(days=lookback_days))
+            length = bisect_right(self.timestamps, -threshold, key=lambda us: -self._key(us))
+        if max_items is not None:
+            length = min(length, max_items)
+        return length
+
+    def label_counts(self, length: int) -> dict[int, int]:
+        if length not in self._counts:
+            window = self.labels[:length]
+            # List labels in first-seen order within the window, as aggregate_metrics
+            # does over the newest-first items; ties in the report keep that order.
+            present = [code for code in self.label_order if bytes((code,)) in window]
+            present.sort(key=lambda code: window.index(bytes((code,))))
+            self._counts[length] = {code: window.count(bytes((code,))) for code in present}
+        return self._counts[length]
+
+    def period_days(self, length: int, fallback_period_days: int) -> int:
+        # Newest-first order: the first real timestamp is the max, the last the min.
+        ts = self.timestamps
+        max_us = next((ts[i] for i in range(length) if ts[i] != NO_TIMESTAMP), None)
+        min_us = next((ts[i] for i in range(length - 1, -1, -1) if ts[i] != NO_TIMESTAMP), None)
+        return period_days_between(
+            us_to_timestamp(min_us) if min_us is not None else None,
+            us_to_timestamp(max_us) if max_us is not None else None,
+            fallback_period_days,
+        )
+
+
+def run_what_if(
+    snapshot: ClassifiedSnapshot,
+    scenarios: Sequence[Scenario],
+    fallback_period_days: int = 14,
+) -> list[ScenarioResult]:
+    """
+    Recompute metrics for every scenario against cached classifications.
+
+    Ordering, window boundaries and label counts are computed once per distinct
+    window and shared; each scenario only re-weights counts by its minutes.
+    Lookback windows are measured from the time the snapshot was written.
+    """
+    view = _OrderedView(snapshot)
+    windows: dict[tuple[int | None, int | None], tuple[dict[int, int], int]] = {}
+    results: list[ScenarioResult] = []
+    for scenario in scenarios:
+        key = (scenario.lookback_days, scenario.max_items)
+        if key not in windows:
+            length = view.window_length(*key)
+            # An empty window falls back to the scenario's own lookback, as a
+            # one-off run with that --lookback-days would.
+            windows[key] = (
+                view.label_counts(length),
+                view.period_days(
+                    length,
+                    scenario.lookback_days
+                    if scenario.lookback_days is not None
+                    else fallback_period_days,
+                ),
+            )
+        counts, period_days = windows[key]
+        results.append(
+            ScenarioResult(
+                scenario=scenario,
+                metrics=metrics_from_label_counts(
+                    counts, period_days, scenario.minutes_by_category
+                ),
+            )
+        )
+    return results
+
+
+def what_if_summary(results: Sequence[ScenarioResult]) -> list[dict[str, object]]:
+    return [
+        {
+            "scenario": r.scenario.name,
+            "lookback_days": r.scenario.lookback_days,
+            "max_items": r.scenario.max_items,
+            "minutes_by_category": {k.value: v for k, v in r.scenario.minutes_by_category.items()},
+            "items": r.metrics.total_volume,
+            "period_days": r.metrics.period_days,
+            "estimated_total_minutes": r.metrics.estimated_total_minutes,
+            "estimated_hours_per_week": r.metrics.estimated_hours_per_week,
+            "estimated_minutes_by_category": r.metrics.estimated_minutes_by_category,
+        }
+        for r in results
+    ]
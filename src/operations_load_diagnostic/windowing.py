@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable
+
+from .aggregation import DiagnosticMetrics, metrics_from_counts, period_days_between
+from .models import ClassifiedItem, RiskFlag
+from .sketches import SenderConcentration
+
+
+@dataclass(slots=True)
+class _Bucket:
+    index: int = -1
+    total: int = 0
+    category_counts: Counter[str] = field(default_factory=Counter)
+    nature_counts: Counter[str] = field(default_factory=Counter)
+    risk_counts: Counter[str] = field(default_factory=Counter)
+    sla_by_category: Counter[str] = field(default_factory=Counter)
+    senders: SenderConcentration = field(default_factory=SenderConcentration)
+    min_ts: datetime | None = None
+    max_ts: datetime | None = None
+
+    def reset(self, index: int) -> None:
+        self.index = index
+        self.total = 0
+        self.category_counts.clear()
+        self.nature_counts.clear()
+        self.risk_counts.clear()
+        self.sla_by_category.clear()
+        self.senders = SenderConcentration()
+        self.min_ts = None
+        self.max_ts = None
+
+
+class SlidingWindowAggregator:
+    """
+    Rolling "last N days" aggregate built from fixed time buckets.
+
+    Buckets live in a ring buffer sized to the window, and running totals are
+    kept alongside so expiring a bucket is a subtraction rather than a rescan.
+    Memory depends on the window length, never on how many items were added.
+    Items without a timestamp are counted in the newest bucket.
+
+    Sender concentration cannot be subtracted, so each bucket keeps its own
+    Space-Saving sketches and `metrics()` merges the live ones.
+    """
+
+    def __init__(self, lookback_days: int = 14, bucket_minutes: int = 60):
+        if lookback_days <= 0 or bucket_minutes <= 0:
+            raise ValueError("lookback_days and bucket_minutes must be positive.")
+        self.lookback_days = lookback_days
+        self.bucket_minutes = bucket_minutes
+        self.bucket_seconds = bucket_minutes * 60
+        self.bucket_count = -(-(lookback_days * 86400) // self.bucket_seconds)
+        self._buckets = [_Bucket() for _ in range(self.bucket_count)]
+        self._head = -1
+        self._total = 0
+        self._category_counts: Counter[str] = Counter()
+        self._nature_counts: Counter[str] = Counter()
+        self._risk_counts: Counter[str] = Counter()
+        self._sla_by_category: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return self._total
+
+    def _bucket_index(self, ts: datetime) -> int:
+        return int(ts.timestamp() // self.bucket_seconds)
+
+    def _expire(self, bucket: _Bucket) -> None:
+        if bucket.total:
+            self._total -= bucket.total
+            self._category_counts.subtract(bucket.category_counts)
+            self._nature_counts.subtract(bucket.nature_counts)
+            self._risk_counts.subtract(bucket.risk_counts)
+            self._sla_by_category.subtract(bucket.sla_by_category)
+
+    def _advance_head(self, index: int) -> None:
+        if index <= self._head:
+            return
+        # Only the slots being overwritten need clearing, so a jump larger than
+        # the window touches each slot at most once.
+        start = max(self._head + 1, index - self.bucket_count + 1)
+        for i in range(start, index + 1):
+            bucket = self._buckets[i % self.bucket_count]
+            self._expire(bucket)
+            bucket.reset(i)
+        self._head = index
+
+    def advance_to(self, now: datetime) -> None:
+        """Expire every bucket that has fallen out of the window ending at `now`."""
+        self._advance_head(self._bucket_index(now))
+
+    def add(self, classified: ClassifiedItem) -> bool:
+        """Count one item; returns False if it is older than the current window."""
+        ts = classified.item.timestamp
+        if ts is None:
+            if self._head < 0:
+                self.advance_to(datetime.now())
+            index = self._head
+        else:
+            index = self._bucket_index(ts)
+            if index <= self._head - self.bucket_count:
+                return False
+            self._advance_head(index)
+
+        bucket = self._buckets[index % self.bucket_count]
+        c = classified.classification
+        bucket.total += 1
+        bucket.category_counts[c.category.value] += 1
+        bucket.nature_counts[c.nature.value] += 1
+        bucket.risk_counts[c.risk.value] += 1
+        self._total += 1
+        self._category_counts[c.category.value] += 1
+        self._nature_counts[c.nature.value] += 1
+        self._risk_counts[c.risk.value] += 1
+        if c.risk == RiskFlag.SLA_SENSITIVE:
+            bucket.sla_by_category[c.category.value] += 1
+            self._sla_by_category[c.category.value] += 1
+        bucket.senders.add(classified)
+        if ts is not None:
+            if bucket.min_ts is None or ts < bucket.min_ts:
+                bucket.min_ts = ts
+            if bucket.max_ts is None or ts > bucket.max_ts:
+                bucket.max_ts = ts
+        return True
+
+    def extend(self, items: Iterable[ClassifiedItem]) -> int:
+        return sum(1 for x in items if self.add(x))
+
+    def metrics(self, top_senders: int = 5) -> DiagnosticMetrics:
+        """Return the same fields `aggregate_metrics` produces for the live window."""
+        # Walk buckets oldest first so ties rank the same way however the
+        # window was filled or restored.
+        live = sorted((b for b in self._buckets if b.index >= 0), key=lambda b: b.index)
+        min_ts: datetime | None = None
+        max_ts: datetime | None = None
+        senders = SenderConcentration()
+        for bucket in live:
+            senders.merge(bucket.senders)
+            if bucket.min_ts is None or bucket.max_ts is None:
+                continue
+            if min_ts is None or bucket.min_ts < min_ts:
+                min_ts = bucket.min_ts
+            if max_ts is None or bucket.max_ts > max_ts:
+                max_ts = bucket.max_ts
+
+        def ordered(counts: Counter[str], name: str) -> dict[str, int]:
+            keys = dict.fromkeys(key for b in live for key in getattr(b, name))
+            return {key: counts[key] for key in keys}
+
+        metrics = metrics_from_counts(
+            ordered(self._category_counts, "category_counts"),
+            ordered(self._nature_counts, "nature_counts"),
+            ordered(self._risk_counts, "risk_counts"),
+            ordered(self._sla_by_category, "sla_by_category"),
+            period_days_between(min_ts, max_ts, self.lookback_days),
+        )
+        metrics.sender_concentration = senders.rows(top_k=top_senders)
+        return metrics
+
+    def to_state(self) -> dict[str, object]:
+        """JSON-serialisable state, so a long-running caller can resume after a restart."""
+        return {
+            "lookback_days": self.lookback_days,
+            "bucket_minutes": self.bucket_minutes,
+            "head": self._head,
+            "buckets": [
+                {
+                    "index": b.index,
+                    "total": b.total,
+                    "category_counts": dict(b.category_counts),
+                    "nature_counts": dict(b.nature_counts),
+                    "risk_counts": dict(b.risk_counts),
+                    "sla_by_category": dict(b.sla_by_category),
+                    "senders": b.senders.to_state(),
+                    "min_ts": b.min_ts.isoformat() if b.min_ts else None,
+                    "max_ts": b.max_ts.isoformat() if b.max_ts else None,
+                }
+                for b in self._buckets
+                if b.index >= 0 and b.total
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, object]) -> SlidingWindowAggregator:
+        window = cls(
+            lookback_days=int(state["lookback_days"]),
+            bucket_minutes=int(state["bucket_minutes"]),
+        )
+        head = int(state["head"])
+        if head >= 0:
+            window._advance_head(head)
+        for raw in state["buckets"]:
+            if raw["index"] <= head - window.bucket_count:
+                continue
+            bucket = window._buckets[raw["index"] % window.bucket_count]
+            bucket.reset(raw["index"])
+            bucket.total = raw["total"]
+            bucket.category_counts.update(raw["category_counts"])
+            bucket.nature_counts.update(raw["nature_counts"])
+            bucket.risk_counts.update(raw["risk_counts"])
+            bucket.sla_by_category.update(raw["sla_by_category"])
+            # State files written before senders were tracked have none.
+            bucket.senders = SenderConcentration.from_state(raw.get("senders", []))
+            bucket.min_ts = datetime.fromisoformat(raw["min_ts"]) if raw["min_ts"] else None
+            bucket.max_ts = datetime.fromisoformat(raw["max_ts"]) if raw["max_ts"] else None
+            window._total += bucket.total
+            window._category_counts.update(bucket.category_counts)
+            window._nature_counts.update(bucket.nature_counts)
+            window._risk_counts.update(bucket.risk_counts)
+            window._sla_by_category.update(bucket.sla_by_category)
+        return window
@@ -0,0 +1,84 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from operations_load_diagnostic.batch import load_manifest, run_tenant
+from operations_load_diagnostic.caching import CachingClassifier
+from operations_load_diagnostic.classification import HeuristicClassifier
+
+SAMPLE_CSV = Path(__file__).resolve().parents[1] / "examples" / "sample_inbound.csv"
+
+
+class SlowClassifier(HeuristicClassifier):
+    def __init__(self):
+        super().__init__()
+        self.classified = 0
+
+    def classify_batch(self, items):
+        time.sleep(0.2)
+        self.classified += len(items)
+        return super().classify_batch(items)
+
+
+def test_concurrent_jobs_share_classifications(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(
+        json.dumps(
+            {
+                "output_dir": "out",
+                "defaults": {"mode": "csv", "input": str(SAMPLE_CSV), "lookback_days": 9999},
+                "jobs": [{"tenant": "acme"}, {"tenant": "globex"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    manifest = load_manifest(manifest_path)
+    inner = SlowClassifier()
+    classifier = CachingClassifier(inner)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda job: run_tenant(job, classifier), manifest.jobs))
+
+    assert all(r.ok for r in results)
+    items = results[0].metrics.total_volume
+    assert items > 0
+    assert results[1].metrics.category_counts == results[0].metrics.category_counts
+    # Both jobs start together; the second waits for the first one's results.
+    assert inner.classified == classifier.misses == len(classifier._cache)
+    assert classifier.hits + classifier.misses == 2 * items
+    assert classifier.hits >= items
+
+
+def test_profiling_job_leaves_shared_classifier_untouched(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(
+        json.dumps({"jobs": [{"tenant": "acme", "mode": "csv", "input": str(SAMPLE_CSV)}]}),
+        encoding="utf-8",
+    )
+    job = load_manifest(manifest_path).jobs[0]
+    job.args.profile_rules = True
+    inner = HeuristicClassifier()
+    classifier = CachingClassifier(inner)
+
+    result = run_tenant(job, classifier)
+
+    assert result.ok, result.error
+    assert "rule_profile" in result.summary["output_files"]
+    assert inner.profile is None
+    assert classifier.misses == 0
+
+
+def test_manifest_values_are_converted_at_load_time(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    job = {"tenant": "acme", "mode": "csv", "input": "in.csv", "lookback_days": "7"}
+    manifest_path.write_text(json.dumps({"jobs": [job]}), encoding="utf-8")
+    args = load_manifest(manifest_path).jobs[0].args
+    assert args.lookback_days == 7
+    assert args.input == str(tmp_path / "in.csv")
+
+    for key, value in [("max_items", "many"), ("format", "pdf"), ("drilldown", "yes")]:
+        manifest_path.write_text(json.dumps({"jobs": [{**job, key: value}]}), encoding="utf-8")
+        with pytest.raises(ValueError, match=f"Job 'acme': '{key}'"):
+            load_manifest(manifest_path)
@@ -0,0 +1,60 @@
+import random
+
+from operations_load_diagnostic.classification import (
+    DEFAULT_RULESET,
+    HeuristicClassifier,
+    RuleSet,
+    classify_items,
+)
+from operations_load_diagnostic.models import InboundItem, WorkCategory
+
+
+def _fuzzed_items(count: int, seed: int = 1) -> list[InboundItem]:
+    keywords = [
+        *(kw for kws in DEFAULT_RULESET.category_keywords.values() for kw in kws),
+        *DEFAULT_RULESET.exception_keywords,
+        *DEFAULT_RULESET.sla_keywords,
+        "urgent",
+        "x",
+        "\0",
+    ]
+    rnd = random.Random(seed)
+    return [
+        InboundItem(
+            item_id=str(i),
+            timestamp=None,
+            sender=None,
+            subject=" ".join(rnd.choices(keywords, k=rnd.randint(0, 4))).upper(),
+            body=" ".join(rnd.choices(keywords, k=rnd.randint(0, 6))),
+        )
+        for i in range(count)
+    ]
+
+
+def test_classify_items_chunks_in_order():
+    items = _fuzzed_items(500)
+    classifier = HeuristicClassifier()
+    expected = [classifier.classify(item) for item in items]
+    for batch_size in (1, 7, 1000):
+        classified = list(classify_items(classifier, items, batch_size=batch_size))
+        assert [c.item for c in classified] == items
+        assert [c.classification for c in classified] == expected
+    assert list(classify_items(classifier, [])) == []
+
+
+def test_profile_uses_the_classifier_outcome():
+    from operations_load_diagnostic.profiling import SLA_GROUP, RuleProfile
+
+    ruleset = RuleSet(
+        category_keywords={WorkCategory.EXCEPTION_DELAY: ["delay"]},
+        exception_keywords=[],
+        sla_keywords=["asap"],
+    )
+    profile = RuleProfile(ruleset)
+    classifier = HeuristicClassifier(ruleset, profile=profile)
+    item = InboundItem(item_id="1", timestamp=None, sender=None, subject="delay urgent asap", body="")
+    assert classifier.classify(item).risk.value == "SLA-sensitive"
+    # "urgent" still makes the delay SLA-sensitive without "asap", so "asap" decides nothing.
+    assert profile.keywords[(SLA_GROUP, "asap")].hits == 1
+    assert profile.keywords[(SLA_GROUP, "asap")].decisive == 0
+    assert profile.keywords[(WorkCategory.EXCEPTION_DELAY.value, "delay")].decisive == 1
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from operations_load_diagnostic.aggregation import aggregate_metrics
+from operations_load_diagnostic.classification import HeuristicClassifier, classify_items
+from operations_load_diagnostic.models import InboundItem
+from operations_load_diagnostic.reporting import (
+    generate_html_report_from_metrics,
+    generate_markdown_report,
+)
+
+# A CSV sender column without an address is used as the key as-is.
+SENDER = "Ops | R&D Desk"
+
+
+def test_sender_keys_are_escaped_in_tables():
+    items = [
+        InboundItem(
+            item_id=str(i),
+            timestamp=datetime(2026, 2, 1, 8, i),
+            sender=SENDER,
+            subject="ETA for shipment",
+            body="Please confirm ETA.",
+        )
+        for i in range(5)
+    ]
+    metrics = aggregate_metrics(list(classify_items(HeuristicClassifier(), items)))
+    keys = [r["key"] for r in metrics.sender_concentration if r["dimension"] == "sender"]
+    assert keys and all("|" in key for key in keys)
+
+    markdown = generate_markdown_report(metrics, [], {})
+    rows = [line for line in markdown.splitlines() if "r&d" in line]
+    assert rows and all("ops \\| r&d desk" in line for line in rows)
+    assert all(line.count(" | ") == 3 for line in rows)
+    assert "ops | r&amp;d desk" in generate_html_report_from_metrics(metrics, [], {})
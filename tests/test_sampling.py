@@ -0,0 +1,19 @@
+from operations_load_diagnostic.classification import HeuristicClassifier
+from operations_load_diagnostic.reporting import generate_markdown_report
+from operations_load_diagnostic.sampling import StratifiedReservoirSampler, estimate_metrics
+
+from test_classification import _fuzzed_items
+
+
+def test_estimated_minutes_sum_to_total_and_sla_interval_is_reported():
+    sampler = StratifiedReservoirSampler(40, seed=1)
+    sampler.extend(_fuzzed_items(1234))
+    metrics = estimate_metrics(sampler.classify(HeuristicClassifier()))
+
+    assert metrics.sample_size < metrics.total_volume
+    assert sum(metrics.estimated_minutes_by_category.values()) == metrics.estimated_total_minutes
+
+    markdown = generate_markdown_report(metrics, [], {})
+    lo, hi = metrics.percentage_intervals["risk"]["SLA-sensitive"]
+    assert "SLA-sensitive share of inbound: **" in markdown
+    assert f"(95% CI {lo}% - {hi}%)" in markdown
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime, timedelta
+
+from operations_load_diagnostic.aggregation import aggregate_metrics
+from operations_load_diagnostic.classification import HeuristicClassifier, classify_items
+from operations_load_diagnostic.sampling import StratifiedReservoirSampler, estimate_metrics
+from operations_load_diagnostic.sketches import SpaceSaving
+from operations_load_diagnostic.snapshot import load_snapshot, write_snapshot
+from operations_load_diagnostic.windowing import SlidingWindowAggregator
+
+from test_classification import _fuzzed_items
+
+
+def _classified(count, start):
+    items = _fuzzed_items(count, seed=7)
+    for i, item in enumerate(items):
+        item.sender = f"user{i % 13}@tenant{i % 4}.example"
+        item.timestamp = start + timedelta(hours=i % 200)
+    return list(classify_items(HeuristicClassifier(), items))
+
+
+def _rows(rows):
+    return sorted((r["group"], r["dimension"], r["key"], r["count"]) for r in rows)
+
+
+def test_space_saving_merge_matches_a_single_sketch():
+    keys = [f"k{i % 7}" for i in range(100)]
+    whole, left, right = SpaceSaving(10), SpaceSaving(10), SpaceSaving(10)
+    for i, key in enumerate(keys):
+        whole.add(key)
+        (left if i % 2 else right).add(key)
+    left.merge(right)
+    assert left.top(10) == whole.top(10)
+    assert left.total == whole.total == 100
+
+
+def test_window_and_snapshot_match_aggregate_metrics(tmp_path):
+    classified = _classified(400, datetime.now() - timedelta(days=8))
+    expected = _rows(aggregate_metrics(classified).sender_concentration)
+    assert expected
+
+    window = SlidingWindowAggregator(lookback_days=14)
+    window.extend(classified)
+    assert _rows(window.metrics().sender_concentration) == expected
+    restored = SlidingWindowAggregator.from_state(json.loads(json.dumps(window.to_state())))
+    assert _rows(restored.metrics().sender_concentration) == expected
+
+    path = write_snapshot(classified, tmp_path / "run.snapshot", include_text=True)
+    with load_snapshot(path) as snapshot:
+        assert _rows(snapshot.aggregate().sender_concentration) == expected
+    path = write_snapshot(classified, tmp_path / "bare.snapshot")
+    with load_snapshot(path) as snapshot:
+        assert snapshot.aggregate().sender_concentration == []
+
+
+def test_sampled_concentration_is_weighted_to_the_population():
+    classified = _classified(400, datetime(2026, 2, 1))
+    sampler = StratifiedReservoirSampler(3, seed=1)
+    sampler.extend(x.item for x in classified)
+    metrics = estimate_metrics(sampler.classify(HeuristicClassifier()))
+    domains = [r for r in metrics.sender_concentration if r["dimension"] == "domain"]
+    assert domains
+    by_group: dict[str, int] = {}
+    for row in domains:
+        by_group[row["group"]] = by_group.get(row["group"], 0) + row["count"]
+    # All four domains fit in the top five, so a group's rows add up to its
+    # estimated volume, give or take rounding.
+    for group, count in by_group.items():
+        if group in metrics.category_counts:
+            assert abs(count - metrics.category_counts[group]) <= len(domains)
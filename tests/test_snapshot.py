@@ -0,0 +1,69 @@
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from operations_load_diagnostic.aggregation import aggregate_metrics
+from operations_load_diagnostic.classification import HeuristicClassifier, classify_items
+from operations_load_diagnostic.snapshot import load_snapshot, write_snapshot
+
+from test_classification import _fuzzed_items
+
+
+def _classified(count, newest_first):
+    items = _fuzzed_items(count, seed=11)
+    start = datetime(2026, 2, 1, 8, 30, 0, 123456)
+    for i, item in enumerate(items):
+        item.item_id = f"id-{i}"
+        item.sender = f"user{i % 5}@example.com" if i % 4 else None
+        item.source = "csv" if i % 3 else "mbox"
+        item.timestamp = None if i % 10 == 0 else start + timedelta(minutes=37 * ((i * 7919) % count))
+    classified = list(classify_items(HeuristicClassifier(), items))
+    if newest_first:
+        classified.sort(key=lambda x: x.item.timestamp or datetime.max, reverse=True)
+    return classified
+
+
+def test_round_trip_with_text(tmp_path):
+    classified = _classified(500, newest_first=False)
+    path = write_snapshot(classified, tmp_path / "run.snapshot", include_text=True)
+    with load_snapshot(path) as snapshot:
+        assert len(snapshot) == 500
+        assert snapshot.has_text
+        assert not snapshot.is_sorted_desc
+        assert snapshot.aggregate(fallback_period_days=9) == aggregate_metrics(
+            classified, fallback_period_days=9
+        )
+        restored = list(snapshot.iter_classified())
+
+    for original, copy in zip(classified, restored, strict=True):
+        assert copy.item.timestamp == original.item.timestamp
+        assert copy.item.source == original.item.source
+        assert (copy.item.item_id, copy.item.sender) == (original.item.item_id, original.item.sender)
+        assert (copy.item.subject, copy.item.body) == (original.item.subject, original.item.body)
+        c, o = copy.classification, original.classification
+        assert (c.category, c.nature, c.risk) == (o.category, o.nature, o.risk)
+        assert c.confidence == round(o.confidence, 2)
+
+
+def test_round_trip_without_text_and_sorted(tmp_path):
+    classified = _classified(300, newest_first=True)
+    path = write_snapshot(classified, tmp_path / "run.snapshot")
+    assert not path.with_name(path.name + ".text").exists()
+    with load_snapshot(path) as snapshot:
+        assert snapshot.is_sorted_desc
+        assert not snapshot.has_text
+        expected = aggregate_metrics(classified)
+        assert snapshot.aggregate() == replace(expected, sender_concentration=[])
+        restored = list(snapshot.iter_classified())
+    assert [x.item.timestamp for x in restored] == [x.item.timestamp for x in classified]
+    assert [x.classification.category for x in restored] == [
+        x.classification.category for x in classified
+    ]
+    assert all(x.item.subject == "" and x.item.sender is None for x in restored)
+
+
+def test_empty_snapshot(tmp_path):
+    path = write_snapshot([], tmp_path / "empty.snapshot", include_text=True)
+    with load_snapshot(path) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.aggregate(fallback_period_days=5) == aggregate_metrics([], fallback_period_days=5)
+        assert list(snapshot.iter_classified()) == []
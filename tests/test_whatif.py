@@ -0,0 +1,70 @@
+import json
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from operations_load_diagnostic.aggregation import aggregate_metrics
+from operations_load_diagnostic.classification import HeuristicClassifier, classify_items
+from operations_load_diagnostic.ingestion import limit_items
+from operations_load_diagnostic.models import WorkCategory
+from operations_load_diagnostic.snapshot import load_snapshot, write_snapshot
+from operations_load_diagnostic.whatif import Scenario, load_scenario_grid, run_what_if
+
+from test_classification import _fuzzed_items
+
+
+def _dated_items(count):
+    # Half-day offsets keep every item clear of a lookback boundary, so a
+    # snapshot written a moment after `limit_items` runs sees the same windows.
+    now = datetime.now()
+    items = _fuzzed_items(count, seed=5)
+    for i, item in enumerate(items):
+        item.timestamp = None if i % 9 == 0 else now - timedelta(days=(i * 7) % 30 + 0.5)
+    return items
+
+
+def test_run_what_if_matches_a_fresh_run(tmp_path):
+    items = _dated_items(300)
+    classifier = HeuristicClassifier()
+    path = write_snapshot(classify_items(classifier, items), tmp_path / "run.snapshot")
+    windows = [(14, 200), (7, 50), (30, 1000), (3, 10)]
+    with load_snapshot(path) as snapshot:
+        results = run_what_if(snapshot, [Scenario("w", lookback_days=d, max_items=m) for d, m in windows])
+
+    for (days, cap), result in zip(windows, results):
+        limited = limit_items(items, lookback_days=days, max_items=cap)
+        expected = aggregate_metrics(list(classify_items(classifier, limited)), fallback_period_days=days)
+        assert result.metrics == replace(expected, sender_concentration=[])
+
+
+def test_empty_window_falls_back_to_scenario_lookback(tmp_path):
+    items = _fuzzed_items(5)
+    for item in items:
+        item.timestamp = datetime.now() - timedelta(days=40)
+    path = write_snapshot(classify_items(HeuristicClassifier(), items), tmp_path / "old.snapshot")
+    with load_snapshot(path) as snapshot:
+        (result,) = run_what_if(snapshot, [Scenario("week", lookback_days=7)], fallback_period_days=10000)
+    assert result.metrics.total_volume == 0
+    assert result.metrics.period_days == 7
+
+
+def _grid(tmp_path, raw):
+    path = tmp_path / "grid.json"
+    path.write_text(json.dumps(raw), encoding="utf-8")
+    return load_scenario_grid(path)
+
+
+def test_scenario_grid_accepts_scalars_and_rejects_unknown_keys(tmp_path):
+    (scenario,) = _grid(
+        tmp_path,
+        {"minutes_by_category": {"Exception / Delay": 10}, "lookback_days": 7, "max_items": 200},
+    )
+    assert scenario.minutes_by_category[WorkCategory.EXCEPTION_DELAY] == 10
+    assert (scenario.lookback_days, scenario.max_items) == (7, 200)
+    assert len(_grid(tmp_path, {"lookback_days": [7, 14], "max_items": [10, 20]})) == 4
+
+    with pytest.raises(ValueError, match="unknown keys: lookback"):
+        _grid(tmp_path, {"lookback": 7})
+    with pytest.raises(ValueError, match="max_items"):
+        _grid(tmp_path, {"max_items": "many"})
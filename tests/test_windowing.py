@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timedelta
+
+from operations_load_diagnostic.aggregation import aggregate_metrics
+from operations_load_diagnostic.models import (
+    Classification,
+    ClassifiedItem,
+    InboundItem,
+    RiskFlag,
+    WorkCategory,
+    WorkNature,
+)
+from operations_load_diagnostic.windowing import SlidingWindowAggregator
+
+START = datetime(2026, 2, 1, 8, 0)
+CATEGORIES = list(WorkCategory)
+
+
+def _item(i, ts):
+    return ClassifiedItem(
+        item=InboundItem(item_id=str(i), timestamp=ts, sender=f"u{i % 3}@x.example", subject="", body=""),
+        classification=Classification(
+            category=CATEGORIES[i % len(CATEGORIES)],
+            nature=WorkNature.EXCEPTION_DRIVEN if i % 2 else WorkNature.REPETITIVE,
+            risk=RiskFlag.SLA_SENSITIVE if i % 5 == 0 else RiskFlag.NOT_SLA_SENSITIVE,
+            confidence=0.6,
+        ),
+    )
+
+
+def test_out_of_order_adds_match_aggregate_metrics():
+    # One item per hourly bucket, added in a scrambled order.
+    items = [_item(i, START + timedelta(hours=(i * 37) % 200)) for i in range(200)]
+    window = SlidingWindowAggregator(lookback_days=14)
+    assert window.extend(items) == 200
+    in_order = sorted(items, key=lambda x: x.item.timestamp)
+    assert window.metrics() == aggregate_metrics(in_order, fallback_period_days=14)
+
+
+def test_jump_past_the_window_expires_everything():
+    window = SlidingWindowAggregator(lookback_days=2)
+    window.extend(_item(i, START + timedelta(hours=i)) for i in range(40))
+    assert len(window) == 40
+
+    later = START + timedelta(days=30)
+    window.advance_to(later)
+    assert len(window) == 0
+    assert window.metrics().total_volume == 0
+
+    fresh = [_item(i, later - timedelta(hours=5 - i)) for i in range(5)]
+    window.extend(fresh)
+    assert window.metrics() == aggregate_metrics(fresh, fallback_period_days=2)
+
+
+def test_items_older_than_the_window_are_rejected():
+    window = SlidingWindowAggregator(lookback_days=1, bucket_minutes=60)
+    assert window.add(_item(0, START + timedelta(days=3)))
+    assert not window.add(_item(1, START + timedelta(days=1, hours=23)))
+    assert window.add(_item(2, START + timedelta(days=2, hours=1)))
+    assert len(window) == 2
+
+
+def test_state_round_trip():
+    items = [_item(i, START + timedelta(hours=(i * 13) % 90)) for i in range(120)]
+    window = SlidingWindowAggregator(lookback_days=3, bucket_minutes=30)
+    window.extend(items)
+    restored = SlidingWindowAggregator.from_state(json.loads(json.dumps(window.to_state())))
+    assert len(restored) == len(window)
+    assert restored.metrics() == window.metrics()
+
+    later = START + timedelta(days=5)
+    for w in (window, restored):
+        w.advance_to(later)
+        w.add(_item(7, later))
+    assert restored.metrics() == window.metrics()
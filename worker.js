@@ -0,0 +1,13 @@
+importScripts("./diagnostic.js");
+
+self.onmessage = async (event) => {
+  const { source, mode, lookbackDays, maxItems } = event.data;
+  try {
+    const result = await runDiagnosticStream(source, { mode, lookbackDays, maxItems }, (report) => {
+      self.postMessage({ type: "progress", report });
+    });
+    self.postMessage({ type: "done", ...result });
+  } catch (err) {
+    self.postMessage({ type: "error", message: err.message || "Failed to generate diagnostic." });
+  }
+};